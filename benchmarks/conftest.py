@@ -0,0 +1,41 @@
+import os
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+from pyscaffold import info
+from pyscaffold.log import logger
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    """Avoid interference of the developer's configuration and keep git offline"""
+    home = tmp_path / "home"
+    home.mkdir()
+    for var in ("HOME", "USERPROFILE", "XDG_CONFIG_HOME"):
+        monkeypatch.setenv(var, str(home))
+    for role in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{role}_NAME", "Benchmark")
+        monkeypatch.setenv(f"GIT_{role}_EMAIL", "benchmark@example.com")
+    monkeypatch.setattr("pyscaffold.info.config_dir", lambda *_, **__: home)
+    info.clear_git_config()
+    monkeypatch.chdir(tmp_path)
+    logger.level = "WARNING"
+    yield tmp_path
+    info.clear_git_config()
+
+
+@pytest.fixture
+def new_path(tmp_path):
+    """Factory of fresh (not yet existing) project paths, one per benchmark round"""
+    counter = count()
+
+    def _new_path() -> Path:
+        return tmp_path / f"project{next(counter)}"
+
+    return _new_path
+
+
+def pytest_report_header(config):
+    return f"pyscaffold benchmarks, cpus={os.cpu_count()}"
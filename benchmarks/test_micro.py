@@ -0,0 +1,67 @@
+"""Timings for the building blocks used many times during the scaffold"""
+
+from copy import deepcopy
+from pathlib import Path
+
+import pytest
+
+from pyscaffold import api, dependencies, info, structure, templates
+from pyscaffold.actions import get_default_options
+
+REQUIREMENTS = [
+    "setuptools_scm>=5",
+    "wheel",
+    "setuptools>=46.1.0",
+    "importlib-metadata; python_version<'3.8'",
+    "Setuptools_SCM>=5",
+    "wheel>=0.36",
+] * 10
+
+
+@pytest.fixture
+def opts():
+    _, opts = get_default_options({}, {"project_path": "my-project"})
+    return opts
+
+
+@pytest.fixture
+def struct(opts):
+    struct, _ = structure.define_structure({}, opts)
+    return struct
+
+
+def test_merge(benchmark, struct):
+    other = {"src": {"my_project": {"extra.py": "", "sub": {"file.py": ""}}}}
+    benchmark(structure.merge, struct, other)
+
+
+def test_modify(benchmark, struct):
+    def _modify(struct):
+        return structure.modify(
+            struct, Path("src/my_project/__init__.py"), lambda c, o: (c, o)
+        )
+
+    benchmark.pedantic(_modify, setup=lambda: ((deepcopy(struct),), {}), rounds=100)
+
+
+def test_get_template_cached(benchmark):
+    templates.get_template("setup_cfg")
+    benchmark(templates.get_template, "setup_cfg")
+
+
+def test_get_template_uncached(benchmark):
+    def _get():
+        templates.cache.invalidate()
+        return templates.get_template("setup_cfg")
+
+    benchmark(_get)
+
+
+def test_info_project(benchmark, tmp_path):
+    path = tmp_path / "my-project"
+    api.create_project(project_path=path, config_files=api.NO_CONFIG)
+    benchmark(info.project, {"project_path": path})
+
+
+def test_deduplicate(benchmark):
+    benchmark(dependencies.deduplicate, REQUIREMENTS)
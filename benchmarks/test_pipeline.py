@@ -0,0 +1,77 @@
+"""End-to-end timings for the scaffolding pipeline and the CLI"""
+
+import subprocess
+import sys
+
+import pytest
+
+from pyscaffold import api, cli
+from pyscaffold.extensions import Extension, iterate_entry_points, load_from_entry_point
+
+SKIP = {"interactive"}  # requires a text editor, cannot be timed unattended
+
+EXTRA_OPTS = {"namespace": {"namespace": "my.ns"}}
+
+BUILTIN_EXTENSIONS = sorted(
+    e.name
+    for e in iterate_entry_points()
+    if e.value.startswith("pyscaffold.") and e.name not in SKIP
+)
+
+
+class NoGit(Extension):
+    """Skip the creation of a git repository"""
+
+    def activate(self, actions):
+        return self.unregister(actions, "init_git")
+
+
+def _create(path, **opts):
+    return api.create_project(project_path=path, config_files=api.NO_CONFIG, **opts)
+
+
+def _run(benchmark, new_path, rounds=5, **opts):
+    def _setup():
+        return (new_path(),), opts
+
+    benchmark.pedantic(_create, setup=_setup, rounds=rounds)
+
+
+def test_create_project(benchmark, new_path):
+    _run(benchmark, new_path)
+
+
+def test_create_project_no_git(benchmark, new_path):
+    _run(benchmark, new_path, extensions=[NoGit("no_git")])
+
+
+def test_create_project_git_fast_import(benchmark, new_path):
+    _run(benchmark, new_path, git_fast_import=True)
+
+
+def test_create_project_pretend(benchmark, new_path):
+    _run(benchmark, new_path, rounds=10, pretend=True)
+
+
+@pytest.mark.parametrize("name", BUILTIN_EXTENSIONS)
+def test_create_project_with_extension(benchmark, new_path, name):
+    entry_point = next(e for e in iterate_entry_points() if e.name == name)
+    extension = load_from_entry_point(entry_point)
+    opts = EXTRA_OPTS.get(name, {})
+    _run(benchmark, new_path, rounds=3, extensions=[extension], **opts)
+
+
+def test_update_project(benchmark, new_path):
+    path = new_path()
+    _create(path)
+    benchmark.pedantic(_create, args=(path,), kwargs={"update": True}, rounds=5)
+
+
+def test_putup_help(benchmark):
+    cmd = [sys.executable, "-m", "pyscaffold.cli", "--help"]
+    run = subprocess.run
+    benchmark.pedantic(run, args=(cmd,), kwargs={"capture_output": True}, rounds=5)
+
+
+def test_parse_args(benchmark):
+    benchmark(cli.parse_args, ["my-project", "--namespace", "my.ns", "--no-tox"])
@@ -12,13 +12,15 @@ Note:
     :mod:`pyscaffold.update`.
 """
 
+import logging
 import os
+import time
 from datetime import date, datetime
 from functools import reduce
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from . import info, repo
+from . import info, profiling, repo
 from .exceptions import (
     ActionNotFound,
     DirectoryAlreadyExists,
@@ -94,10 +96,20 @@ def invoke(struct_and_opts: ActionParams, action: Action) -> ActionParams:
 
     Returns:
         ActionParams: updated project representation and options
+
+    .. versionchanged:: 4.7
+       The action is measured when there is an active profile (see
+       :mod:`pyscaffold.profiling`). A ``done`` activity with the time the action
+       took (**duration**) is also logged (with :obj:`logging.DEBUG` level).
     """
-    logger.report("invoke", get_id(action))
-    with logger.indent():
-        return action(*struct_and_opts)
+    action_id = get_id(action)
+    logger.report("invoke", action_id)
+    start = time.perf_counter()
+    with logger.indent(), profiling.measure(action_id):
+        result = action(*struct_and_opts)
+    duration = time.perf_counter() - start
+    logger.report("done", action_id, level=logging.DEBUG, duration=duration)
+    return result
 
 
 def register(
@@ -249,6 +261,8 @@ def get_default_options(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
     opts.setdefault("root_pkg", opts["package"])
     opts.setdefault("qual_pkg", opts["package"])
     opts.setdefault("pretend", False)
+    if opts.get("diff"):
+        opts["pretend"] = True  # computing a diff should never change the disk
 
     opts["license"] = info.best_fit_license(opts.get("license"))
     # ^ "Canonicalise" license
@@ -271,7 +285,8 @@ def verify_options_consistency(struct: Structure, opts: ScaffoldOpts) -> ActionP
             f"Package name {opts['package']!r} is not a valid identifier."
         )
 
-    if opts["update"] and not opts["force"]:
+    if opts["update"] and not opts["force"] and not opts.get("diff"):
+        # ^  computing a diff does not change the disk, so it is always safe
         if not info.is_git_workspace_clean(opts["project_path"]):
             raise GitDirtyWorkspace
 
@@ -320,14 +335,21 @@ def init_git(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
     """
     path = opts.get("project_path", ".")
     logger.report("check", f"is initialization of the git repository {path} needed...")
-    if not opts["update"] and not repo.is_git_repo(path):
-        repo.init_commit_repo(path, struct, pretend=opts.get("pretend"))
+    if not opts["update"] and not opts.get("diff") and not repo.is_git_repo(path):
+        # ^  diff-only runs do not create files, so there is nothing to commit
+        fast_import = opts.get("git_fast_import", False)
+        repo.init_commit_repo(
+            path, struct, fast_import=fast_import, pretend=opts.get("pretend")
+        )
 
     return struct, opts
 
 
 def report_done(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
-    """Just inform the user PyScaffold is done"""
+    """Just inform the user PyScaffold is done (unless the ``quiet`` option is given)"""
+    if opts.get("quiet"):
+        return struct, opts
+
     try:
         print("done! 🐍 🌟 ✨")
     except Exception:  # pragma: no cover
@@ -2,17 +2,35 @@
 External API for accessing PyScaffold programmatically via Python.
 """
 
+from copy import deepcopy
 from enum import Enum
 from functools import reduce
 from pathlib import Path
-
-from . import __version__ as VERSION
-from . import actions, info
-from .exceptions import DirectErrorForUser, NoPyScaffoldProject
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from . import actions, info, profiling, templates
+from .exceptions import DirectErrorForUser, GitDirtyWorkspace, NoPyScaffoldProject
+from .file_system import PathLike
+from .identification import deterministic_name, deterministic_sort
+from .structure import Structure, iter_leaves
+from .update import MIGRATED_FILES
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .extensions import Extension  # avoid circular dependencies in runtime
 
 # -------- Options --------
 
-(NO_CONFIG,) = list(Enum("ConfigFiles", "NO_CONFIG"))  # type: ignore
+ConfigFiles = Enum("ConfigFiles", "NO_CONFIG")
+(NO_CONFIG,) = list(ConfigFiles)
 """This constant is used to tell PyScaffold to not load any extra configuration file,
 not even the default ones
 Usage::
@@ -21,15 +39,18 @@ Usage::
 
 Please notice that the ``setup.cfg`` file inside an project being updated will
 still be considered.
+
+.. versionchanged:: 4.7
+   ``NO_CONFIG`` can be pickled (e.g. to be sent to the processes used by
+   :obj:`create_projects`).
 """
 
-DEFAULT_OPTIONS = {
+_DEFAULT_OPTIONS = {
     "update": False,
     "force": False,
     "description": "Add a short description here!",
     "url": "https://github.com/pyscaffold/pyscaffold/",
     "license": "MIT",
-    "version": VERSION,
     "extensions": [],
     "config_files": [],  # Overloaded in bootstrap_options for lazy evaluation
 }
@@ -42,12 +63,27 @@ derived from ``project_path`` when not explicitly passed) are computed in
 When ``config_files`` is empty, a default value is computed dynamically by
 :obj:`pyscaffold.info.config_file` before the start of PyScaffold's action pipeline.
 
+The ``version`` of PyScaffold is added the first time this value is accessed
+(computing it is expensive).
+
 Warning:
     Default values might be dynamically overwritten by ``config_files`` or, during
     updates, existing ``setup.cfg``.
 """
 
 
+def __getattr__(name: str):
+    # ``DEFAULT_OPTIONS`` is completed lazily, since computing ``version`` requires
+    # ``importlib.metadata``, which is expensive to import (see :pep:`562`)
+    if name == "DEFAULT_OPTIONS":
+        from . import __version__
+
+        _DEFAULT_OPTIONS.setdefault("version", __version__)
+        return _DEFAULT_OPTIONS
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def bootstrap_options(opts=None, **kwargs):
     """Internal API: augment the given options with minimal defaults
     and existing configurations saved in files (e.g. ``setup.cfg``)
@@ -72,16 +108,10 @@ def bootstrap_options(opts=None, **kwargs):
 
     # Add options stored in config files:
     info._migrate_old_macos_config()
-    default_files = [info.config_file(default=None)]
-    opts.setdefault("config_files", [f for f in default_files if f and f.exists()])
-    # ^  make sure the file exists before passing it ahead
+    opts.setdefault("config_files", _default_config_files())
     opts = _read_existing_config(opts)
 
-    # Add defaults last, so they don't overwrite:
-    opts.update({k: v for k, v in DEFAULT_OPTIONS.items() if k not in opts})
-
-    opts["version"] = VERSION  # always update version
-    return opts
+    return _add_defaults(opts)
 
 
 # -------- Public API --------
@@ -120,6 +150,14 @@ def create_project(opts=None, **kwargs):
                             - **pretend** (*bool*)
                             - **extensions** (*list*)
                             - **config_files** (*list* or ``NO_CONFIG``)
+                            - **git_fast_import** (*bool*)
+                            - **io_workers** (*int*)
+                            - **skip_unchanged** (*bool*)
+                            - **atomic** (*bool*)
+                            - **diff** (*str*): ``unified`` or ``json``
+                            - **profile** (*bool*)
+                            - **profile_output** (:obj:`os.PathLike` or :obj:`str`)
+                            - **quiet** (*bool*)
 
     Some of these options are equivalent to the command line options, others
     are used for creating the basic python package meta information, but the
@@ -139,6 +177,40 @@ def create_project(opts=None, **kwargs):
     respective objects in the extension list. All built-in extensions are
     accessible via :mod:`pyscaffold.extensions` submodule.
 
+    When the **git_fast_import** flag is ``True``, the initial commit of the
+    repository is created via ``git fast-import`` (see
+    :obj:`pyscaffold.repo.git_fast_import`).
+
+    When **skip_unchanged** is ``True``, files whose contents in the disk are already
+    identical to the ones PyScaffold would write are left untouched. This is the
+    default behaviour when **update** is ``True``.
+
+    When **io_workers** is greater than 1, the files of the project are rendered and
+    written concurrently by the given number of threads (see
+    :obj:`pyscaffold.structure.create_structure`).
+
+    When the **atomic** flag is ``True``, a failure while writing the files of the
+    project (or an interruption) leaves the disk untouched: new projects are created in
+    a temporary sibling directory that is renamed into place in a single step, and the
+    files of existing projects are replaced one by one, keeping an undo journal (see
+    :obj:`pyscaffold.structure.create_structure`).
+
+    When **diff** is given, nothing is written (it implies **pretend**). Instead, the
+    files PyScaffold would produce are compared with the ones in the disk and the
+    resulting :obj:`pyscaffold.diff.ChangeSet` is added to the returned options as
+    ``diff_report`` (**diff** indicates the preferred format, see
+    :obj:`pyscaffold.diff.ChangeSet.format`).
+
+    When the **profile** flag is ``True``, the time spent by each action (as well as
+    the number of subprocesses spawned and files written) is measured and the
+    resulting :obj:`pyscaffold.profiling.Profile` is added to the returned options
+    as ``profile_report``. The report can also be saved to the **profile_output** file
+    (which implies **profile**, see :obj:`pyscaffold.profiling.profile`).
+
+    When the **quiet** flag is ``True``, the final ``done!`` message is not printed
+    (this is the default for :obj:`create_projects`, whose callers usually report the
+    outcome of the entire batch instead).
+
     Finally, when ``setup.cfg``-like files are added to the **config_files** list,
     PyScaffold will read it's options from there in addition to the ones already passed.
     If the list is empty, the default configuration file is used. To avoid reading any
@@ -155,24 +227,247 @@ def create_project(opts=None, **kwargs):
     pipeline = actions.discover(opts["extensions"])
 
     # call the actions to generate final struct and opts
-    return reduce(actions.invoke, pipeline, ({}, opts))
+    return _run_pipeline(pipeline, opts)
+
+
+class ProjectResult(NamedTuple):
+    """Outcome of each one of the projects generated via :obj:`create_projects`"""
+
+    position: int
+    """Position of the project in the iterable given to :obj:`create_projects`"""
+
+    opts: actions.ScaffoldOpts
+    """Options originally given for the project"""
+
+    result: Optional[actions.ActionParams]
+    """``(struct, opts)`` tuple returned by the pipeline (``None`` when it fails)"""
+
+    error: Optional[Exception]
+    """Exception raised while generating the project (``None`` when it succeeds)"""
+
+
+def create_projects(
+    projects: Iterable[actions.ScaffoldOpts], workers: Optional[int] = None, **kwargs
+) -> Iterator[ProjectResult]:
+    """Create several projects in a row, sharing as much setup as possible between them
+
+    The default config file is located only once and each distinct list of
+    ``config_files`` (and the extensions they mention) is read only once for the entire
+    batch, instead of once per project. Similarly each worker discovers the action
+    pipeline only once per distinct set of extensions.
+
+    Args:
+        projects: iterable with the options of each project (the same options accepted
+            by :obj:`create_project`)
+        workers: number of processes used to run the pipelines concurrently.
+            By default (or when smaller than 2) the projects are generated one after the
+            other in the current process.
+        **kwargs: options shared by all the projects (the ones in ``projects``
+            take precedence). ``quiet`` is ``True`` by default.
+
+    Returns:
+        Generator yielding one :obj:`ProjectResult` per project, as soon as each project
+        is done. Errors do not interrupt the batch, instead they are stored in the
+        :obj:`~ProjectResult.error` field (when ``workers`` is used, the results are
+        produced in completion order, please use :obj:`~ProjectResult.position` to match
+        them with the given options).
+
+    Note:
+        Processes are used instead of threads because the pipeline changes the current
+        working directory (e.g. when initialising the git repository), which is shared
+        by all the threads in a process. Therefore, when ``workers`` is used, the
+        options (and extensions) of each project, the results and eventual exceptions
+        need to be picklable.
+    """
+    config_cache: Dict[Tuple[Path, ...], actions.ScaffoldOpts] = {}
+    default_files: Optional[List[Path]] = None
+
+    def _bootstrap(project: actions.ScaffoldOpts) -> actions.ScaffoldOpts:
+        nonlocal default_files
+        opts = {"quiet": True, **kwargs, **project}
+        opts = {k: v for k, v in opts.items() if v or v is False}
+        if "config_files" not in opts:
+            if default_files is None:
+                info._migrate_old_macos_config()
+                default_files = _default_config_files()
+            opts["config_files"] = default_files
+        return _add_defaults(_read_existing_config(opts, config_cache))
+
+    if not workers or workers < 2:
+        for i, project in enumerate(projects):
+            try:
+                result = _create_bootstrapped_project(_bootstrap(project))
+                yield ProjectResult(i, project, result, None)
+            except Exception as ex:
+                yield ProjectResult(i, project, None, ex)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed  # lazy import
+
+    templates.cache.preload()
+    info.git_config()
+    # ^  when processes are forked, the loaded templates and git settings are inherited
+    #    by the workers
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {}
+        for i, project in enumerate(projects):
+            try:
+                opts = _bootstrap(project)
+                futures[executor.submit(_create_bootstrapped_project, opts)] = (
+                    i,
+                    project,
+                )
+            except Exception as ex:
+                yield ProjectResult(i, project, None, ex)
+
+        for future in as_completed(futures):
+            i, project = futures[future]
+            try:
+                yield ProjectResult(i, project, future.result(), None)
+            except Exception as ex:
+                yield ProjectResult(i, project, None, ex)
+
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+DIRTY = "dirty"
+FAILED = "failed"
+UPDATE_STATUSES = (UPDATED, UNCHANGED, DIRTY, FAILED)
+"""Possible values for :obj:`UpdateResult.status`"""
+
+
+class UpdateResult(NamedTuple):
+    """Outcome of each one of the projects updated via :obj:`update_projects`"""
+
+    path: Path
+    """Path of the project"""
+
+    status: str
+    """One of :obj:`UPDATE_STATUSES`. ``dirty`` projects are not updated because
+    their git workspace has uncommitted changes (see
+    :obj:`~pyscaffold.exceptions.GitDirtyWorkspace`)
+    """
+
+    error: Optional[Exception]
+    """Exception raised while updating the project (``None`` when it succeeds)"""
+
+
+def update_projects(
+    paths: Iterable[PathLike], workers: Optional[int] = None, **kwargs
+) -> Iterator[UpdateResult]:
+    """Update several existing projects in a batch (e.g. to migrate them to the
+    current version of PyScaffold), sharing the setup between them as described in
+    :obj:`create_projects`.
+
+    Args:
+        paths: paths of the projects to be updated
+        workers: number of processes used to update the projects concurrently
+            (see :obj:`create_projects`)
+        **kwargs: options shared by all the projects (the same options accepted by
+            :obj:`create_project`, ``update`` is implied)
+
+    Returns:
+        Generator yielding one :obj:`UpdateResult` per project, as soon as each project
+        is done (in completion order when ``workers`` is used). A project is
+        considered ``updated`` when files are written (or removed) while generating
+        the project structure or by the migrations in :obj:`~pyscaffold.update`.
+
+    .. versionadded:: 4.7
+    """
+    projects = ({"project_path": Path(path)} for path in paths)
+    for result in create_projects(projects, workers, **{**kwargs, "update": True}):
+        path = result.opts["project_path"]
+        if isinstance(result.error, GitDirtyWorkspace):
+            yield UpdateResult(path, DIRTY, result.error)
+        elif result.error or not result.result:
+            yield UpdateResult(path, FAILED, result.error)
+        elif _has_files(result.result[0]) or result.result[1].get(MIGRATED_FILES):
+            # ^  the struct returned by the pipeline holds the files written
+            yield UpdateResult(path, UPDATED, None)
+        else:
+            yield UpdateResult(path, UNCHANGED, None)
 
 
 # -------- Auxiliary functions (Private) --------
 
 
-def _read_existing_config(opts):
+_PIPELINES: Dict[Tuple[str, ...], Tuple[List["Extension"], List[actions.Action]]] = {}
+"""Action pipelines already discovered in the current process (see
+:obj:`create_projects`), indexed by the names of the extensions.
+Each pipeline is stored together with the extension objects that produced it (the
+actions may be bound to their state), so it is only reused for the same objects.
+"""
+
+
+def _create_bootstrapped_project(opts: actions.ScaffoldOpts) -> actions.ActionParams:
+    """Similar to :obj:`create_project` but assumes the options were already
+    bootstrapped and reuses the action pipelines previously discovered.
+    """
+    extensions = deterministic_sort(opts["extensions"])
+    key = tuple(deterministic_name(e) for e in extensions)
+    cached = _PIPELINES.get(key)
+    if cached is None or any(a is not b for a, b in zip(cached[0], extensions)):
+        cached = _PIPELINES[key] = (extensions, actions.discover(extensions))
+        # ^  the keys ensure both lists of extensions have the same length
+
+    return _run_pipeline(cached[1], opts)
+
+
+def _run_pipeline(
+    pipeline: List[actions.Action], opts: actions.ScaffoldOpts
+) -> actions.ActionParams:
+    empty: Structure = {}
+    if not (opts.get("profile") or opts.get("profile_output")):
+        return reduce(actions.invoke, pipeline, (empty, opts))
+
+    with profiling.profile(opts.get("profile_output")) as report:
+        struct, opts = reduce(actions.invoke, pipeline, (empty, opts))
+
+    return struct, {**opts, "profile_report": report}
+
+
+def _has_files(struct: Structure) -> bool:
+    return next(iter_leaves(struct), None) is not None
+
+
+def _default_config_files() -> List[Path]:
+    """Default files used when no ``config_files`` option is given"""
+    default_files = [info.config_file(default=None)]
+    return [f for f in default_files if f and f.exists()]
+    # ^  make sure the file exists before passing it ahead
+
+
+def _add_defaults(opts: dict) -> dict:
+    # Add defaults last, so they don't overwrite:
+    opts.update({k: v for k, v in _DEFAULT_OPTIONS.items() if k not in opts})
+
+    from . import __version__  # lazy: computing the version is expensive
+
+    opts["version"] = __version__  # always update version
+    return opts
+
+
+def _read_existing_config(opts, cache: Optional[dict] = None):
     """Read existing config files first listed in ``opts["config_files"]``
     and then ``setup.cfg`` inside ``opts["project_path"]``
+
+    When a ``cache`` dict is given, the options obtained from each list of config files
+    are stored in it and re-used in the next calls.
     """
     config_files = opts["config_files"]
     if config_files is not NO_CONFIG:
         paths = (Path(f).resolve() for f in config_files)
-        deduplicated = {p: p for p in paths}
+        deduplicated = tuple({p: p for p in paths})
         # ^  using a dict instead of a set to preserve the order the files were given
         # ^  we do not mute errors here if the file does not exist. Let us be
         #    explicit.
-        opts = reduce(info.project, deduplicated.keys(), opts)
+        if cache is None:
+            opts = reduce(info.project, deduplicated, opts)
+        else:
+            if deduplicated not in cache:
+                empty: actions.ScaffoldOpts = {}
+                cache[deduplicated] = reduce(info.project, deduplicated, empty)
+            opts = _merge_config(opts, cache[deduplicated])
 
     if opts.get("update"):
         try:
@@ -184,3 +479,17 @@ def _read_existing_config(opts):
             raise NoPyScaffoldProject from e
 
     return opts
+
+
+def _merge_config(opts: dict, config: dict) -> dict:
+    """Combine ``opts`` with the options previously read from config files,
+    with the same precedence rules used by :obj:`info.project`
+    """
+    existing = {e.name for e in opts.get("extensions", [])}
+    extra = [e for e in config.get("extensions", []) if e.name not in existing]
+    shared = deepcopy({k: v for k, v in config.items() if k != "extensions"})
+    # ^  avoid side effects between projects, since the cached values are re-used
+    merged = {**shared, **opts}
+    if "extensions" in config:
+        merged["extensions"] = deterministic_sort(opts.get("extensions", []) + extra)
+    return merged
@@ -4,16 +4,17 @@ Command-Line-Interface of PyScaffold
 
 import argparse
 import logging
+import os
 import sys
-from typing import List, Optional
+from glob import glob
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
 
-from packaging.version import Version
-
-from . import __version__ as pyscaffold_version
 from . import api, templates
 from .actions import ScaffoldOpts
 from .actions import discover as discover_actions
 from .exceptions import exceptions2exit
+from .extensions import Extension, index_entry_points
 from .extensions import list_from_entry_points as list_all_extensions
 from .identification import get_id
 from .info import best_fit_license
@@ -39,6 +40,14 @@ def add_log_related_args(parser: argparse.ArgumentParser):
         dest="log_level",
         help="show all available information about current actions",
     )
+    parser.add_argument(
+        "--log-format",
+        dest="log_format",
+        choices=("text", "json"),
+        help="format of the log messages: 'json' produces one JSON object per line "
+        "(activity, subject, context, target, nesting, timestamp, duration), "
+        "'text' by default",
+    )
     parser.add_argument(
         "-P",
         "--pretend",
@@ -129,7 +138,7 @@ def add_default_args(parser: argparse.ArgumentParser):
 
     # The following are basically for the CLI options, so having a default value is OK.
     parser.add_argument(
-        "-V", "--version", action="version", version=f"PyScaffold {pyscaffold_version}"
+        "-V", "--version", action="version", version=f"PyScaffold {_version()}"
     )
     add_log_related_args(parser)
     parser.add_argument(
@@ -139,17 +148,148 @@ def add_default_args(parser: argparse.ArgumentParser):
         const=list_actions,
         help="do not create project, but show a list of planned actions",
     )
+    parser.add_argument(
+        "--bulk-update",
+        dest="command",
+        action="store_const",
+        const=bulk_update,
+        help="update many projects at once: PROJECT_PATH is interpreted as a glob "
+        "pattern or as a file listing one project path per line (relative to the "
+        "file)",
+    )
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        metavar="N",
+        help="number of processes used to update the projects concurrently "
+        "(requires --bulk-update)",
+    )
+    parser.add_argument(
+        "--diff",
+        dest="diff",
+        nargs="?",
+        const="unified",
+        choices=("unified", "json"),
+        help="do not create/update project, but show what would change in the disk "
+        "as an unified diff (default) or as a JSON change set (implies --pretend)",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        action="store_true",
+        help="measure the time spent by each action and display a report at the end",
+    )
+    parser.add_argument(
+        "--profile-output",
+        dest="profile_output",
+        metavar="FILE",
+        help="save the profiling results to FILE (implies --profile), as a Chrome "
+        "trace if FILE ends with '.json' or as pstats data otherwise",
+    )
+
+
+HELP_FLAGS = ("-h", "--help")
 
+EAGER_EXTENSIONS = {"interactive"}
+"""Extensions that require all the others to be loaded to work (e.g. because they
+inspect all the options in the parser)
+"""
+
+
+def add_extension_args(
+    parser: argparse.ArgumentParser, args: Optional[List[str]] = None
+):
+    """Add options and arguments defined by extensions to the CLI parser.
 
-def add_extension_args(parser: argparse.ArgumentParser):
-    """Add options and arguments defined by extensions to the CLI parser."""
+    .. versionchanged:: 4.7
+       When ``args`` is given, only the extensions required to parse them are
+       loaded (see :obj:`required_extensions`).
+    """
     # load and instantiate extensions
-    cli_extensions = list_all_extensions()
+    if args is None:
+        cli_extensions = list_all_extensions()
+    else:
+        cli_extensions = required_extensions(parser, args)
 
     for extension in cli_extensions:
         extension.augment_cli(parser)
 
 
+def required_extensions(
+    parser: argparse.ArgumentParser, args: List[str]
+) -> List[Extension]:
+    """Load only the extensions whose flags are present in ``args``.
+
+    The flags of each extension are obtained from
+    :obj:`pyscaffold.extensions.index_entry_points`, without importing them.
+    All the extensions are loaded when help is requested, when one of the
+    :obj:`EAGER_EXTENSIONS` is activated, or when an option cannot be attributed to
+    ``parser`` or any extension (so ``argparse`` can properly display errors).
+    """
+    if any(arg in HELP_FLAGS for arg in _options(args)):
+        return list_all_extensions()
+
+    known = {
+        flag: action for action in parser._actions for flag in action.option_strings
+    }
+    index = index_entry_points()
+    every_flag = {*known, *(flag for flags in index.values() for flag in flags)}
+    names: Set[str] = set()
+    for option in _options(args):
+        for flag in _split_bundle(option, known, every_flag):
+            matches = {
+                name
+                for name, flags in index.items()
+                if any(_matches_flag(flag, f) for f in flags)
+            }
+            if not matches and not any(_matches_flag(flag, f) for f in known):
+                return list_all_extensions()
+            names |= matches
+
+    if not names:
+        return []
+    if names & EAGER_EXTENSIONS:
+        return list_all_extensions()
+
+    return list_all_extensions(filtering=lambda e: e.name in names)
+
+
+def _options(args: List[str]) -> Iterator[str]:
+    """Tokens in the command line that look like options (e.g. ``--flag``)"""
+    for arg in args:
+        if arg == "--":
+            return
+        if arg.startswith("-") and arg != "-":
+            yield arg.split("=", 1)[0]
+
+
+def _split_bundle(
+    option: str, known: Dict[str, argparse.Action], every_flag: Set[str]
+) -> Iterator[str]:
+    """Split short options bundled in a single token (e.g. ``-vf`` => ``-v``, ``-f``).
+    The remaining characters after an option of ``parser`` that requires a value are
+    considered the value (e.g. ``-vnNAME`` => ``-v``, ``-n``).
+    """
+    if option.startswith("--") or len(option) <= 2 or option in every_flag:
+        yield option
+        return
+
+    for char in option[1:]:
+        flag = f"-{char}"
+        yield flag
+        action = known.get(flag)
+        if action is not None and action.nargs != 0:
+            return  # the rest of the token is the value
+
+
+def _matches_flag(option: str, flag: str) -> bool:
+    if option.startswith("--"):
+        return flag.startswith(option)  # argparse accepts abbreviations
+    return option == flag or (len(flag) == 2 and option.startswith(flag))
+    # ^  short flags might be followed by a value (e.g. ``-nNAME``)
+
+
 def parse_args(args: List[str]) -> ScaffoldOpts:
     """Parse command line parameters respecting extensions
 
@@ -158,6 +298,10 @@ def parse_args(args: List[str]) -> ScaffoldOpts:
 
     Returns:
         dict: command line parameters
+
+    .. versionchanged:: 4.7
+       Extensions are only imported when their flags are present in ``args`` (or help
+       is requested).
     """
     # create the argument parser
     msg = "PyScaffold is a tool for easily putting up the scaffold of a Python project."
@@ -165,10 +309,14 @@ def parse_args(args: List[str]) -> ScaffoldOpts:
 
     parser.set_defaults(extensions=[], config_files=[], command=run_scaffold)
     add_default_args(parser)
-    add_extension_args(parser)
+    add_extension_args(parser, args)
 
     # Parse options and transform argparse Namespace object into common dict
-    return _process_opts(vars(parser.parse_args(args)))
+    namespace = parser.parse_args(args)
+    if namespace.workers is not None and namespace.command is not bulk_update:
+        parser.error("argument --workers: only allowed with --bulk-update")
+
+    return _process_opts(vars(namespace))
 
 
 def _process_opts(opts: ScaffoldOpts) -> ScaffoldOpts:
@@ -211,6 +359,12 @@ def get_log_level(args: Optional[List[str]] = None):
     return partial_opts.get("log_level") or _default_log_level(partial_opts)
 
 
+def _version() -> str:
+    from . import __version__  # lazy: computing the version is expensive
+
+    return __version__
+
+
 def _default_log_level(opts: ScaffoldOpts):
     # When pretending the user surely wants to see the output
     return logging.INFO if opts.get("pretend") else logging.WARNING
@@ -222,17 +376,63 @@ def run_scaffold(opts: ScaffoldOpts):
     Args:
         opts (dict): command line options as dictionary
     """
-    api.create_project(opts)
-    if opts["update"] and not opts["force"]:
+    from packaging.version import Version  # lazy: `packaging` is expensive to import
+
+    _struct, result = api.create_project(opts)
+    if "diff_report" in result:
+        print(result["diff_report"].format(opts["diff"]), end="")
+    if "profile_report" in result:
+        print(result["profile_report"].format())
+    if opts["update"] and not opts["force"] and not opts.get("diff"):
         note = (
             "Update accomplished!\n"
             "Please check if your setup.cfg still complies with:\n"
             "https://pyscaffold.org/en/v{}/configuration.html"
         )
-        base_version = Version(pyscaffold_version).base_version
+        base_version = Version(_version()).base_version
         print(note.format(base_version))
 
 
+def bulk_update(opts: ScaffoldOpts):
+    """Update all the projects matched by ``opts["project_path"]`` (glob pattern or
+    file with one path per line) and print a summary.
+
+    Args:
+        opts (dict): command line options as dictionary
+    """
+    opts = opts.copy()
+    paths = expand_project_paths(opts.pop("project_path"))
+    workers = opts.pop("workers", None)
+    shared = {k: v for k, v in opts.items() if k not in ("command", "log_level")}
+
+    counts = dict.fromkeys(api.UPDATE_STATUSES, 0)
+    for result in api.update_projects(paths, workers, **shared):
+        counts[result.status] += 1
+        error = f" ({result.error})" if result.status == api.FAILED else ""
+        print(f"{result.status:>10}  {result.path}{error}")
+
+    print(", ".join(f"{count} {status}" for status, count in counts.items()))
+    if counts[api.FAILED]:
+        raise SystemExit(1)
+
+
+def expand_project_paths(spec: str) -> List[Path]:
+    """Paths of the projects given via ``--bulk-update``.
+
+    ``spec`` can be a file with one project path per line (empty lines and lines
+    starting with ``#`` are ignored, relative paths are considered relative to the
+    file), or a glob pattern matching directories.
+    """
+    path = Path(spec)
+    if path.is_file():
+        lines = (line.strip() for line in path.read_text(encoding="utf-8").splitlines())
+        entries = (line for line in lines if line and not line.startswith("#"))
+        return [Path(os.path.normpath(path.parent / entry)) for entry in entries]
+        # ^  relative paths are resolved against the directory of the file
+
+    return sorted(Path(p) for p in glob(spec) if Path(p).is_dir())
+
+
 def list_actions(opts: ScaffoldOpts):
     """Do not create a project, just list actions considering extensions
 
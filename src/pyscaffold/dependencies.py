@@ -1,10 +1,8 @@
 """Internal library for manipulating package dependencies and requirements."""
 
 import re
-from itertools import chain
-from typing import Iterable, List
-
-from packaging.requirements import InvalidRequirement, Requirement
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List
 
 # setuptools version is now enforced via `install_requires`
 
@@ -45,22 +43,27 @@ def deduplicate(requirements: Iterable[str]) -> List[str]:
     """Given a sequence of individual requirement strings, e.g.
     ``["platformdirs>=1.4.4", "packaging>20.0"]``, remove the duplicated packages.
     If a package is duplicated, the last occurrence stays.
+
+    .. versionchanged:: 4.7
+       Package names are compared after :pep:`503` normalisation.
     """
-    return list({attempt_pkg_name(r): r for r in requirements}.values())
+    return RequirementSet(requirements).to_list()
 
 
 def remove(requirements: Iterable[str], to_remove: Iterable[str]) -> List[str]:
     """Given a list of individual requirement strings, e.g. ``["platformdirs>=1.4.4",
     "packaging>20.0"]``, remove the requirements in ``to_remove``.
     """
-    removable = {attempt_pkg_name(r) for r in to_remove}
-    return [r for r in requirements if attempt_pkg_name(r) not in removable]
+    removable = {_key(r) for r in to_remove}
+    return [r for r in requirements if _key(r) not in removable]
 
 
 def add(requirements: Iterable[str], to_add: Iterable[str] = BUILD) -> List[str]:
     """Given a sequence of individual requirement strings, add ``to_add`` to it.
     By default adds :obj:`BUILD` if ``to_add`` is not given."""
-    return deduplicate(chain(requirements, to_add))
+    reqs = RequirementSet(requirements)
+    reqs.update(to_add)
+    return reqs.to_list()
 
 
 def attempt_pkg_name(requirement: str) -> str:
@@ -68,8 +71,127 @@ def attempt_pkg_name(requirement: str) -> str:
     :pep`440`), it returns the "package name" part of dependency (without versions).
     Otherwise, it returns the same string (removed the comment marks).
     """
+    return _parse(requirement)[0]
+
+
+class RequirementSet:
+    """Ordered collection of individual requirement strings, holding at most one
+    requirement per package.
+
+    The requirements are indexed by package name (normalised according to :pep:`503`,
+    e.g. ``setuptools_scm`` and ``Setuptools-SCM`` are the same package), so adding,
+    replacing or removing each requirement takes constant time. Each string is parsed
+    only once (the parser is memoized), even when it goes through many collections.
+
+    When a requirement is added for a package that is already in the collection, it
+    replaces the existing one but keeps its position (so ``RequirementSet(reqs)``
+    is equivalent to :obj:`deduplicate`). Comment marks are ignored when indexing, so
+    a commented requirement (e.g. ``# mypkg~=2.0``) is replaced by an actual one.
+
+    Example:
+
+        .. code-block:: python
+
+            options = setupcfg["options"]
+            reqs = RequirementSet.from_str(options["install_requires"].value)
+            reqs.update(RUNTIME)
+            reqs.discard("pyscaffold")
+            options["install_requires"].set_values(reqs.to_list())
+
+    .. versionadded:: 4.7
+    """
+
+    def __init__(self, requirements: Iterable[str] = ()):
+        self._index: Dict[str, str] = {}
+        self.update(requirements)
+
+    @classmethod
+    def from_str(cls, requirements: str) -> "RequirementSet":
+        """Create a collection from a combined requirement string (see :obj:`split`)"""
+        return cls(split(requirements))
+
+    def add(self, requirement: str):
+        """Add ``requirement``, replacing the one for the same package (if existing)"""
+        requirement = str(requirement)
+        self._index[_key(requirement)] = requirement
+
+    def setdefault(self, requirement: str) -> str:
+        """Add ``requirement`` only if there is no requirement for the same package.
+        Returns the requirement kept in the collection.
+        """
+        requirement = str(requirement)
+        return self._index.setdefault(_key(requirement), requirement)
+
+    def update(self, requirements: Iterable[str]):
+        """Add all the ``requirements`` (the ones given last take precedence)"""
+        for requirement in requirements:
+            self.add(requirement)
+
+    def discard(self, requirement: str):
+        """Remove the requirement for the same package as ``requirement`` (which can
+        also be just the package name), if existing
+        """
+        self._index.pop(_key(requirement), None)
+
+    def difference_update(self, requirements: Iterable[str]):
+        """Remove the requirements for the same packages as ``requirements``"""
+        for requirement in requirements:
+            self.discard(requirement)
+
+    def get(self, requirement: str, default=None):
+        """Requirement in the collection for the same package as ``requirement``"""
+        return self._index.get(_key(requirement), default)
+
+    def __contains__(self, requirement) -> bool:
+        return isinstance(requirement, str) and _key(requirement) in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, RequirementSet):
+            return NotImplemented
+        return self._normalised() == other._normalised()
+
+    def _normalised(self) -> Dict[str, str]:
+        return {key: _parse(req)[2] for key, req in self._index.items()}
+
+    def to_list(self) -> List[str]:
+        """Requirement strings, suitable for ``pyproject.toml`` arrays (or
+        :obj:`configupdater.Option.set_values`)
+        """
+        return list(self._index.values())
+
+    def to_cfg(self, indent: str = "    ") -> str:
+        """Multi-line value, suitable for ``setup.cfg`` (e.g. ``install_requires``)"""
+        return "".join(f"\n{indent}{requirement}" for requirement in self)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_list()!r})"
+
+
+def _key(requirement: str) -> str:
+    """Key used to index requirements: normalised package name"""
+    return _parse(requirement)[1]
+
+
+@lru_cache(maxsize=None)
+def _parse(requirement: str):
+    """Package name as written in ``requirement``, its :pep:`503` normalisation and
+    the whole requirement rewritten with the normalised name (used for comparisons)
+    """
+    from packaging.requirements import InvalidRequirement, Requirement  # lazy import
+    from packaging.utils import canonicalize_name  # lazy import
+
     req = requirement.strip("#").strip()
     try:
-        return Requirement(req).name
+        parsed = Requirement(req)
     except InvalidRequirement:
-        return req
+        return req, req, req
+    name = parsed.name
+    parsed.name = canonicalize_name(name)
+    comment = "# " if requirement.lstrip().startswith("#") else ""
+    return name, parsed.name, comment + str(parsed)
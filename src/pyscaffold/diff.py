@@ -0,0 +1,243 @@
+"""
+Comparison between the project PyScaffold would generate and the files already in the
+disk, computed without writing anything.
+
+When the ``diff`` option is given to :obj:`pyscaffold.api.create_project` (or
+``putup --diff`` is used), :obj:`pyscaffold.structure.create_structure` renders the
+whole project structure in memory and :obj:`compare` it with the existing files,
+instead of materialising it. The resulting :obj:`ChangeSet` is added to the returned
+options as ``diff_report``, and can be formatted as an unified diff or as JSON.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+from pathlib import Path, PurePosixPath
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, cast
+
+from . import file_system as fs
+from .operations import FileContents, ScaffoldOpts, check_precondition, remove
+from .structure import Structure, iter_leaves, reify_content, resolve_leaf
+
+ADDED = "added"
+MODIFIED = "modified"
+REMOVED = "removed"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+STATUSES = (ADDED, MODIFIED, REMOVED, UNCHANGED, SKIPPED)
+"""Possible values for :obj:`Change.status`. ``skipped`` files are the ones that
+the file operation would not touch (e.g. :obj:`~pyscaffold.operations.no_overwrite`
+files that already exist), regardless of their contents.
+"""
+
+UNIFIED = "unified"
+JSON = "json"
+FORMATS = (UNIFIED, JSON)
+"""Formats accepted by :obj:`ChangeSet.format`"""
+
+
+class Change:
+    """Effect that materialising a single file of the project structure would have.
+
+    Attributes:
+        path (PurePosixPath): path of the file (relative to the project)
+        status (str): one of :obj:`STATUSES`
+        size (int): number of bytes that would be written (``None`` if not written)
+        old_size (int): number of bytes currently in the disk (``None`` if the file
+            does not exist)
+        digest (str): SHA-256 hex digest of the bytes that would be written
+        old_digest (str): SHA-256 hex digest of the bytes currently in the disk
+    """
+
+    FIELDS = ("path", "status", "size", "old_size", "digest", "old_digest")
+
+    def __init__(self, path: PurePosixPath, status: str, file: Path):
+        self.path = path
+        self.status = status
+        self.size: Optional[int] = None
+        self.old_size: Optional[int] = None
+        self.digest: Optional[str] = None
+        self.old_digest: Optional[str] = None
+        self._file = file  # location in the disk
+        self._text: Optional[str] = None  # new contents, if text
+
+    def to_dict(self) -> dict:
+        return {
+            field: (str(value) if field == "path" else value)
+            for field in self.FIELDS
+            for value in [getattr(self, field)]
+        }
+
+    def unified(self, context: int = 3) -> str:
+        """Unified diff between the contents in the disk and the new contents"""
+        if self.status in (UNCHANGED, SKIPPED):
+            return ""
+
+        old = _read_text(self._file) if self.old_size is not None else []
+        new = [] if self.status == REMOVED else _splitlines(self._text)
+        if old is None or new is None:
+            return f"Binary files a/{self.path} and b/{self.path} differ\n"
+
+        lines = difflib.unified_diff(
+            old,
+            new,
+            fromfile=f"a/{self.path}" if self.old_size is not None else "/dev/null",
+            tofile="/dev/null" if self.status == REMOVED else f"b/{self.path}",
+            n=context,
+        )
+        return "".join(_ensure_newline(line) for line in lines)
+
+    def __repr__(self):
+        values = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{self.__class__.__name__}({values})"
+
+
+class ChangeSet:
+    """Structured report with the :obj:`Change` of each file in the project structure
+    (in the same order of the structure).
+    """
+
+    def __init__(self, changes: Iterable[Change] = ()):
+        self.changes: List[Change] = list(changes)
+
+    def __iter__(self) -> Iterator[Change]:
+        return iter(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def filter(self, *statuses: str) -> List[Change]:
+        """Changes with the given statuses"""
+        return [change for change in self.changes if change.status in statuses]
+
+    @property
+    def summary(self) -> dict:
+        """Number of files for each one of the :obj:`STATUSES`"""
+        counts = dict.fromkeys(STATUSES, 0)
+        for change in self.changes:
+            counts[change.status] += 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            "changes": [change.to_dict() for change in self.changes],
+            "summary": self.summary,
+        }
+
+    def unified(self, context: int = 3) -> str:
+        """Unified diff of all the files that would be added, modified or removed"""
+        return "".join(change.unified(context) for change in self.changes)
+
+    def format(self, fmt: str = UNIFIED) -> str:
+        """Format the report according to one of the :obj:`FORMATS`"""
+        if fmt == JSON:
+            return json.dumps(self.to_dict(), indent=2)
+        if fmt == UNIFIED:
+            return self.unified()
+        raise ValueError(f"Invalid diff format: {fmt!r}, please use one of {FORMATS}")
+
+
+def compare(
+    struct: Structure, opts: ScaffoldOpts, prefix: Optional[fs.PathLike] = None
+) -> ChangeSet:
+    """Compare the files that :obj:`~pyscaffold.structure.create_structure` would
+    produce for ``struct`` with the ones in the disk, without writing anything.
+
+    File operations are opaque callables, so the comparison assumes they write the
+    reified contents, unless the file operation is
+    :obj:`~pyscaffold.operations.remove` or its
+    :obj:`~pyscaffold.operations.Precondition` fails (``None`` contents are ignored).
+
+    Args:
+        struct: project representation as (possibly) nested :obj:`dict`.
+        opts: PyScaffold's options
+        prefix: directory where the project would be materialised
+            (``opts["project_path"]`` by default)
+    """
+    if prefix is None:
+        prefix = cast(fs.PathLike, opts.get("project_path", "."))
+    root = Path(prefix)
+    changes = (_compare(root, path, leaf, opts) for path, leaf in iter_leaves(struct))
+    return ChangeSet(change for change in changes if change)
+
+
+# -------- Auxiliary functions --------
+
+
+def _compare(
+    root: Path, path: PurePosixPath, leaf, opts: ScaffoldOpts
+) -> Optional[Change]:
+    file = root.joinpath(path)
+    content, file_op = resolve_leaf(leaf)
+
+    if file_op is remove:
+        if not file.is_file():
+            return None
+        change = Change(path, REMOVED, file)
+        change.old_size, change.old_digest = _measure_file(file)
+        return change
+
+    if not check_precondition(file_op, file, opts):
+        return Change(path, SKIPPED, file)
+
+    contents = reify_content(content, opts)
+    if contents is None:
+        return None
+
+    change = Change(path, ADDED, file)
+    change.size, change.digest = _measure(contents)
+    if isinstance(contents, str):
+        change._text = contents
+    if file.is_file():
+        change.old_size, change.old_digest = _measure_file(file)
+        same = (change.old_size, change.old_digest) == (change.size, change.digest)
+        change.status = UNCHANGED if same else MODIFIED
+
+    return change
+
+
+def _measure(contents: FileContents, encoding="utf-8") -> Tuple[int, str]:
+    """Size and digest of the bytes :obj:`~pyscaffold.file_system.create_file` would
+    write (streamed contents are consumed in chunks).
+    """
+    if isinstance(contents, fs.SourceFile):
+        with contents.source.open("rb") as file:
+            return _measure_chunks(fs._read_chunks(file), encoding)
+    if isinstance(contents, (str, bytes)):
+        return _measure_chunks([contents], encoding)
+    if hasattr(contents, "read"):
+        return _measure_chunks(fs._read_chunks(cast(IO, contents)), encoding)
+    return _measure_chunks(cast(Iterable[fs.Chunk], contents), encoding)
+
+
+def _measure_chunks(chunks: Iterable[fs.Chunk], encoding="utf-8") -> Tuple[int, str]:
+    sha = hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            # Mirror the newline translation performed when writing text
+            chunk = chunk.replace("\n", os.linesep).encode(encoding)
+        sha.update(chunk)
+        size += len(chunk)
+    return size, sha.hexdigest()
+
+
+def _measure_file(path: Path) -> Tuple[int, str]:
+    with open(path, "rb") as file:
+        return _measure_chunks(fs._read_chunks(file))
+
+
+def _splitlines(text: Optional[str]) -> Optional[List[str]]:
+    return None if text is None else text.splitlines(keepends=True)
+
+
+def _read_text(path: Path) -> Optional[List[str]]:
+    try:
+        return path.read_text(encoding="utf-8").splitlines(keepends=True)
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+def _ensure_newline(line: str) -> str:
+    return line if line.endswith("\n") else line + "\n\\ No newline at end of file\n"
@@ -8,15 +8,15 @@ import logging
 import sys
 import traceback
 from pathlib import Path
-from typing import Optional, Sequence, Union, cast
+from typing import TYPE_CHECKING, Optional, Sequence, Union, cast
 
-if sys.version_info[:2] >= (3, 8):
-    # TODO: Import directly (no need for conditional) when `python_requires = >= 3.8`
-    from importlib.metadata import EntryPoint  # pragma: no cover
-else:
-    from importlib_metadata import EntryPoint  # pragma: no cover
-
-from . import __version__ as pyscaffold_version
+if TYPE_CHECKING:  # pragma: no cover
+    # ^  `importlib.metadata` is expensive to import and only used for type hints
+    if sys.version_info[:2] >= (3, 8):
+        # TODO: Import directly (no need for conditional) when `python_requires >= 3.8`
+        from importlib.metadata import EntryPoint
+    else:
+        from importlib_metadata import EntryPoint
 
 
 def exceptions2exit(exception_list):
@@ -159,8 +159,10 @@ class ExtensionNotFound(DirectErrorForUser):
     """
 
     def __init__(self, extensions: Sequence[str]):
+        from . import __version__  # lazy: computing the version is expensive
+
         message = cast(str, self.__doc__)
-        message = message.format(extensions=extensions, version=pyscaffold_version)
+        message = message.format(extensions=extensions, version=__version__)
         super().__init__(message)
 
 
@@ -170,7 +172,9 @@ class ErrorLoadingExtension(DirectErrorForUser):
     with PyScaffold {version}. You can also try unininstalling it.
     """
 
-    def __init__(self, extension: str = "", entry_point: Optional[EntryPoint] = None):
+    def __init__(self, extension: str = "", entry_point: Optional["EntryPoint"] = None):
+        from . import __version__  # lazy: computing the version is expensive
+
         if entry_point and not extension:
             extension = getattr(entry_point, "module", entry_point.name)
 
@@ -179,7 +183,7 @@ class ErrorLoadingExtension(DirectErrorForUser):
         extension = extension.replace("pyscaffoldext.", "pyscaffoldext-")
 
         message = cast(str, self.__doc__)
-        message = message.format(extension=extension, version=pyscaffold_version)
+        message = message.format(extension=extension, version=__version__)
         super().__init__(message)
 
 
@@ -3,23 +3,32 @@ Built-in extensions for PyScaffold.
 """
 
 import argparse
+import hashlib
+import json
 import sys
 import textwrap
-from typing import Callable, Iterable, List, Optional, Type
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Type
 
 from ..actions import Action, register, unregister
 from ..exceptions import ErrorLoadingExtension
 from ..identification import dasherize, deterministic_sort, underscore
 
-if sys.version_info[:2] >= (3, 8):
-    # TODO: Import directly (no need for conditional) when `python_requires = >= 3.8`
-    from importlib.metadata import EntryPoint, entry_points  # pragma: no cover
-else:
-    from importlib_metadata import EntryPoint, entry_points  # pragma: no cover
+if TYPE_CHECKING:  # pragma: no cover
+    # ^  `importlib.metadata` is expensive to import, see :obj:`entry_points`
+    if sys.version_info[:2] >= (3, 8):
+        # TODO: Import directly (no need for conditional) when `python_requires >= 3.8`
+        from importlib.metadata import EntryPoint
+    else:
+        from importlib_metadata import EntryPoint
 
 
 ENTRYPOINT_GROUP = "pyscaffold.cli"
 
+INDEX_FILE = "extensions.json"
+"""Name of the file (inside PyScaffold's config dir) used to cache the CLI flags
+introduced by each extension (see :obj:`index_entry_points`).
+"""
+
 NO_LONGER_NEEDED = {"pyproject", "tox"}
 """Extensions that are no longer needed and are now part of PyScaffold itself"""
 
@@ -151,7 +160,20 @@ def store_with(*extensions: Extension) -> Type[argparse.Action]:
     return AddExtensionAndStore
 
 
-def iterate_entry_points(group=ENTRYPOINT_GROUP) -> Iterable[EntryPoint]:
+def entry_points():
+    """Lazy proxy for :obj:`importlib.metadata.entry_points` (importing
+    :mod:`importlib.metadata` is expensive, so it is only done when required).
+    """
+    if sys.version_info[:2] >= (3, 8):
+        # TODO: Import directly (no need for conditional) when `python_requires >= 3.8`
+        from importlib.metadata import entry_points  # pragma: no cover
+    else:
+        from importlib_metadata import entry_points  # pragma: no cover
+
+    return entry_points()
+
+
+def iterate_entry_points(group=ENTRYPOINT_GROUP) -> Iterable["EntryPoint"]:
     """Produces a generator yielding an EntryPoint object for each extension registered
     via `setuptools`_ entry point mechanism.
 
@@ -172,7 +194,7 @@ def iterate_entry_points(group=ENTRYPOINT_GROUP) -> Iterable[EntryPoint]:
         return (extension for extension in entries.get(group, []))  # type: ignore
 
 
-def load_from_entry_point(entry_point: EntryPoint) -> Extension:
+def load_from_entry_point(entry_point: "EntryPoint") -> Extension:
     """Carefully load the extension, raising a meaningful message in case of errors"""
     try:
         return entry_point.load()(entry_point.name)
@@ -182,7 +204,7 @@ def load_from_entry_point(entry_point: EntryPoint) -> Extension:
 
 def list_from_entry_points(
     group: str = ENTRYPOINT_GROUP,
-    filtering: Callable[[EntryPoint], bool] = lambda _: True,
+    filtering: Callable[["EntryPoint"], bool] = lambda _: True,
 ) -> List[Extension]:
     """Produces a list of extension objects for each extension registered
     via `setuptools`_ entry point mechanism.
@@ -199,3 +221,64 @@ def list_from_entry_points(
     return deterministic_sort(
         load_from_entry_point(e) for e in iterate_entry_points(group) if filtering(e)
     )
+
+
+def index_entry_points(group: str = ENTRYPOINT_GROUP) -> Dict[str, List[str]]:
+    """Map the name of each extension registered via `setuptools`_ entry point mechanism
+    to the CLI flags it adds (see :obj:`Extension.augment_cli`).
+
+    Finding out the flags requires loading all the extensions, so the index is cached
+    in the :obj:`INDEX_FILE` inside PyScaffold's config dir and reused until the
+    registered entry points (or the versions of the distributions providing them)
+    change.
+
+    .. _setuptools: https://setuptools.pypa.io/en/latest/userguide/entry_point.html
+    """  # noqa
+    from .. import info  # late import due to cycles
+
+    entry_points = list(iterate_entry_points(group))
+    fingerprint = _fingerprint(entry_points)
+    file = info.config_file(INDEX_FILE, default=None)
+
+    if file and file.exists():
+        try:
+            index = json.loads(file.read_text("utf-8"))
+            if index.get("fingerprint") == fingerprint and _valid_flags(index["flags"]):
+                return index["flags"]
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            pass  # invalid/stale index => rebuild
+
+    flags = {e.name: cli_flags(load_from_entry_point(e)) for e in entry_points}
+    if file:
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            index = {"fingerprint": fingerprint, "flags": flags}
+            file.write_text(json.dumps(index, indent=2), "utf-8")
+        except OSError:  # pragma: no cover
+            pass  # a read-only config dir should not prevent PyScaffold from working
+
+    return flags
+
+
+def _valid_flags(flags: Any) -> bool:
+    return isinstance(flags, dict) and all(
+        isinstance(v, list) and all(isinstance(f, str) for f in v)
+        for v in flags.values()
+    )
+
+
+def cli_flags(extension: Extension) -> List[str]:
+    """List the option strings (e.g. ``--flag``) added by the extension to the CLI"""
+    parser = argparse.ArgumentParser(add_help=False)
+    extension.augment_cli(parser)
+    return [flag for action in parser._actions for flag in action.option_strings]
+
+
+def _fingerprint(entry_points: Iterable["EntryPoint"]) -> str:
+    def _describe(entry_point: "EntryPoint") -> str:
+        dist = getattr(entry_point, "dist", None)
+        dist_id = f"{dist.name}=={dist.version}" if dist else ""
+        return f"{entry_point.name}={entry_point.value}@{dist_id}"
+
+    text = "\n".join(sorted(_describe(e) for e in entry_points))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
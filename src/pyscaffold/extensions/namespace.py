@@ -108,16 +108,17 @@ def add_namespace(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
         return struct, opts
 
     namespace = opts["ns_list"][-1].split(".")
-    base_struct = struct
-    struct = cast(Structure, base_struct["src"])  # recursive types not supported yet
-    pkg_struct = cast(Structure, struct[opts["package"]])
-    del struct[opts["package"]]
+    src = cast(Structure, struct["src"]).copy()  # recursive types not supported yet
+    pkg_struct = src.pop(opts["package"])
+    # ^  the original nested dicts are shared by other structures, so they are copied
+    #    instead of being changed in place
+    parent = src
     for sub_package in namespace:
-        struct[sub_package] = {"__init__.py": ("", remove)}  # convert to PEP420
-        struct = cast(Structure, struct[sub_package])
-    struct[opts["package"]] = pkg_struct
+        parent[sub_package] = {"__init__.py": ("", remove)}  # convert to PEP420
+        parent = cast(Structure, parent[sub_package])
+    parent[opts["package"]] = pkg_struct
 
-    return base_struct, opts
+    return {**struct, "src": src}, opts
 
 
 def move_old_package(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
@@ -30,6 +30,7 @@ def remove_files(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
     """
     # Namespace is not yet applied so deleting from package is enough
     src = Path("src")
-    struct = structure.reject(struct, src / opts["package"] / "skeleton.py")
-    struct = structure.reject(struct, "tests/test_skeleton.py")
-    return struct, opts
+    with structure.transaction(struct) as tx:
+        tx.reject(src / opts["package"] / "skeleton.py")
+        tx.reject("tests/test_skeleton.py")
+    return tx.struct, opts
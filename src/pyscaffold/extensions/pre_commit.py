@@ -4,7 +4,6 @@ Extension that generates configuration files for Yelp `pre-commit`_.
 .. _pre-commit: https://pre-commit.com
 """
 
-from functools import partial
 from typing import List
 
 from .. import shell, structure
@@ -12,7 +11,7 @@ from ..actions import Action, ActionParams, ScaffoldOpts, Structure
 from ..exceptions import ShellCommandException
 from ..file_system import chdir
 from ..log import logger
-from ..operations import FileOp, no_overwrite
+from ..operations import FileContents, FileOp, no_overwrite
 from ..structure import AbstractContent, ResolvedLeaf
 from ..templates import get_template
 from . import Extension, venv
@@ -90,8 +89,10 @@ def add_files(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
         ".isort.cfg": (get_template("isort_cfg"), no_overwrite()),
     }
 
-    struct = structure.modify(struct, "README.rst", partial(add_instructions, opts))
-    return structure.merge(struct, files), opts
+    with structure.transaction(struct) as tx:
+        tx.modify("README.rst", _lazy_instructions)
+        tx.merge(files)
+    return tx.struct, opts
 
 
 def find_executable(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
@@ -128,14 +129,29 @@ def install(struct: Structure, opts: ScaffoldOpts) -> ActionParams:
     return struct, opts
 
 
+def _lazy_instructions(content: AbstractContent, file_op: FileOp) -> ResolvedLeaf:
+    """Postpone :obj:`add_instructions` (and the rendering of the README) until the
+    file is actually created
+    """
+
+    def _render(opts: ScaffoldOpts) -> FileContents:
+        return _insert_note(structure.reify_content(content, opts), opts)
+
+    return structure.LazyContent(_render), file_op
+
+
 def add_instructions(
     opts: ScaffoldOpts, content: AbstractContent, file_op: FileOp
 ) -> ResolvedLeaf:
     """Add pre-commit instructions to README"""
-    text = structure.reify_content(content, opts)
+    return _insert_note(structure.reify_content(content, opts), opts), file_op
+
+
+def _insert_note(text: FileContents, opts: ScaffoldOpts) -> FileContents:
     if text is not None:
+        assert isinstance(text, str), f"README template should be text, not {text!r}"
         i = text.find(INSERT_AFTER)
         assert i > 0, f"{INSERT_AFTER!r} not found in README template:\n{text}"
         j = i + len(INSERT_AFTER)
         text = text[:j] + README_NOTE.format(**opts) + text[j:]
-    return text, file_op
+    return text
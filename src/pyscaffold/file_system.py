@@ -8,20 +8,102 @@ flag).
 """
 
 import errno
+import hashlib
 import os
 import shutil
 import stat
+import sys
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import partial
 from pathlib import Path
 from tempfile import mkstemp
-from typing import Callable, Optional, Union
-
+from types import ModuleType
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+    cast,
+)
+from uuid import uuid4
+
+from . import profiling
 from .log import logger
 from .shell import IS_WINDOWS
 
+if sys.version_info[:2] >= (3, 9):
+    from importlib.resources import files as _resource_files
+else:  # pragma: no cover
+
+    def _resource_files(package: Union[str, ModuleType]) -> Path:
+        from importlib import import_module  # lazy: only needed for old Pythons
+
+        module = import_module(package) if isinstance(package, str) else package
+        return Path(cast(str, module.__file__)).parent
+
+
 PathLike = Union[str, os.PathLike]
 
+Chunk = Union[str, bytes]
+
+
+class SourceFile:
+    """Reference to an existing file (e.g. a binary asset shipped inside of a Python
+    package) to be used as file contents in the project structure.
+
+    The contents are copied to the disk as they are (byte by byte), without being
+    loaded into memory, using the fastest mechanism available in the platform
+    (see :obj:`create_file`).
+
+    Args:
+        source: path to the existing file, or any :obj:`importlib.resources` traversable
+            object (such as the ones obtained via :obj:`from_resource`).
+
+    .. versionadded:: 4.7
+    """
+
+    def __init__(self, source: Union[PathLike, Any]):
+        self.source = source if hasattr(source, "open") else Path(source)
+
+    @classmethod
+    def from_resource(
+        cls, package: Union[str, ModuleType], resource: str
+    ) -> "SourceFile":
+        """Reference a resource (data file) inside of a Python package.
+
+        Example::
+
+            SourceFile.from_resource("pyscaffoldext.myext.assets", "logo.png")
+        """
+        return cls(_resource_files(package).joinpath(resource))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({str(self.source)!r})"
+
+
+Streamable = Union[bytes, Iterable[Chunk], IO, SourceFile]
+"""File contents that can be streamed to the disk by :obj:`create_file`, without
+requiring the whole text in memory::
+
+    Union[bytes, Iterable[Union[str, bytes]], IO, SourceFile]
+
+``IO`` stands for any file-like object (in text or binary mode) with a ``read`` method.
+Iterables are expected to produce the chunks lazily (e.g. generators): :obj:`str`,
+:obj:`list`, :obj:`tuple` and :obj:`dict` objects are not considered streamable, to
+avoid confusing them with other types of leaves and directories in the project
+structure (please use ``iter(...)`` or ``"".join(...)`` for chunks already in memory).
+"""
+
+CHUNK_SIZE = 2**16
+"""Maximum number of bytes (or characters) read at once from file-like objects"""
+
 
 @contextmanager
 def tmpfile(**kwargs):
@@ -83,7 +165,9 @@ def move(*src: PathLike, target: PathLike, **kwargs):
         logger.report("move", path, target=target)
 
 
-def create_file(path: PathLike, content: str, pretend=False, encoding="utf-8"):
+def create_file(
+    path: PathLike, content: Union[str, Streamable], pretend=False, encoding="utf-8"
+):
     """Create a file in the given path.
 
     This function reports the operation in the logs.
@@ -96,15 +180,181 @@ def create_file(path: PathLike, content: str, pretend=False, encoding="utf-8"):
 
     Returns:
         Path: given path
+
+    .. versionchanged:: 4.7
+       ``content`` can also be :obj:`Streamable` (:obj:`bytes`, an iterable of
+       :obj:`str`/:obj:`bytes` chunks or a file-like object). In that case the
+       contents are written in chunks as they are produced (text chunks are encoded
+       and have their line endings translated just like :obj:`Path.write_text`).
+       When pretending, the contents are not consumed.
+       :obj:`SourceFile` contents are cloned (reflink) or copied inside of the kernel
+       (``copy_file_range``/``sendfile``) when supported, falling back to buffered
+       copying otherwise.
+       While a :obj:`journal` is active, the file is written to a temporary sibling
+       and then moved into place.
     """
     path = Path(path)
     if not pretend:
-        path.write_text(content, encoding=encoding)
+        write_file(path, content, encoding)
 
     logger.report("create", path)
     return path
 
 
+def write_file(
+    path: PathLike, content: Union[str, Streamable], encoding="utf-8"
+) -> Path:
+    """Write ``content`` to the given path, without reporting the operation in the
+    logs (see :obj:`create_file` for the accepted types of content).
+
+    Differently from writing the file directly, the operation is recorded by the
+    active :obj:`journal` and :mod:`profile <pyscaffold.profiling>` (if any).
+    """
+    path = Path(path)
+    if not isinstance(content, str) and not is_streamable(content):
+        raise TypeError(f"Don't know how to write content of type {type(content)}.")
+
+    with _writing(path) as target:
+        if isinstance(content, str):
+            target.write_text(content, encoding=encoding)
+        elif isinstance(content, SourceFile):
+            _copy(content.source, target)
+        else:
+            _stream(target, content, encoding)
+    profiling.record_file(path)
+    return path
+
+
+def is_streamable(content) -> bool:
+    """Check if ``content`` is :obj:`Streamable` (see :obj:`create_file`)"""
+    if isinstance(content, _NOT_STREAMABLE):
+        return False
+    return isinstance(content, (bytes, Iterable, SourceFile)) or hasattr(
+        content, "read"
+    )
+
+
+_NOT_STREAMABLE = (str, list, tuple, Mapping)
+
+
+def _stream(path: Path, content: Streamable, encoding="utf-8"):
+    if isinstance(content, bytes):
+        chunks: Iterable[Chunk] = [content]
+    elif hasattr(content, "read"):
+        chunks = _read_chunks(cast(IO, content))
+    else:
+        chunks = cast(Iterable[Chunk], content)
+
+    with open(path, "wb") as file:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                if os.linesep != "\n":
+                    # Mirror the newline translation performed by ``Path.write_text``
+                    chunk = chunk.replace("\n", os.linesep)
+                chunk = chunk.encode(encoding)
+            file.write(chunk)
+
+
+def _copy(source: Any, path: Path):
+    if not isinstance(source, Path):
+        # Resources that are not directly in the disk (e.g. inside of zip files)
+        with source.open("rb") as src, open(path, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        return
+
+    with open(source, "rb") as src, open(path, "wb") as dst:
+        if _clone(src, dst) or _copy_range(src, dst):
+            return
+
+    shutil.copyfile(source, path)
+    # ^  `shutil` already uses `sendfile` (Linux) or `fcopyfile` (macOS) when possible
+
+
+_FICLONE = 0x40049409
+"""``ioctl`` request for cloning files in Linux (see ``linux/fs.h``)"""
+
+
+def _clone(src: IO, dst: IO) -> bool:
+    """Share the data blocks between both files (copy-on-write), when supported by the
+    file system (e.g. Btrfs, XFS)
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl  # lazy: not available in all the platforms
+
+    try:
+        fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _copy_range(src: IO, dst: IO) -> bool:
+    """Copy the contents without passing them through the user space"""
+    copy_file_range = getattr(os, "copy_file_range", None)  # Linux + Python >= 3.8
+    if copy_file_range is None:
+        return False
+
+    remaining = os.fstat(src.fileno()).st_size
+    copied = 0
+    try:
+        while remaining > 0:
+            count = copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if count == 0:
+                break
+            copied += count
+            remaining -= count
+    except OSError:
+        if copied:
+            raise
+        return False  # e.g. not supported between the given file systems
+
+    return remaining <= 0
+
+
+def _read_chunks(source: IO, chunk_size=CHUNK_SIZE) -> Iterator[Chunk]:
+    chunk = source.read(chunk_size)
+    while chunk:
+        yield chunk
+        chunk = source.read(chunk_size)
+
+
+def is_unchanged(path: PathLike, content: str, encoding="utf-8") -> bool:
+    """Check if the file in the given path already holds the exact same bytes
+    :obj:`create_file` would write for ``content``.
+
+    The sizes are compared first, so in the common case of files that differ,
+    no hashing is required.
+
+    Args:
+        path: path in the file system to be checked.
+        content: text that would be written to the file.
+
+    Returns:
+        bool: ``True`` if the file exists and its contents are identical.
+    """
+    data = content.encode(encoding)
+    if os.linesep != "\n":
+        # Mirror the newline translation performed by ``Path.write_text``
+        data = data.replace(b"\n", os.linesep.encode(encoding))
+
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        return _digest(path) == hashlib.sha256(data).digest()
+    except OSError:  # e.g.: file not found or it is a directory
+        return False
+
+
+def _digest(path: PathLike, chunk_size=2**16) -> bytes:
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(partial(file.read, chunk_size), b""):
+            sha.update(chunk)
+    return sha.digest()
+
+
 def create_directory(path: PathLike, update=False, pretend=False) -> Optional[Path]:
     """Create a directory in the given path.
 
@@ -123,6 +373,9 @@ def create_directory(path: PathLike, update=False, pretend=False) -> Optional[Pa
         return None
 
     if not pretend:
+        current = _journal.get()
+        if current:
+            current.record_directory(path)
         try:
             path.mkdir(parents=True, exist_ok=True)
         except OSError:
@@ -150,6 +403,9 @@ def chmod(path: PathLike, mode: int, pretend=False) -> Path:
     mode = stat.S_IMODE(mode)
 
     if not pretend:
+        current = _journal.get()
+        if current:
+            current.record_chmod(path)
         path.chmod(mode)
 
     logger.report(f"chmod {mode:03o}", path)
@@ -281,13 +537,21 @@ def on_ro_error(func, path, exc_info):
 
 
 def rm_rf(path: PathLike, pretend=False):
-    """Remove ``path`` by all means like ``rm -rf`` in Linux"""
+    """Remove ``path`` by all means like ``rm -rf`` in Linux
+
+    .. versionchanged:: 4.7
+       While a :obj:`journal` is active, ``path`` is moved out of the way instead (and
+       only deleted when the journal is committed).
+    """
     target = Path(path)
     if not target.exists():
         return None
 
-    if target.is_dir():
-        remove: Callable = partial(shutil.rmtree, onerror=on_ro_error)
+    current = _journal.get()
+    if current is not None:
+        remove: Callable = current.remove
+    elif target.is_dir():
+        remove = partial(shutil.rmtree, onerror=on_ro_error)
     else:
         remove = Path.unlink
 
@@ -296,3 +560,180 @@ def rm_rf(path: PathLike, pretend=False):
 
     logger.report("remove", target)
     return path
+
+
+# -------- Atomic materialization --------
+
+
+class Journal:
+    """Undo log of the changes performed by :obj:`create_file`,
+    :obj:`create_directory`, :obj:`chmod` and :obj:`rm_rf` while :obj:`journal` is
+    active.
+
+    Files are written to a temporary sibling and then moved into place with
+    :obj:`os.replace`, so each one of them is either completely written or not touched
+    at all. The previous versions of replaced (or removed) files are kept as backups
+    until the journal is committed, so all the changes can be rolled back.
+
+    .. versionadded:: 4.7
+    """
+
+    def __init__(self):
+        self._undo: List[Callable[[], Any]] = []
+        self._backups: List[Path] = []
+        self._lock = threading.Lock()
+
+    def _record(self, undo: Callable[[], Any], backup: Optional[Path] = None):
+        with self._lock:
+            self._undo.append(undo)
+            if backup:
+                self._backups.append(backup)
+
+    @contextmanager
+    def write(self, path: Path) -> Iterator[Path]:
+        """Yield a temporary path to be written, that replaces ``path`` on exit"""
+        staging = _sibling(path, "tmp")
+        try:
+            yield staging
+            if path.exists():
+                backup = _sibling(path, "bak")
+                try:
+                    os.link(path, backup)  # cheap backup (the inode is kept)
+                except OSError:
+                    shutil.copy2(path, backup)
+                shutil.copymode(path, staging)
+                self._record(partial(os.replace, backup, path), backup)
+            else:
+                self._record(partial(_unlink, path))
+            os.replace(staging, path)
+        finally:
+            _unlink(staging)
+
+    def remove(self, path: Path):
+        """Move ``path`` (file or directory) to a backup, restored on rollback"""
+        backup = _sibling(path, "bak")
+        os.rename(path, backup)
+        self._record(partial(os.replace, backup, path), backup)
+
+    def record_directory(self, path: Path):
+        """Register the directories that will be created for ``path``"""
+        missing = [p for p in (path, *path.parents) if not p.exists()]
+        for directory in reversed(missing):  # parents first
+            self._record(partial(_rmdir, directory))
+
+    def record_chmod(self, path: Path):
+        """Register the current permissions of ``path`` before they change"""
+        self._record(partial(os.chmod, path, stat.S_IMODE(path.stat().st_mode)))
+
+    def commit(self):
+        """Discard the undo log (and the backups of the replaced files)"""
+        with self._lock:
+            for backup in self._backups:
+                _discard(backup)
+            self._undo.clear()
+            self._backups.clear()
+
+    def rollback(self):
+        """Revert the registered changes (in reverse order)"""
+        with self._lock:
+            for undo in reversed(self._undo):
+                try:
+                    undo()
+                except OSError as ex:  # best effort: revert as much as possible
+                    logger.warning(f"Could not revert change in the disk: {ex}")
+            self._undo.clear()
+        self.commit()
+
+
+_journal: ContextVar[Optional[Journal]] = ContextVar("journal", default=None)
+
+
+@contextmanager
+def journal() -> Iterator[Journal]:
+    """Context manager that records the changes in the file system (see
+    :obj:`Journal`), rolling them back if an exception (including
+    :obj:`KeyboardInterrupt`) is raised before the context ends.
+
+    Nested calls share the outermost journal. The journal is only active in the
+    current thread (or :mod:`context <contextvars>`): please use
+    :obj:`contextvars.copy_context` to propagate it to tasks running in other threads.
+
+    .. versionadded:: 4.7
+    """
+    existing = _journal.get()
+    if existing is not None:
+        yield existing
+        return
+
+    current = Journal()
+    token = _journal.set(current)
+    try:
+        yield current
+    except BaseException:
+        current.rollback()
+        raise
+    else:
+        current.commit()
+    finally:
+        _journal.reset(token)
+
+
+@contextmanager
+def staging_dir(path: PathLike) -> Iterator[Path]:
+    """Context manager that yields an empty temporary sibling of the ``path`` directory.
+    When the context ends, the temporary directory is renamed to ``path`` in a single
+    step, or removed if an exception is raised.
+
+    .. versionadded:: 4.7
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        staging = _sibling(path, "tmp")
+        try:
+            staging.mkdir()  # unlike mkdtemp, mkdir respects the umask
+            break
+        except FileExistsError:  # pragma: no cover
+            continue
+
+    try:
+        yield staging
+        os.rename(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, onerror=on_ro_error)
+        raise
+
+
+@contextmanager
+def _writing(path: Path) -> Iterator[Path]:
+    current = _journal.get()
+    if current is None:
+        yield path
+    else:
+        with current.write(path) as staging:
+            yield staging
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(f".{path.name}.{uuid4().hex[:8]}.{suffix}")
+
+
+def _unlink(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _discard(path: Path):
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, onerror=on_ro_error)
+    else:
+        _unlink(path)
+
+
+def _rmdir(path: Path):
+    try:
+        path.rmdir()
+    except OSError:
+        pass  # not empty: something else was added in the meantime
@@ -4,7 +4,7 @@ identifiers.
 
 import keyword
 import re
-from typing import Callable, Iterable, List, TypeVar
+from typing import Callable, Iterable, List, Optional, TypeVar
 
 from .exceptions import InvalidIdentifier
 
@@ -51,20 +51,29 @@ def make_valid_identifier(string: str) -> str:
 
 
 # from https://en.wikibooks.org/, Creative Commons Attribution-ShareAlike 3.0
-def levenshtein(s1: str, s2: str) -> int:
+def levenshtein(s1: str, s2: str, bound: Optional[int] = None) -> int:
     """Calculate the Levenshtein distance between two strings
 
     Args:
         s1: first string
         s2: second string
+        bound: maximum distance of interest. When given, the calculation stops as
+            soon as the distance is known to be larger than ``bound``
+            (in that case ``bound + 1`` is returned)
 
     Returns:
         Distance between s1 and s2
+
+    .. versionchanged:: 4.7
+       Added ``bound``.
     """
     if len(s1) < len(s2):
-        return levenshtein(s2, s1)
+        return levenshtein(s2, s1, bound)
 
     # len(s1) >= len(s2)
+    if bound is not None and len(s1) - len(s2) > bound:
+        return bound + 1
+
     if len(s2) == 0:
         return len(s1)
 
@@ -76,6 +85,8 @@ def levenshtein(s1: str, s2: str) -> int:
             deletions = current_row[j] + 1
             substitutions = previous_row[j] + (c1 != c2)
             current_row.append(min(insertions, deletions, substitutions))
+        if bound is not None and min(current_row) > bound:
+            return bound + 1
         previous_row = current_row
 
     return previous_row[-1]
@@ -5,16 +5,23 @@ Provide general information about the system, user and the package itself.
 import copy
 import getpass
 import os
+import re
 import socket
 import sys
 from enum import Enum
-from operator import itemgetter
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Set, cast, overload
-
-import platformdirs
-from configupdater import ConfigUpdater
-from packaging.version import Version
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    cast,
+    overload,
+)
 
 from . import __name__ as PKG_NAME
 from . import shell, toml
@@ -31,6 +38,11 @@ from .identification import deterministic_sort, levenshtein, underscore
 from .log import logger
 from .templates import ScaffoldOpts, licenses, parse_extensions
 
+if TYPE_CHECKING:  # pragma: no cover
+    # ^  the following dependencies are expensive to import, so they are only imported
+    #    in the functions that need them
+    from configupdater import ConfigUpdater
+
 CONFIG_FILE = "default.cfg"
 """PyScaffold's own config file name"""
 
@@ -47,14 +59,63 @@ class GitEnv(Enum):
     committer_date = "GIT_COMMITTER_DATE"
 
 
+_GIT_CONFIG_ENV = (
+    "HOME",
+    "USERPROFILE",
+    "XDG_CONFIG_HOME",
+    "GIT_DIR",
+    "GIT_CONFIG",
+    "GIT_CONFIG_GLOBAL",
+    "GIT_CONFIG_SYSTEM",
+    "GIT_CONFIG_NOSYSTEM",
+    "GIT_CONFIG_COUNT",
+)
+"""Environment variables that influence the outcome of ``git config``"""
+
+
+def git_config() -> Optional[Dict[str, str]]:
+    """Retrieve all the git settings visible from the current working directory
+    (e.g. ``user.name``, ``user.email``) with a single ``git config --list`` call.
+
+    The result is memoized per working directory and relevant environment variables,
+    so the git-related functions in this module share the same subprocess.
+    See :obj:`clear_git_config`.
+
+    Returns:
+        Dictionary with the settings or ``None`` if git is not available.
+    """
+    env = tuple(os.getenv(var) for var in _GIT_CONFIG_ENV)
+    return _git_config(os.getcwd(), env)
+
+
+def clear_git_config():
+    """Invalidate the values memoized by :obj:`git_config` (e.g. when the git
+    configuration changes during the execution of the program).
+    """
+    _git_config.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _git_config(_cwd: str, _env: Tuple[Optional[str], ...]) -> Optional[Dict[str, str]]:
+    # Arguments are only used as cache keys
+    try:
+        output = shell.git_output("config", "--list", "-z")
+    except ShellCommandException:
+        return None
+
+    # `-z`: entries are separated by NUL and keys by the first newline
+    entries = (entry.partition("\n") for entry in output.split("\0") if entry)
+    return {key: value for key, _, value in entries}
+    # ^  Similarly to `git config --get`, the last value wins for multi-valued keys
+
+
 def username() -> str:
     """Retrieve the user's name"""
     user = os.getenv(GitEnv.author_name.value)
     if user is None:
         try:
-            user = next(shell.git("config", "--get", "user.name"))
-            user = user.strip()
-        except ShellCommandException:
+            user = (git_config() or {})["user.name"].strip()
+        except KeyError:
             try:
                 # On Windows the getpass commands might fail if 'USERNAME'
                 # env var is not set
@@ -70,9 +131,8 @@ def email() -> str:
     mail = os.getenv(GitEnv.author_email.value)
     if mail is None:
         try:
-            mail = next(shell.git("config", "--get", "user.email"))
-            mail = mail.strip()
-        except ShellCommandException:
+            mail = (git_config() or {})["user.email"].strip()
+        except KeyError:
             try:
                 # On Windows the getpass commands might fail
                 user = getpass.getuser()
@@ -87,6 +147,8 @@ def email() -> str:
 def is_git_installed() -> bool:
     """Check if git is installed"""
     logger.report("check", "is git installed...")
+    if git_config() is not None:
+        return True  # git could run
     try:
         shell.git("--version")
     except ShellCommandException:
@@ -106,14 +168,9 @@ def is_git_configured() -> bool:
     logger.report("check", "is git configured...")
     if os.getenv(GitEnv.author_name.value) and os.getenv(GitEnv.author_email.value):
         return True
-    else:
-        try:
-            for attr in ("name", "email"):
-                shell.git("config", "--get", f"user.{attr}")
-        except ShellCommandException:
-            return False
-        else:
-            return True
+
+    config = git_config() or {}
+    return all(f"user.{attr}" in config for attr in ("name", "email"))
 
 
 def check_git():
@@ -228,17 +285,134 @@ def project(
     return opts
 
 
-def best_fit_license(txt: Optional[str]) -> str:
-    """Finds proper license name for the license defined in txt"""
-    corresponding = {
-        **{v.replace("license_", ""): k for k, v in licenses.items()},
-        **{_simplify_license_name(k): k for k in licenses},
-        **{k: k for k in licenses},  # last defined: possibly overwrite
-    }
-    lic = underscore(txt or list(licenses)[0]).replace("_", "")
-    candidates = {underscore(k).replace("_", ""): v for k, v in corresponding.items()}
-    ratings = {k: levenshtein(lic.lower(), k.lower()) for k, v in candidates.items()}
-    return candidates[min(ratings.items(), key=itemgetter(1))[0]]
+LICENSE_ALIASES = {
+    # Trove classifiers (https://pypi.org/classifiers/)
+    "License :: OSI Approved :: MIT License": "MIT",
+    "License :: OSI Approved :: GNU Affero General Public License v3": "AGPL-3.0-only",
+    "License :: OSI Approved :: GNU Affero General Public License v3 or later (AGPLv3+)": "AGPL-3.0-or-later",  # noqa
+    "License :: OSI Approved :: Apache Software License": "Apache-2.0",
+    "License :: OSI Approved :: Artistic License": "Artistic-2.0",
+    "License :: OSI Approved :: BSD Zero Clause License (0BSD)": "0BSD",
+    "License :: CC0 1.0 Universal (CC0 1.0) Public Domain Dedication": "CC0-1.0",
+    "License :: OSI Approved :: Eclipse Public License 1.0 (EPL-1.0)": "EPL-1.0",
+    "License :: OSI Approved :: GNU General Public License v2 (GPLv2)": "GPL-2.0-only",
+    "License :: OSI Approved :: GNU General Public License v2 or later (GPLv2+)": "GPL-2.0-or-later",  # noqa
+    "License :: OSI Approved :: GNU General Public License v3 (GPLv3)": "GPL-3.0-only",
+    "License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)": "GPL-3.0-or-later",  # noqa
+    "License :: OSI Approved :: ISC License (ISCL)": "ISC",
+    "License :: OSI Approved :: GNU Lesser General Public License v2 (LGPLv2)": "LGPL-2.0-only",  # noqa
+    "License :: OSI Approved :: GNU Lesser General Public License v2 or later (LGPLv2+)": "LGPL-2.0-or-later",  # noqa
+    "License :: OSI Approved :: GNU Lesser General Public License v3 (LGPLv3)": "LGPL-3.0-only",  # noqa
+    "License :: OSI Approved :: GNU Lesser General Public License v3 or later (LGPLv3+)": "LGPL-3.0-or-later",  # noqa
+    "License :: OSI Approved :: Mozilla Public License 2.0 (MPL 2.0)": "MPL-2.0",
+    "License :: OSI Approved :: The Unlicense (Unlicense)": "Unlicense",
+    "License :: Other/Proprietary License": "Proprietary",
+    # Common abbreviations and deprecated SPDX identifiers
+    "AGPLv3": "AGPL-3.0-only",
+    "AGPLv3+": "AGPL-3.0-or-later",
+    "AGPL-3.0": "AGPL-3.0-only",
+    "AGPL-3.0+": "AGPL-3.0-or-later",
+    "GPLv2": "GPL-2.0-only",
+    "GPLv2+": "GPL-2.0-or-later",
+    "GPL-2.0": "GPL-2.0-only",
+    "GPL-2.0+": "GPL-2.0-or-later",
+    "GPLv3": "GPL-3.0-only",
+    "GPLv3+": "GPL-3.0-or-later",
+    "GPL-3.0": "GPL-3.0-only",
+    "GPL-3.0+": "GPL-3.0-or-later",
+    "LGPLv2": "LGPL-2.0-only",
+    "LGPLv2+": "LGPL-2.0-or-later",
+    "LGPL-2.0": "LGPL-2.0-only",
+    "LGPL-2.0+": "LGPL-2.0-or-later",
+    "LGPLv3": "LGPL-3.0-only",
+    "LGPLv3+": "LGPL-3.0-or-later",
+    "LGPL-3.0": "LGPL-3.0-only",
+    "LGPL-3.0+": "LGPL-3.0-or-later",
+    "ISCL": "ISC",
+    "MPL 2.0": "MPL-2.0",
+}
+"""Alternative names (e.g. trove classifiers) for the licenses in
+:obj:`~pyscaffold.templates.licenses`, recognised by :obj:`best_fit_license`
+"""
+
+SPDX_OPERATORS = re.compile(r"\s+(?:OR|AND)\s+|[()]")
+"""Regex to split :pep:`639`/SPDX license expressions, e.g. ``MIT OR Apache-2.0``
+(exceptions, i.e. ``WITH ...`` clauses, are handled separately)
+"""
+
+
+class LicenseIndex:
+    """Index of license names, used to find the best fit for the given text.
+
+    Exact matches (after normalisation, i.e. ignoring case, spaces and punctuation)
+    for the license identifiers, their nicknames (e.g. the name of the template file)
+    and the ``aliases`` are resolved with a single lookup. Otherwise, the license with
+    the smallest Levenshtein distance is chosen (the calculation is interrupted as
+    soon as a candidate cannot beat the best one found so far).
+
+    Args:
+        licenses: mapping between license identifiers and template names
+            (see :obj:`pyscaffold.templates.licenses`). The first one is the default.
+        aliases: mapping between alternative names and license identifiers
+
+    .. versionadded:: 4.7
+    """
+
+    MAX_MEMO = 1024
+    """Maximum number of fuzzy matches remembered"""
+
+    def __init__(
+        self, licenses: Mapping[str, str], aliases: Optional[Mapping[str, str]] = None
+    ):
+        corresponding = {
+            **{v.replace("license_", ""): k for k, v in licenses.items()},
+            **{_simplify_license_name(k): k for k in licenses},
+            **{k: k for k in licenses},  # last defined: possibly overwrite
+        }
+        candidates = {_normalise_license(k): v for k, v in corresponding.items()}
+        self.default = next(iter(licenses))
+        self._candidates: List[Tuple[str, str]] = list(candidates.items())
+        self._exact: Dict[str, str] = {
+            **{_normalise_license(k): v for k, v in (aliases or {}).items()},
+            **candidates,
+        }
+        self._fuzzy: Dict[str, str] = {}  # memo for the fuzzy matches
+
+    def best_fit(self, txt: Optional[str]) -> str:
+        """Finds proper license name for the license defined in ``txt``.
+        For SPDX expressions involving several licenses, the first one is used.
+        """
+        if not txt:
+            return self.default
+
+        lic = _normalise_license(txt)
+        if lic in self._exact:
+            return self._exact[lic]
+
+        terms = [t for t in SPDX_OPERATORS.split(txt) if t and not t.isspace()]
+        if len(terms) > 1 or " WITH " in txt:
+            return self.best_fit(terms[0].split(" WITH ")[0].strip())
+
+        if lic not in self._fuzzy:
+            if len(self._fuzzy) >= self.MAX_MEMO:
+                self._fuzzy.clear()
+            self._fuzzy[lic] = self._closest(lic)
+        return self._fuzzy[lic]
+
+    def _closest(self, lic: str) -> str:
+        best, best_dist = self.default, None
+        for key, value in self._candidates:
+            if best_dist is not None and abs(len(key) - len(lic)) >= best_dist:
+                continue  # the distance cannot be smaller than the length difference
+            bound = None if best_dist is None else best_dist - 1
+            dist = levenshtein(lic, key, bound)
+            if best_dist is None or dist < best_dist:
+                best, best_dist = value, dist
+        return best
+
+
+def _normalise_license(name: str) -> str:
+    return underscore(name.replace("+", "-or-later")).replace("_", "")
 
 
 def _simplify_license_name(name: str) -> str:
@@ -247,7 +421,23 @@ def _simplify_license_name(name: str) -> str:
     return name
 
 
-def read_setupcfg(path: PathLike, filename=SETUP_CFG) -> ConfigUpdater:
+LICENSES = LicenseIndex(licenses, LICENSE_ALIASES)
+"""Index used by :obj:`best_fit_license`, built once from
+:obj:`pyscaffold.templates.licenses` and :obj:`LICENSE_ALIASES`
+"""
+
+
+def best_fit_license(txt: Optional[str]) -> str:
+    """Finds proper license name for the license defined in txt
+
+    .. versionchanged:: 4.7
+       Use a precomputed :obj:`LicenseIndex`, recognising :obj:`LICENSE_ALIASES`
+       and SPDX license expressions.
+    """
+    return LICENSES.best_fit(txt)
+
+
+def read_setupcfg(path: PathLike, filename=SETUP_CFG) -> "ConfigUpdater":
     """Reads-in a configuration file that follows a setup.cfg format.
     Useful for retrieving stored information (e.g. during updates)
 
@@ -263,6 +453,8 @@ def read_setupcfg(path: PathLike, filename=SETUP_CFG) -> ConfigUpdater:
     if path.is_dir():
         path = path / (filename or SETUP_CFG)
 
+    from configupdater import ConfigUpdater  # lazy: expensive to import
+
     updater = ConfigUpdater()
     updater.read(str(path), encoding="utf-8")
 
@@ -291,17 +483,27 @@ def read_pyproject(path: PathLike, filename=PYPROJECT_TOML) -> toml.TOMLMapping:
     return config
 
 
-def get_curr_version(project_path: PathLike):
+def get_curr_version(
+    project_path: PathLike, setupcfg: Optional["ConfigUpdater"] = None
+):
     """Retrieves the PyScaffold version that put up the scaffold
 
     Args:
         project_path: path to project
+        setupcfg: ``setup.cfg`` already parsed via :obj:`read_setupcfg`
+            (read from ``project_path`` when not given)
 
     Returns:
         Version: version specifier
+
+    .. versionchanged:: 4.7
+       Added the ``setupcfg`` argument.
     """
-    setupcfg = read_setupcfg(project_path).to_dict()
-    return Version(str(setupcfg["pyscaffold"]["version"]))
+    if setupcfg is None:
+        setupcfg = read_setupcfg(project_path)
+    from packaging.version import Version  # lazy: expensive to import
+
+    return Version(str(setupcfg["pyscaffold"]["version"].value))
 
 
 (RAISE_EXCEPTION,) = list(Enum("default", "RAISE_EXCEPTION"))  # type: ignore
@@ -338,6 +540,8 @@ def config_dir(prog=PKG_NAME, org=None, default=RAISE_EXCEPTION):
         Location somewhere in the user's home directory where to put the configs.
     """
     try:
+        import platformdirs  # lazy: expensive to import
+
         return Path(platformdirs.user_config_dir(prog, org, roaming=True))
     except Exception as ex:
         if default is not RAISE_EXCEPTION:
@@ -2,13 +2,16 @@
 Custom logging infrastructure to provide execution information for the user.
 """
 
+import json
 import logging
+import os
+import threading
 from collections import defaultdict
 from contextlib import contextmanager
 from logging import INFO, Formatter, Handler, LoggerAdapter, StreamHandler, getLogger
 from os.path import realpath, relpath
 from os.path import sep as pathsep
-from typing import DefaultDict, Optional, Sequence, cast
+from typing import DefaultDict, Iterable, Iterator, List, Optional, Sequence, cast
 
 from . import termui
 
@@ -129,6 +132,7 @@ class ColoredReportFormatter(ReportFormatter):
         remove=("red", "bold"),
         delete=("red", "bold"),
         skip=("yellow", "bold"),
+        unchanged=("yellow", "bold"),
         run=("magenta", "bold"),
         invoke=("bold",),
     )
@@ -162,6 +166,73 @@ class ColoredReportFormatter(ReportFormatter):
         return super().format_default(record)
 
 
+class _ThreadBuffer(logging.Filter):
+    """Filter that holds the log records produced by threads that explicitly asked for
+    it (instead of allowing them to be emitted).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+
+    def filter(self, record):
+        records = getattr(self._local, "records", None)
+        if records is None:
+            return True
+
+        records.append(record)
+        return False
+
+    @contextmanager
+    def hold(self) -> Iterator[List[logging.LogRecord]]:
+        previous = getattr(self._local, "records", None)
+        records: List[logging.LogRecord] = []
+        self._local.records = records
+        try:
+            yield records
+        finally:
+            self._local.records = previous
+
+
+class JsonReportFormatter(Formatter):
+    """Formatter that produces a JSON object per log record (JSON lines), suitable
+    for being consumed by other programs.
+
+    The objects contain the fields **timestamp** (seconds since the epoch),
+    **level**, **activity**, **subject**, **context**, **target**, **nesting** and
+    **duration** (seconds, only available for some activities) of the record.
+    Records that are not produced by :obj:`ReportLogger.report` have a ``null``
+    **activity** and contain the log **message** instead.
+    Paths are not simplified (unlike :obj:`ReportFormatter`).
+
+    .. versionadded:: 4.7
+    """
+
+    FIELDS = ("activity", "subject", "context", "target", "nesting", "duration")
+
+    def format(self, record):
+        event = {"timestamp": record.created, "level": record.levelname.lower()}
+        for field in self.FIELDS:
+            event[field] = _jsonable(getattr(record, field, None))
+        if event["activity"] is None:
+            event["message"] = record.getMessage()
+        if record.exc_info:
+            event["exception"] = self.formatException(record.exc_info)
+        return json.dumps(event)
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    return str(value)
+
+
+LOG_FORMATS = {"text": ReportFormatter, "json": JsonReportFormatter}
+"""Formatters that can be selected via :obj:`ReportLogger.reconfigure`"""
+
+
 class ReportLogger(LoggerAdapter):
     """Suitable wrapper for PyScaffold CLI interactive execution reports.
 
@@ -196,6 +267,7 @@ class ReportLogger(LoggerAdapter):
         self.extra = extra or {}
         self.handler = handler or StreamHandler()
         self.formatter = formatter or ReportFormatter()
+        self._buffer = _ThreadBuffer()
         super().__init__(self._wrapped, self.extra)
 
     @property
@@ -261,7 +333,14 @@ class ReportLogger(LoggerAdapter):
         return msg, kwargs
 
     def report(
-        self, activity, subject, context=None, target=None, nesting=None, level=INFO
+        self,
+        activity,
+        subject,
+        context=None,
+        target=None,
+        nesting=None,
+        level=INFO,
+        duration=None,
     ):
         """Log that an activity has occurred during scaffold.
 
@@ -276,10 +355,12 @@ class ReportLogger(LoggerAdapter):
                 from the activity name.
             level (int): log level. Defaults to :obj:`logging.INFO`.
                 See :mod:`logging` for more information.
+            duration (float): optional time (in seconds) the activity took.
 
         Notes:
             This method creates a custom log record, with additional fields:
-            **activity**, **subject**, **context**, **target** and **nesting**,
+            **activity**, **subject**, **context**, **target**, **nesting** and
+            **duration**,
             but an empty **msg** field. The :class:`ReportFormatter`
             creates the log message from the other fields.
 
@@ -299,6 +380,7 @@ class ReportLogger(LoggerAdapter):
                 "context": context,
                 "target": target,
                 "nesting": nesting or self.nesting,
+                "duration": duration,
             },
         )
 
@@ -334,6 +416,37 @@ class ReportLogger(LoggerAdapter):
         finally:
             self.nesting = prev
 
+    @contextmanager
+    def buffered(self) -> Iterator[List[logging.LogRecord]]:
+        """Temporarily hold the log records produced by the current thread, instead of
+        emitting them. The records are collected into the list given by the context
+        manager and can be emitted later on with :obj:`replay`.
+
+        This allows running tasks concurrently while still producing logs in a
+        deterministic order.
+
+        Example:
+
+            .. code-block:: python
+
+                from pyscaffold.log import logger
+
+                with logger.buffered() as records:
+                    logger.report("create", "some/file/path")  # nothing is logged
+
+                logger.replay(records)  # the log message is emitted here
+        """
+        if self._buffer not in self.wrapped.filters:
+            self.wrapped.addFilter(self._buffer)
+
+        with self._buffer.hold() as records:
+            yield records
+
+    def replay(self, records: Iterable[logging.LogRecord]):
+        """Emit log records previously held with :obj:`buffered`."""
+        for record in records:
+            self.wrapped.handle(record)
+
     def copy(self):
         """Produce a copy of the wrapped logger.
 
@@ -357,8 +470,13 @@ class ReportLogger(LoggerAdapter):
             log_level: One of the log levels specified in the :obj:`logging` module.
             use_colors: automatically set a colored formatter to the logger
                 if ANSI codes support is detected. (Defaults to `True`).
+            log_format: one of the keys in :obj:`LOG_FORMATS`. ``json`` selects the
+                :obj:`JsonReportFormatter` (and disables colors).
 
         Additional keyword arguments will be ignored.
+
+        .. versionchanged:: 4.7
+           Added the ``log_format`` keyword argument.
         """
         opts = (opts or {}).copy()
         opts.update(kwargs)
@@ -366,6 +484,15 @@ class ReportLogger(LoggerAdapter):
         if "log_level" in opts:
             self.level = opts["log_level"]
 
+        log_format = opts.get("log_format") or "text"
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Invalid log format: {log_format!r}")
+        if log_format != "text":
+            self.formatter = LOG_FORMATS[log_format]()
+            return self
+        if isinstance(self.formatter, JsonReportFormatter):
+            self.formatter = ReportFormatter()
+
         # if terminal supports, use colors
         stream = getattr(self.handler, "stream", None)
         if opts.get("use_colors", True) and termui.supports_color(stream):
@@ -31,6 +31,10 @@ observed when creating new modifiers:
 - When writing a modifier that happens to be a function (instead of a callable class),
   please name the inner function with the same name of the modifier but preceded by an
   ``_`` (underscore) char. This allows better inspection/debugging.
+- When the file op produced by a modifier might skip the file based on cheap checks
+  that do not depend on the file contents (e.g. checking if the file exists), these
+  checks should be declared as a :obj:`Precondition` (see :obj:`with_precondition`),
+  so the contents are not rendered in vain.
 
 
 .. versionchanged:: 4.0
@@ -62,9 +66,17 @@ files should be overwritten when the **force** option is ``True``. Similarly whe
 be logged as if realized.
 """
 
-FileContents = Union[str, None]
+FileContents = Union[str, fs.Streamable, None]
 """When the file content is ``None``, the file should not be written to
 disk (empty files are represented by an empty string ``""`` as content).
+
+.. versionchanged:: 4.7
+   Large files can also be represented by :obj:`~pyscaffold.file_system.Streamable`
+   contents (:obj:`bytes`, iterables of :obj:`str`/:obj:`bytes` chunks or file-like
+   objects) that are written to the disk as they are produced.
+   Please notice that, differently from strings, iterators and file-like objects can
+   only be consumed once (so it is a good idea to create them inside of a
+   :obj:`callable` given as contents).
 """
 
 FileOp = Callable[[Path, FileContents, ScaffoldOpts], Union[Path, None]]
@@ -90,16 +102,71 @@ Note:
 """
 
 
+Precondition = Callable[[Path, ScaffoldOpts], bool]
+"""Signature of a cheap check (e.g. that does not touch file contents) a :obj:`FileOp`
+can declare to inform in advance whether it would skip a file::
+
+    Callable[[Path, ScaffoldOpts], bool]
+
+When the precondition returns ``False``, the file op is not called: the file is
+reported as skipped without rendering its contents.
+See :obj:`with_precondition` and :obj:`check_precondition`.
+"""
+
+PRECONDITION_ATTR = "precondition"
+"""Name of the attribute of a :obj:`FileOp` object that stores its :obj:`Precondition`
+"""
+
+
+def with_precondition(check: Precondition, file_op: FileOp) -> FileOp:
+    """Declare ``check`` as the :obj:`Precondition` of ``file_op``.
+
+    The precondition should only return ``False`` if ``file_op`` would skip the file
+    (i.e. do nothing other than reporting ``skip``) for all possible contents.
+
+    Returns:
+        The same ``file_op`` object
+
+    .. versionadded:: 4.7
+    """
+    setattr(file_op, PRECONDITION_ATTR, check)
+    return file_op
+
+
+def check_precondition(file_op: FileOp, path: Path, opts: ScaffoldOpts) -> bool:
+    """Evaluate the :obj:`Precondition` of ``file_op`` (``True`` when the file op
+    does not declare any precondition).
+
+    .. versionadded:: 4.7
+    """
+    check = getattr(file_op, PRECONDITION_ATTR, None)
+    return check is None or bool(check(path, opts))
+
+
 # FileOps and FileOp modifiers (a.k.a. factories/decorators/wrappers)
 
 
 def create(path: Path, contents: FileContents, opts: ScaffoldOpts) -> Union[Path, None]:
     """
     Default :obj:`FileOp`: always create/write the file even during (forced) updates.
+
+    .. versionchanged:: 4.7
+       When **skip_unchanged** is ``True`` in ``opts`` (the default for updates), files
+       that already exist in the disk with the exact same contents are not re-written
+       (an ``unchanged`` activity is logged instead).
+       :obj:`~pyscaffold.file_system.Streamable` contents are always written.
     """
     if contents is None:
         return None
 
+    if (
+        opts.get("skip_unchanged", opts.get("update"))
+        and isinstance(contents, str)
+        and fs.is_unchanged(path, contents)
+    ):
+        logger.report("unchanged", path)
+        return None
+
     if not path.parent.is_dir():
         fs.create_directory(path.parent, pretend=opts.get("pretend"))
 
@@ -122,6 +189,10 @@ def no_overwrite(file_op: FileOp = create) -> FileOp:
         file_op: a :obj:`FileOp` that will be "decorated",
             i.e. will be called if the ``no_overwrite`` conditions are met.
             Default: :obj:`create`.
+
+    .. versionchanged:: 4.7
+       The conditions for skipping the file are declared as a :obj:`Precondition`,
+       so the file contents are not rendered when the file is skipped.
     """
 
     def _no_overwrite(path: Path, contents: FileContents, opts: ScaffoldOpts):
@@ -132,7 +203,12 @@ def no_overwrite(file_op: FileOp = create) -> FileOp:
         logger.report("skip", path)
         return None
 
-    return _no_overwrite
+    def _check(path: Path, opts: ScaffoldOpts) -> bool:
+        return bool(opts.get("force") or not path.exists()) and check_precondition(
+            file_op, path, opts
+        )
+
+    return with_precondition(_check, _no_overwrite)
 
 
 def skip_on_update(file_op: FileOp = create) -> FileOp:
@@ -143,6 +219,10 @@ def skip_on_update(file_op: FileOp = create) -> FileOp:
         file_op: a :obj:`FileOp` that will be "decorated",
             i.e. will be called if the ``skip_on_update`` conditions are met.
             Default: :obj:`create`.
+
+    .. versionchanged:: 4.7
+       The conditions for skipping the file are declared as a :obj:`Precondition`,
+       so the file contents are not rendered when the file is skipped.
     """
 
     def _skip_on_update(path: Path, contents: FileContents, opts: ScaffoldOpts):
@@ -153,7 +233,12 @@ def skip_on_update(file_op: FileOp = create) -> FileOp:
         logger.report("skip", path)
         return None
 
-    return _skip_on_update
+    def _check(path: Path, opts: ScaffoldOpts) -> bool:
+        return bool(opts.get("force") or not opts.get("update")) and check_precondition(
+            file_op, path, opts
+        )
+
+    return with_precondition(_check, _skip_on_update)
 
 
 def add_permissions(permissions: int, file_op: FileOp = create) -> FileOp:
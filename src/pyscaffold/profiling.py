@@ -0,0 +1,255 @@
+"""
+Instrumentation for the action pipeline, useful to find out which actions (PyScaffold's
+own or the ones registered by extensions) are slow.
+
+While a :obj:`Profile` is active (e.g. when the ``profile`` option is given to
+:obj:`pyscaffold.api.create_project` or ``putup --profile`` is used), each action
+invoked via :obj:`pyscaffold.actions.invoke` is timed and the subprocesses spawned and
+files written are attributed to the action running at the time.
+When no profile is active, the functions in this module do nothing.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+PathLike = Union[str, os.PathLike]
+
+CHROME_TRACE_SUFFIX = ".json"
+"""Files with this extension given to :obj:`profile` are saved as Chrome traces
+(see :obj:`Profile.chrome_trace`), any other file is saved as :mod:`pstats` data.
+"""
+
+
+class ActionStats:
+    """Measurements of a single action invocation.
+
+    Attributes:
+        action (str): action identifier (see :obj:`pyscaffold.identification.get_id`)
+        depth (int): nesting level (greater than zero when an action invokes others)
+        start (float): seconds since the beginning of the profile
+        wall_time (float): elapsed real time in seconds
+        cpu_time (float): CPU time (of the entire process) in seconds
+        subprocesses (int): number of shell commands executed
+        files (int): number of files written
+        bytes (int): number of bytes written
+    """
+
+    FIELDS = (
+        "action",
+        "depth",
+        "start",
+        "wall_time",
+        "cpu_time",
+        "subprocesses",
+        "files",
+        "bytes",
+    )
+
+    def __init__(self, action: str, depth: int = 0, start: float = 0.0):
+        self.action = action
+        self.depth = depth
+        self.start = start
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.subprocesses = 0
+        self.files = 0
+        self.bytes = 0
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        values = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{self.__class__.__name__}({values})"
+
+
+class Profile:
+    """Structured report with the :obj:`ActionStats` of all the actions invoked while
+    the profile is active (in the order they were invoked).
+
+    Instances work as context managers (that activate the profile), but please prefer
+    using :obj:`profile`.
+    """
+
+    def __init__(self):
+        self.records: List[ActionStats] = []
+        self._stack: List[ActionStats] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._previous: Optional["Profile"] = None
+
+    def __enter__(self) -> "Profile":
+        global _active
+        self._previous, _active = _active, self
+        return self
+
+    def __exit__(self, *_exc_info):
+        global _active
+        _active, self._previous = self._previous, None
+
+    @contextmanager
+    def measure(self, action: str) -> Iterator[ActionStats]:
+        """Time the code executed inside of the context, attributing to ``action`` the
+        events recorded meanwhile.
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+        stats = ActionStats(action, len(self._stack), wall - self._origin)
+        self.records.append(stats)
+        self._stack.append(stats)
+        try:
+            yield stats
+        finally:
+            stats.wall_time = time.perf_counter() - wall
+            stats.cpu_time = time.process_time() - cpu
+            self._stack.pop()
+
+    def record(self, subprocesses: int = 0, files: int = 0, nbytes: int = 0):
+        """Attribute events to the innermost action being measured (thread-safe)"""
+        if not self._stack:
+            return
+
+        with self._lock:
+            stats = self._stack[-1]
+            stats.subprocesses += subprocesses
+            stats.files += files
+            stats.bytes += nbytes
+
+    @property
+    def total(self) -> ActionStats:
+        """Aggregated values for all the (top level) actions"""
+        total = ActionStats("total")
+        for stats in self.records:
+            if stats.depth == 0:
+                total.wall_time += stats.wall_time
+                total.cpu_time += stats.cpu_time
+            total.subprocesses += stats.subprocesses
+            total.files += stats.files
+            total.bytes += stats.bytes
+        return total
+
+    def to_dict(self) -> dict:
+        return {
+            "actions": [stats.to_dict() for stats in self.records],
+            "total": self.total.to_dict(),
+        }
+
+    def format(self) -> str:
+        """Human-readable table with the recorded values"""
+        rows = [("action", "wall (s)", "cpu (s)", "procs", "files", "bytes")]
+        for stats in [*self.records, self.total]:
+            rows.append(
+                (
+                    "  " * stats.depth + stats.action,
+                    f"{stats.wall_time:.4f}",
+                    f"{stats.cpu_time:.4f}",
+                    str(stats.subprocesses),
+                    str(stats.files),
+                    str(stats.bytes),
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(
+                [row[0].ljust(widths[0])]
+                + [v.rjust(w) for v, w in zip(row[1:], widths[1:])]
+            )
+            for row in rows
+        ]
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Representation of the profile in the *Trace Event Format* (used by
+        ``chrome://tracing`` and https://ui.perfetto.dev)
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": stats.action,
+                "cat": "action",
+                "ph": "X",
+                "ts": stats.start * 1e6,
+                "dur": stats.wall_time * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": {
+                    "cpu_time": stats.cpu_time,
+                    "subprocesses": stats.subprocesses,
+                    "files": stats.files,
+                    "bytes": stats.bytes,
+                },
+            }
+            for stats in self.records
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+_active: Optional[Profile] = None
+
+
+def current() -> Optional[Profile]:
+    """Profile currently active (if any)"""
+    return _active
+
+
+@contextmanager
+def profile(output: Optional[PathLike] = None) -> Iterator[Profile]:
+    """Activate a new :obj:`Profile` while the context is executed.
+
+    Args:
+        output: optional file where the profile is saved when the context ends.
+            If the file name ends with :obj:`CHROME_TRACE_SUFFIX` a Chrome trace is
+            saved, otherwise the code is also profiled with :mod:`cProfile` and the
+            resulting :mod:`pstats` data is saved (which can be inspected with
+            ``python -m pstats <FILE>``).
+    """
+    profiler = None
+    if output:
+        output = Path(output).resolve()  # actions might change the working dir
+        if output.suffix != CHROME_TRACE_SUFFIX:
+            import cProfile  # lazy: only needed for this specific case
+
+            profiler = cProfile.Profile()
+
+    with Profile() as prof:
+        if profiler:
+            profiler.enable()
+        try:
+            yield prof
+        finally:
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(str(output))
+            elif output:
+                import json  # lazy: only needed for this specific case
+
+                Path(output).write_text(json.dumps(prof.chrome_trace()), "utf-8")
+
+
+@contextmanager
+def measure(action: str) -> Iterator[Optional[ActionStats]]:
+    """Shortcut for :obj:`Profile.measure` in the active profile
+    (does nothing when there is no active profile).
+    """
+    prof = _active
+    if prof is None:
+        yield None
+        return
+
+    with prof.measure(action) as stats:
+        yield stats
+
+
+def record_subprocess():
+    """Record that a subprocess was spawned (when there is an active profile)"""
+    if _active is not None:
+        _active.record(subprocesses=1)
+
+
+def record_file(path: PathLike):
+    """Record that a file was written (when there is an active profile)"""
+    if _active is not None:
+        _active.record(files=1, nbytes=os.stat(path).st_size)
@@ -2,12 +2,15 @@
 Functionality for working with a git repository
 """
 
-from pathlib import Path
-from typing import Optional, TypeVar, Union
+import os
+import stat
+from datetime import datetime, timedelta
+from pathlib import Path, PurePath
+from typing import Iterator, Optional, TypeVar, Union, cast
 
-from . import shell
+from . import info, shell
 from .exceptions import ShellCommandException
-from .file_system import PathLike, chdir
+from .file_system import PathLike, chdir, is_streamable
 from .log import logger
 
 T = TypeVar("T")
@@ -16,6 +19,8 @@ T = TypeVar("T")
 def git_tree_add(struct: dict, prefix: PathLike = "", **kwargs):
     """Adds recursively a directory structure to git
 
+    All the files are staged at once, with a single invocation of ``git update-index``.
+
     Args:
         struct: directory structure as dictionary of dictionaries
         prefix: prefix for the given directory structure
@@ -23,14 +28,88 @@ def git_tree_add(struct: dict, prefix: PathLike = "", **kwargs):
     Additional keyword arguments are passed to the
     :obj:`git <pyscaffold.shell.ShellCommand>` callable object.
     """
-    prefix = Path(prefix)
-    for name, content in struct.items():
-        if isinstance(content, dict):
-            git_tree_add(struct[name], prefix=prefix / name, **kwargs)
-        elif content is None or isinstance(content, str):
-            shell.git("add", str(prefix / name), **kwargs)
-        else:
-            raise TypeError(f"Don't know what to do with content type {type}.")
+    paths = "".join(f"{p.as_posix()}\0" for p in _tree_files(struct, PurePath(prefix)))
+    if paths:
+        shell.git("update-index", "--add", "-z", "--stdin", input=paths, **kwargs)
+
+
+def git_fast_import(
+    struct: dict, message: str = "Initial commit", prefix: PathLike = "", **kwargs
+):
+    """Commits a directory structure to git as the first commit of the current branch
+    (in a recently initialised repository), using a single invocation of
+    ``git fast-import``. The index is updated afterwards to match the commit.
+
+    Args:
+        struct: directory structure as dictionary of dictionaries
+        message: commit message
+        prefix: prefix for the given directory structure
+
+    Additional keyword arguments are passed to the
+    :obj:`git <pyscaffold.shell.ShellCommand>` callable object.
+
+    Note:
+        The files are committed exactly as they are in the disk, i.e. git filters
+        (such as the ones used for ``core.autocrlf``) are not applied.
+        The author/committer identities are obtained in the same way PyScaffold fills
+        the ``author`` and ``email`` options (see :obj:`pyscaffold.info.username`),
+        but respecting the ``GIT_COMMITTER_*`` environment variables.
+    """
+    files = list(_tree_files(struct, PurePath(prefix)))
+    if kwargs.get("pretend"):
+        shell.git("fast-import", "--quiet", **kwargs)
+        shell.git("reset", "--quiet", **kwargs)
+        return
+
+    author = f"{info.username()} <{info.email()}>"
+    name = os.getenv(info.GitEnv.committer_name.value)
+    email = os.getenv(info.GitEnv.committer_email.value)
+    committer = f"{name} <{email}>" if name and email else author
+    when = _raw_date()
+    msg = message.encode("utf-8")
+
+    stream = [
+        f"commit {_current_branch()}\n".encode("utf-8"),
+        f"author {author} {when}\n".encode("utf-8"),
+        f"committer {committer} {when}\n".encode("utf-8"),
+        b"data %d\n%s\n" % (len(msg), msg),
+    ]
+    for file in files:
+        mode = "100755" if os.stat(file).st_mode & stat.S_IXUSR else "100644"
+        content = Path(file).read_bytes()
+        stream.append(b"M %s inline %s\n" % (mode.encode(), _quote(file.as_posix())))
+        stream.append(b"data %d\n%s\n" % (len(content), content))
+    stream.append(b"done\n")
+
+    opts = {**kwargs, "input": b"".join(stream), "universal_newlines": False}
+    shell.git("fast-import", "--quiet", "--done", "--date-format=raw", **opts)
+    shell.git("reset", "--quiet", **kwargs)
+
+
+def _raw_date() -> str:
+    """Current time in the ``raw`` date format of ``git fast-import``"""
+    now = datetime.now().astimezone()
+    offset = int(cast(timedelta, now.utcoffset()).total_seconds()) // 60
+    sign = "-" if offset < 0 else "+"
+    hours, minutes = divmod(abs(offset), 60)
+    return f"{int(now.timestamp())} {sign}{hours:02d}{minutes:02d}"
+
+
+_C_ESCAPES = {
+    ord("\\"): b"\\\\",
+    ord('"'): b'\\"',
+    ord("\n"): b"\\n",
+    ord("\t"): b"\\t",
+}
+
+
+def _quote(path: str) -> bytes:
+    """C-style quoting, as accepted by ``git fast-import`` for paths"""
+    quoted = (
+        _C_ESCAPES.get(c) or (b"\\%03o" % c if c < 0x20 or c == 0x7F else bytes([c]))
+        for c in path.encode("utf-8")
+    )
+    return b'"%s"' % b"".join(quoted)
 
 
 def add_tag(project: PathLike, tag_name: str, message: Optional[str] = None, **kwargs):
@@ -51,21 +130,32 @@ def add_tag(project: PathLike, tag_name: str, message: Optional[str] = None, **k
             shell.git("tag", "-a", tag_name, "-m", message, **kwargs)
 
 
-def init_commit_repo(project: PathLike, struct: dict, **kwargs):
+def init_commit_repo(
+    project: PathLike, struct: dict, fast_import: bool = False, **kwargs
+):
     """Initialize a git repository
 
     Args:
         project: path to the project
         struct: directory structure as dictionary of dictionaries
+        fast_import: when ``True`` the initial commit is created via
+            :obj:`git_fast_import` instead of ``git commit``.
 
     Additional keyword arguments are passed to the
     :obj:`git <pyscaffold.shell.ShellCommand>` callable object.
+
+    Note:
+        The number of git commands invoked by this function does not depend on the
+        number of files in the project.
     """
     logger.report("initialize", f"git repo in {project}...")
     with chdir(project, pretend=kwargs.get("pretend")):
         shell.git("init", **kwargs)
-        git_tree_add(struct, **kwargs)
-        shell.git("commit", "-m", "Initial commit", **kwargs)
+        if fast_import:
+            git_fast_import(struct, **kwargs)
+        else:
+            git_tree_add(struct, **kwargs)
+            shell.git("commit", "-m", "Initial commit", **kwargs)
 
 
 def is_git_repo(path: PathLike):
@@ -96,3 +186,24 @@ def get_git_root(default: Optional[T] = None) -> Union[None, T, str]:
         return next(shell.git("rev-parse", "--show-toplevel"))
     except ShellCommandException:
         return default
+
+
+def _tree_files(struct: dict, prefix: PurePath) -> Iterator[PurePath]:
+    for name, content in struct.items():
+        if isinstance(content, dict):
+            yield from _tree_files(content, prefix / name)
+        elif content is None or isinstance(content, str) or is_streamable(content):
+            yield prefix / name
+        else:
+            raise TypeError(f"Don't know what to do with content type {type(content)}.")
+
+
+def _current_branch() -> str:
+    """Name of the reference ``HEAD`` points to (even if it does not exist yet)"""
+    head = Path(".git", "HEAD")
+    if head.is_file():
+        ref = head.read_text(encoding="utf-8").strip()
+        if ref.startswith("ref:"):
+            return ref[len("ref:") :].strip()
+
+    return next(shell.git("symbolic-ref", "HEAD")).strip()
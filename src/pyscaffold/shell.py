@@ -12,6 +12,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
+from . import profiling
 from .exceptions import ShellCommandException
 from .log import logger
 
@@ -97,6 +98,7 @@ class ShellCommand:
             },
             **kwargs,  # allow overwriting defaults
         }
+        profiling.record_subprocess()
         if self._shell:
             return subprocess.run(command, **opts)
             # ^ `check_output` does not seem to support terminal editors
@@ -105,6 +107,19 @@ class ShellCommand:
 
     def __call__(self, *args, **kwargs) -> Iterator[str]:
         """Execute the command, returning an iterator for the resulting text output"""
+        completed = self._checked_run(*args, **kwargs)
+        return (line for line in (completed.stdout or "").splitlines())
+
+    def output(self, *args, **kwargs) -> str:
+        """Execute the command, returning the exact text output (i.e. without
+        translating newlines), e.g. for commands producing NUL-separated values.
+
+        .. versionadded:: 4.7
+        """
+        completed = self._checked_run(*args, **{**kwargs, "universal_newlines": False})
+        return _text(completed.stdout)
+
+    def _checked_run(self, *args, **kwargs) -> subprocess.CompletedProcess:
         try:
             completed = self.run(*args, **kwargs)
         except FileNotFoundError as e:
@@ -114,14 +129,20 @@ class ShellCommand:
         try:
             completed.check_returncode()
         except subprocess.CalledProcessError as e:
-            stdout, stderr = (e or "" for e in (completed.stdout, completed.stderr))
+            stdout, stderr = (_text(e) for e in (completed.stdout, completed.stderr))
             stdout, stderr = (e.strip() for e in (stdout, stderr))
             sep = "; " if stdout and stderr else ""
             msg = sep.join([stdout, stderr])
             logger.report("info", f'last command failed with "{msg}"')
             raise ShellCommandException(msg) from e
 
-        return (line for line in (completed.stdout or "").splitlines())
+        return completed
+
+
+def _text(output: Union[str, bytes, None]) -> str:
+    if isinstance(output, bytes):
+        return output.decode("utf-8", errors="replace")
+    return output or ""
 
 
 def shell_command_error2exit_decorator(func: Callable):
@@ -260,5 +281,13 @@ def git(*args, **kwargs) -> Iterator[str]:
     return get_git_cmd()(*args, **kwargs)  # delayed, so errors show up with --verbose
 
 
+def git_output(*args, **kwargs) -> str:
+    """Exact text output of a git command (see :obj:`ShellCommand.output`)
+
+    .. versionadded:: 4.7
+    """
+    return get_git_cmd().output(*args, **kwargs)
+
+
 #: Command for python
 python = ShellCommand(sys.executable)
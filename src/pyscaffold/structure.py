@@ -4,19 +4,47 @@
    ``Callable[[dict], str]`` and :obj:`string.Template` objects can also be used as file
    contents. They will be called with PyScaffold's ``opts`` (:obj:`string.Template` via
    :obj:`~string.Template.safe_substitute`)
+
+.. versionchanged:: 4.7
+   The functions in the *Structure Manipulation* group (:obj:`modify`, :obj:`ensure`,
+   :obj:`reject` and :obj:`merge`) no longer deep copy the entire project tree.
+   Instead, only the directories in the path of the change are copied and all the
+   other nodes are shared between the original and the resulting structures.
+   Therefore structures (and nested dicts) should be treated as immutable (please
+   use the manipulation functions instead of changing them in place).
 """
 
-from copy import deepcopy
-from pathlib import Path
+import logging
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import copy_context
+from pathlib import Path, PurePosixPath
 from string import Template
-from typing import Callable, Dict, Optional, Tuple, Union, cast
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 from . import templates
-from .file_system import PathLike, create_directory
+from .file_system import PathLike, create_directory, journal, staging_dir
+from .log import logger
 from .operations import (
     FileContents,
     FileOp,
     ScaffoldOpts,
+    check_precondition,
     create,
     no_overwrite,
     skip_on_update,
@@ -188,15 +216,42 @@ def create_structure(
 
     .. versionchanged:: 4.0
        Also accepts :obj:`string.Template` and :obj:`callable` objects as file contents.
+
+    .. versionchanged:: 4.7
+       When ``opts["io_workers"]`` is greater than 1, the directory skeleton is created
+       first and then the files are reified and written concurrently using a pool of
+       threads (the logs are still emitted in the same order as the tree).
+       Please notice that in this case the file contents and file operations should
+       be thread-safe.
+       The :obj:`~pyscaffold.operations.Precondition` of each file operation is also
+       checked before rendering the file contents.
+       When ``opts["atomic"]`` is ``True``, a new project is created in a temporary
+       sibling directory that is renamed into place after all the files are written,
+       while the files of an existing project are individually replaced and the
+       changes are rolled back in the case of errors (see
+       :obj:`~pyscaffold.file_system.journal`).
+       When ``opts["diff"]`` is given, nothing is written. Instead the structure is
+       compared with the files in the disk and the resulting
+       :obj:`~pyscaffold.diff.ChangeSet` is returned in the options (as
+       ``diff_report``), together with a structure containing the files that would
+       change.
     """
     update = opts.get("update") or opts.get("force")
     pretend = opts.get("pretend")
 
     if prefix is None:
         prefix = cast(Path, opts.get("project_path", "."))
+        if opts.get("diff"):
+            return _diff_structure(struct, opts, Path(prefix))
+        if opts.get("atomic") and not pretend:
+            return _create_structure_atomically(struct, opts, Path(prefix)), opts
         create_directory(prefix, update, pretend)
     prefix = Path(prefix)
 
+    workers = opts.get("io_workers") or 1
+    if workers > 1 and not pretend:
+        return _create_structure_concurrently(struct, opts, prefix, workers), opts
+
     changed: Structure = {}
 
     for name, node in struct.items():
@@ -205,8 +260,8 @@ def create_structure(
             create_directory(path, update, pretend)
             changed[name], _ = create_structure(node, opts, prefix=path)
         else:
-            content, file_op = reify_leaf(node, opts)
-            if file_op(path, content, opts):
+            written, content = _create_leaf(path, node, opts)
+            if written:
                 changed[name] = content
 
     return changed, opts
@@ -215,6 +270,123 @@ def create_structure(
 # -------- Auxiliary Functions --------
 
 
+def _create_leaf(
+    path: Path, node: Leaf, opts: ScaffoldOpts
+) -> Tuple[bool, FileContents]:
+    content, file_op = resolve_leaf(node)
+    if not check_precondition(file_op, path, opts):
+        logger.report("skip", path)  # skip without rendering the contents
+        return False, None
+
+    text = reify_content(content, opts)
+    return bool(file_op(path, text, opts)), text
+
+
+def _diff_structure(struct: Structure, opts: ScaffoldOpts, prefix: Path):
+    from .diff import ADDED, MODIFIED, compare  # late import due to cycles
+
+    report = compare(struct, opts, prefix)
+    paths = {change.path for change in report.filter(ADDED, MODIFIED)}
+    changed = Transaction({})
+    for path, leaf in iter_leaves(struct):
+        if path in paths:
+            changed.modify(path, lambda *_, leaf=leaf: resolve_leaf(leaf))
+    return changed.struct, {**opts, "diff_report": report}
+
+
+def _create_structure_atomically(
+    struct: Structure, opts: ScaffoldOpts, prefix: Path
+) -> Structure:
+    """Similar to :obj:`create_structure`, but either all the changes make it to the
+    disk or none of them do.
+    """
+    if prefix.exists():
+        with journal():
+            create_directory(prefix, update=True)
+            return create_structure(struct, opts, prefix)[0]
+
+    staging = prefix
+    records: List[logging.LogRecord] = []
+    try:
+        with staging_dir(prefix) as staging, logger.buffered() as records:
+            logger.report("create", prefix)
+            changed, _ = create_structure(struct, opts, staging)
+    finally:
+        # Report the final paths instead of the temporary ones
+        logger.replay(_relocate(record, staging, prefix) for record in records)
+
+    return changed
+
+
+def _relocate(record: logging.LogRecord, src: Path, dst: Path) -> logging.LogRecord:
+    for attr in ("subject", "context", "target"):
+        value: Any = getattr(record, attr, None)
+        try:
+            setattr(record, attr, dst / Path(value).relative_to(src))
+        except (TypeError, ValueError):
+            pass  # not a path inside of src
+    return record
+
+
+def _create_structure_concurrently(
+    struct: Structure, opts: ScaffoldOpts, prefix: Path, workers: int
+) -> Structure:
+    """Similar to :obj:`create_structure`, but the leaves are handled by a thread pool.
+
+    The log records produced by each task are held and only emitted after all the
+    tasks finish, in the same order they would appear in the sequential version.
+    """
+    update = opts.get("update") or opts.get("force")
+    records: List[list] = []  # log records of each step, in tree order
+    tasks: List[Tuple[list, Path, Leaf]] = []
+
+    def _skeleton(struct: Structure, prefix: Path):
+        for name, node in struct.items():
+            path = prefix / name
+            if isinstance(node, dict):
+                with logger.buffered() as logs:
+                    create_directory(path, update)
+                records.append(logs)
+                _skeleton(node, path)
+            else:
+                logs = []
+                records.append(logs)
+                tasks.append((logs, path, node))
+
+    def _run(task: Tuple[list, Path, Leaf]) -> Tuple[bool, FileContents]:
+        logs, path, node = task
+        with logger.buffered() as buffer:
+            try:
+                return _create_leaf(path, node, opts)
+            finally:
+                logs.extend(buffer)
+
+    def _changed(struct: Structure, prefix: Path) -> Structure:
+        changed: Structure = {}
+        for name, node in struct.items():
+            path = prefix / name
+            if isinstance(node, dict):
+                changed[name] = _changed(node, path)
+            elif path in written:
+                changed[name] = written[path]
+        return changed
+
+    try:
+        _skeleton(struct, prefix)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # copy the context, so the tasks share the active journal (if any)
+            futures = [executor.submit(copy_context().run, _run, t) for t in tasks]
+            results = [future.result() for future in futures]
+    finally:
+        for logs in records:
+            logger.replay(logs)
+
+    written = {
+        path: content for (_, path, _), (ok, content) in zip(tasks, results) if ok
+    }
+    return _changed(struct, prefix)
+
+
 def resolve_leaf(contents: Leaf) -> ResolvedLeaf:
     """Normalize project structure leaf to be a ``Tuple[AbstractContent, FileOp]``"""
     if isinstance(contents, tuple):
@@ -225,6 +397,9 @@ def resolve_leaf(contents: Leaf) -> ResolvedLeaf:
 def reify_content(content: AbstractContent, opts: ScaffoldOpts) -> FileContents:
     """Make sure content is string (calling :meth:`~object.__call__` or
     :meth:`~string.Template.safe_substitute` with opts if necessary)
+
+    .. versionchanged:: 4.7
+       :obj:`LazyContent` objects are rendered only once for the same options.
     """
     if callable(content):
         return content(opts)
@@ -233,6 +408,70 @@ def reify_content(content: AbstractContent, opts: ScaffoldOpts) -> FileContents:
     return content
 
 
+class LazyContent:
+    """File contents rendered on demand and memoized.
+
+    Objects of this class can be used as file contents in the project structure (they
+    are callables that receive PyScaffold's ``opts``). The wrapped content is only
+    rendered (see :obj:`reify_content`) the first time it is needed, and the result is
+    reused while the options it depends on remain the same.
+    This is useful for extensions that need to transform the contents of a file
+    (e.g. adding some text to ``README.rst``): wrapping the transformation in a
+    :obj:`LazyContent` postpones the rendering until the file is actually written, so
+    files that end up removed from the structure are never rendered.
+
+    Please notice the rendered contents are reused, so :obj:`LazyContent` is not
+    suitable for callables that produce iterators or file-like objects.
+
+    Args:
+        content: template, callable or string to be rendered
+        keys: names of the options the rendering depends on.
+            When not given, the placeholders of :obj:`string.Template` objects are
+            used. Other callables are re-rendered when any of the values in ``opts``
+            change (the values are compared with ``==``, so objects changed in place
+            are not detected).
+
+    .. versionadded:: 4.7
+    """
+
+    def __init__(self, content: AbstractContent, keys: Optional[Iterable[str]] = None):
+        if keys is None and isinstance(content, Template):
+            keys = _template_identifiers(content)
+        self.content = content
+        self.keys = None if keys is None else tuple(keys)
+        self._lock = Lock()
+        self._memo: Optional[Tuple[Any, FileContents]] = None
+        # ^  (option values, rendered contents)
+
+    def __call__(self, opts: ScaffoldOpts) -> FileContents:
+        if self.keys is None:
+            key: Any = dict(opts)  # snapshot: ``opts`` might be changed in place
+        else:
+            key = [opts.get(k, _MISSING) for k in self.keys]
+        with self._lock:  # make sure threads don't render the same content twice
+            if self._memo is not None and self._memo[0] == key:
+                return self._memo[1]
+
+            rendered = reify_content(self.content, opts)
+            self._memo = (key, rendered)
+            return rendered
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.content!r})"
+
+
+_MISSING = object()
+
+
+def _template_identifiers(template: Template) -> List[str]:
+    # TODO: Use `template.get_identifiers()` when `python_requires >= 3.11`
+    names = (
+        m.group("named") or m.group("braced")
+        for m in template.pattern.finditer(template.template)
+    )
+    return list(dict.fromkeys(name for name in names if name))
+
+
 def reify_leaf(contents: Leaf, opts: ScaffoldOpts) -> ReifiedLeaf:
     """Similar to :obj:`resolve_leaf` but applies :obj:`reify_content` to the first
     element of the returned tuple.
@@ -292,24 +531,7 @@ def modify(
         Use an empty string as content to ensure a file is created empty
         (``None`` contents will not be created).
     """
-    # Retrieve a list of parts from a path-like object
-    path_parts = Path(path).parts
-
-    # Walk the entire path, creating parents if necessary.
-    root = deepcopy(struct)
-    last_parent: dict = root
-    name = path_parts[-1]
-    for parent in path_parts[:-1]:
-        last_parent = last_parent.setdefault(parent, {})
-
-    # Get the old value if existent.
-    old_value = resolve_leaf(last_parent.get(name))
-
-    # Update the value.
-    new_value = modifier(*old_value)
-    last_parent[name] = _merge_leaf(old_value, new_value)
-
-    return root
+    return Transaction(struct).modify(path, modifier).struct
 
 
 def ensure(
@@ -346,9 +568,7 @@ def ensure(
     Note:
         Use an empty string as content to ensure a file is created empty.
     """
-    return modify(
-        struct, path, lambda old, _: (old if content is None else content, file_op)
-    )
+    return Transaction(struct).ensure(path, content, file_op).struct
 
 
 def reject(struct: Structure, path: PathLike) -> Structure:
@@ -366,22 +586,7 @@ def reject(struct: Structure, path: PathLike) -> Structure:
     Returns:
         Modified project tree representation
     """
-    # Retrieve a list of parts from a path-like object
-    path_parts = Path(path).parts
-
-    # Walk the entire path, creating parents if necessary.
-    root = deepcopy(struct)
-    last_parent: dict = root
-    name = path_parts[-1]
-    for parent in path_parts[:-1]:
-        if parent not in last_parent:
-            return root  # one ancestor already does not exist, do nothing
-        last_parent = last_parent[parent]
-
-    if name in last_parent:
-        del last_parent[name]
-
-    return root
+    return Transaction(struct).reject(path).struct
 
 
 def merge(old: Structure, new: Structure) -> Structure:
@@ -405,27 +610,297 @@ def merge(old: Structure, new: Structure) -> Structure:
         Use an empty string as content to ensure a file is created empty.
         (``None`` contents will not be created).
     """
-    return _inplace_merge(deepcopy(old), new)
-
-
-def _inplace_merge(old: Structure, new: Structure) -> Structure:
-    """Similar to :obj:`~.merge` but modifies the first dict."""
-
-    for key, value in new.items():
-        old_value = old.get(key, None)
-        new_is_dict = isinstance(value, dict)
-        old_is_dict = isinstance(old_value, dict)
-        if new_is_dict and old_is_dict:
-            old[key] = _inplace_merge(
-                cast(Structure, old_value), cast(Structure, value)
-            )
-        elif old_value is not None and not new_is_dict and not old_is_dict:
-            # both are defined and final leaves
-            old[key] = _merge_leaf(cast(Leaf, old_value), cast(Leaf, value))
+    return Transaction(old).merge(new).struct
+
+
+class Transaction:
+    """Batch of changes to a project structure, performing as few copies as possible.
+
+    The methods :obj:`modify`, :obj:`ensure`, :obj:`reject` and :obj:`merge` mirror
+    the homonymous functions in this module, but each directory in the structure is
+    copied at most once per transaction (subsequent edits change the copy in place).
+    This way, a series of edits is much cheaper than chaining the module functions,
+    which copy the path of the change every time they are called.
+    The original structure is never changed.
+
+    Please prefer using :obj:`transaction`.
+    All the methods return the transaction itself, so calls can be chained.
+    """
+
+    def __init__(self, struct: Structure):
+        self._struct = struct
+        self._copies: Dict[int, Structure] = {}
+        # ^  directories copied by this transaction (so they can be changed in place).
+        #    The values are stored to make sure the ids are not reused.
+
+    @property
+    def struct(self) -> Structure:
+        """Project structure with all the edits applied so far"""
+        return self._struct
+
+    def modify(
+        self,
+        path: PathLike,
+        modifier: Callable[[AbstractContent, FileOp], ResolvedLeaf],
+    ) -> "Transaction":
+        """See :obj:`pyscaffold.structure.modify`"""
+        *parents, name = Path(path).parts
+        directory = self._copy_path(parents)
+        old_value = resolve_leaf(directory.get(name))
+        directory[name] = _merge_leaf(old_value, modifier(*old_value))
+        return self
+
+    def ensure(
+        self, path: PathLike, content: AbstractContent = None, file_op: FileOp = create
+    ) -> "Transaction":
+        """See :obj:`pyscaffold.structure.ensure`"""
+        return self.modify(
+            path, lambda old, _: (old if content is None else content, file_op)
+        )
+
+    def reject(self, path: PathLike) -> "Transaction":
+        """See :obj:`pyscaffold.structure.reject`"""
+        *parents, name = Path(path).parts
+
+        # Check if the file exists before copying anything
+        node: Node = self._struct
+        for part in parents:
+            node = node.get(part) if isinstance(node, dict) else None
+
+        if isinstance(node, dict) and name in node:
+            del self._copy_path(parents)[name]
+
+        return self
+
+    def merge(self, new: Structure) -> "Transaction":
+        """See :obj:`pyscaffold.structure.merge`"""
+        self._struct = self._merge(self._own(self._struct), new)
+        return self
+
+    def _merge(self, old: Structure, new: Structure) -> Structure:
+        """Merge ``new`` into ``old`` (that should be a copy owned by the transaction).
+        Nodes from ``new`` are shared, not copied.
+        """
+        for key, value in new.items():
+            old_value = old.get(key, None)
+            new_is_dict = isinstance(value, dict)
+            old_is_dict = isinstance(old_value, dict)
+            if new_is_dict and old_is_dict:
+                old_dir = self._own(cast(Structure, old_value))
+                old[key] = self._merge(old_dir, cast(Structure, value))
+            elif old_value is not None and not new_is_dict and not old_is_dict:
+                # both are defined and final leaves
+                old[key] = _merge_leaf(cast(Leaf, old_value), cast(Leaf, value))
+            else:
+                old[key] = value
+
+        return old
+
+    def _own(self, directory: Structure) -> Structure:
+        """Copy the directory, unless it was already copied by this transaction"""
+        if id(directory) in self._copies:
+            return directory
+
+        copy = directory.copy()
+        self._copies[id(copy)] = copy
+        return copy
+
+    def _copy_path(self, parts: Sequence[str]) -> Structure:
+        """Make sure the directories in the path given by ``parts`` are owned by the
+        transaction (creating the missing ones) and return the last one.
+        """
+        self._struct = parent = self._own(self._struct)
+        for part in parts:
+            directory = self._own(cast(Structure, parent.get(part, {})))
+            parent[part] = directory
+            parent = directory
+
+        return parent
+
+
+@contextmanager
+def transaction(struct: Structure) -> Iterator[Transaction]:
+    """Edit the project structure in batch, see :obj:`Transaction`.
+
+    Example:
+
+        .. code-block:: python
+
+            from pyscaffold import structure
+
+            with structure.transaction(struct) as tx:
+                tx.ensure("docs/api.rst", "API\n===\n")
+                tx.modify("README.rst", lambda content, op: (content + "...", op))
+                tx.reject("tests/test_skeleton.py")
+                tx.merge({"src": {"pkg": {"extra.py": ""}}})
+
+            struct = tx.struct  # original struct is not changed
+
+    .. versionadded:: 4.7
+    """
+    yield Transaction(struct)
+
+
+def iter_leaves(
+    struct: Structure, prefix: PathLike = ""
+) -> Iterator[Tuple[PurePosixPath, Leaf]]:
+    """Iterate over all the leaves (files) of the project structure (depth-first),
+    yielding tuples with the path of the file (relative to ``prefix``) and the leaf.
+
+    .. versionadded:: 4.7
+    """
+    for name, node in struct.items():
+        path = PurePosixPath(prefix, name)
+        if isinstance(node, dict):
+            yield from iter_leaves(cast(Structure, node), path)
         else:
-            old[key] = deepcopy(value)
+            yield path, node
+
 
-    return old
+class StructureIndex(Mapping[PurePosixPath, Leaf]):
+    """Flat (read-only) mapping from the paths of the leaves (files) in the project
+    structure to the leaves themselves, that also allows efficient edits.
+
+    The index is built once (with a full walk of the tree) and from that point on,
+    it is kept in sync with the nested structure (see :obj:`struct`) by its own
+    edit methods (:obj:`modify`, :obj:`ensure`, :obj:`reject` and :obj:`merge`,
+    which work as in :obj:`Transaction`).
+    Looking up a file takes constant time (no need to walk the nested dicts) and
+    :obj:`under` uses a binary search over the sorted paths.
+
+    Example:
+
+        .. code-block:: python
+
+            from pyscaffold.structure import StructureIndex, resolve_leaf
+
+            index = StructureIndex(struct)
+            index["docs/conf.py"]  # str, Path and PurePosixPath keys are accepted
+            docs = list(index.under("docs"))
+
+            def is_protected(path, leaf):
+                _content, file_op = resolve_leaf(leaf)
+                return getattr(file_op, "__name__", "") == "_no_overwrite"
+
+            protected = [path for path, _ in index.filter(is_protected)]
+
+            index.reject("docs/_static/.gitignore")
+            struct = index.struct
+
+    .. versionadded:: 4.7
+    """
+
+    def __init__(self, struct: Structure):
+        self._tx = Transaction(struct)
+        self._leaves: Dict[PurePosixPath, Leaf] = dict(iter_leaves(struct))
+        self._sorted: Optional[List[str]] = None  # lazily computed
+
+    @property
+    def struct(self) -> Structure:
+        """Nested project structure, with all the edits applied so far"""
+        return self._tx.struct
+
+    def __getitem__(self, path: PathLike) -> Leaf:
+        return self._leaves[_posix(path)]
+
+    def __contains__(self, path) -> bool:
+        return _posix(path) in self._leaves
+
+    def __iter__(self) -> Iterator[PurePosixPath]:
+        return iter(self._leaves)
+
+    def __len__(self) -> int:
+        return len(self._leaves)
+
+    def under(self, prefix: PathLike) -> Iterator[Tuple[PurePosixPath, Leaf]]:
+        """Leaves inside of the directory given by ``prefix`` (sorted by path)"""
+        if self._sorted is None:
+            self._sorted = sorted(p.as_posix() for p in self._leaves)
+
+        key = _posix(prefix)
+        if key.parts:
+            start = key.as_posix() + "/"
+            stop = key.as_posix() + chr(ord("/") + 1)
+            first = bisect_left(self._sorted, start)
+            last = bisect_left(self._sorted, stop, first)
+        else:
+            first, last = 0, len(self._sorted)
+        for path in self._sorted[first:last]:
+            key = PurePosixPath(path)
+            yield key, self._leaves[key]
+
+    def filter(
+        self, predicate: Callable[[PurePosixPath, Leaf], bool]
+    ) -> Iterator[Tuple[PurePosixPath, Leaf]]:
+        """Leaves for which ``predicate(path, leaf)`` is true"""
+        return ((p, leaf) for p, leaf in self._leaves.items() if predicate(p, leaf))
+
+    def modify(
+        self,
+        path: PathLike,
+        modifier: Callable[[AbstractContent, FileOp], ResolvedLeaf],
+    ) -> "StructureIndex":
+        """See :obj:`pyscaffold.structure.modify`"""
+        key = _posix(path)
+        self._tx.modify(key, modifier)
+        self._set(key, self._lookup(key))
+        return self
+
+    def ensure(
+        self, path: PathLike, content: AbstractContent = None, file_op: FileOp = create
+    ) -> "StructureIndex":
+        """See :obj:`pyscaffold.structure.ensure`"""
+        return self.modify(
+            path, lambda old, _: (old if content is None else content, file_op)
+        )
+
+    def reject(self, path: PathLike) -> "StructureIndex":
+        """See :obj:`pyscaffold.structure.reject`"""
+        key = _posix(path)
+        self._tx.reject(key)
+        self._discard(key)
+        return self
+
+    def merge(self, new: Structure) -> "StructureIndex":
+        """See :obj:`pyscaffold.structure.merge`"""
+        self._tx.merge(new)
+        self._sync(new, self.struct, PurePosixPath())
+        return self
+
+    def _lookup(self, key: PurePosixPath) -> Node:
+        node: Node = self.struct
+        for part in key.parts:
+            node = cast(Structure, node)[part]
+        return node
+
+    def _sync(self, new: Structure, merged: Structure, prefix: PurePosixPath):
+        """Update the index after merging ``new``"""
+        for name, value in new.items():
+            key = prefix / name
+            node = merged[name]
+            if isinstance(node, dict):
+                self._discard(key)  # in the case it used to be a file
+                self._sync(cast(Structure, value), cast(Structure, node), key)
+            else:
+                self._set(key, node)
+
+    def _set(self, key: PurePosixPath, leaf: Node):
+        if key not in self._leaves:
+            self._discard(key)  # in the case it used to be a directory
+            self._sorted = None
+        self._leaves[key] = cast(Leaf, leaf)
+
+    def _discard(self, key: PurePosixPath):
+        """Remove the file or all the files inside of the directory given by ``key``"""
+        removed = [key] if key in self._leaves else [p for p, _ in self.under(key)]
+        for path in removed:
+            del self._leaves[path]
+        if removed:
+            self._sorted = None
+
+
+def _posix(path: PathLike) -> PurePosixPath:
+    return PurePosixPath(*Path(path).parts)
 
 
 def _merge_leaf(old_value: Leaf, new_value: Leaf) -> Leaf:
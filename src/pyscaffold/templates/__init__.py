@@ -8,15 +8,31 @@ under the BSD 0-Clause license.
 import os
 import string
 import sys
+from collections import ChainMap, OrderedDict
+from threading import RLock
 from types import ModuleType
 from types import SimpleNamespace as Object
-from typing import Any, Dict, Set, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Match,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
-from configupdater import ConfigUpdater
-
-from .. import __version__ as pyscaffold_version
 from .. import dependencies as deps
 from .. import toml
+from ..log import logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    # ^  `configupdater` is expensive to import, so it is only imported when needed
+    from configupdater import ConfigUpdater
 
 if sys.version_info[:2] >= (3, 9):
     from importlib.resources import files
@@ -25,8 +41,14 @@ if sys.version_info[:2] >= (3, 9):
         """:meta private:"""
         return files(package).joinpath(resource).read_text(encoding="utf-8")
 
-else:
-    from importlib.resources import read_text  # pragma: no cover
+    def _list_resources(package: str) -> List[str]:
+        return [r.name for r in files(package).iterdir() if r.is_file()]
+
+else:  # pragma: no cover
+    from importlib.resources import contents, read_text
+
+    def _list_resources(package: str) -> List[str]:
+        return list(contents(package))
 
 
 ScaffoldOpts = Dict[str, Any]
@@ -61,6 +83,234 @@ licenses = {
 # MIT goes first so it behaves like the default if an empty string is passed
 
 
+TEMPLATE_SUFFIX = ".template"
+
+_Key = Tuple[str, str]
+_Slot = Tuple[int, Optional[str], str]
+# ^  (position in the chunks, placeholder name or None if invalid, error message)
+_NO_MAPPING: Dict[str, Any] = {}
+
+
+class CompiledTemplate(string.Template):
+    """Drop-in replacement for :obj:`string.Template` that parses the template text
+    only once.
+
+    When created, the text is split into a sequence of literal chunks and placeholder
+    slots, so :meth:`substitute` and :meth:`safe_substitute` (with exactly the same
+    semantics of :obj:`string.Template`) just fill the slots and join the chunks,
+    instead of running a regex over the whole text for each rendering.
+    This is useful for templates that are rendered many times (e.g. when generating
+    projects in batches).
+
+    Since these objects are :obj:`string.Template` instances, they can be used as file
+    contents in the project structure (see :obj:`pyscaffold.structure.reify_content`).
+    Subclasses can customise ``delimiter``, ``idpattern``, ``pattern``, etc, in the
+    same way as :obj:`string.Template` subclasses.
+
+    .. versionadded:: 4.7
+    """
+
+    _compiled: Optional[Tuple[str, List[str], List[_Slot]]]
+    # ^  (template text, literal chunks and placeholders, slots)
+
+    def __init__(self, template: str):
+        super().__init__(template)
+        self._compile()
+
+    def _compile(self) -> None:
+        text = self.template
+        chunks: List[str] = []
+        slots: List[_Slot] = []
+        literal: List[str] = []
+        end = 0
+        for match in self.pattern.finditer(text):
+            literal.append(text[end : match.start()])
+            end = match.end()
+            named = match.group("named") or match.group("braced")
+            if match.group("escaped") is not None and named is None:
+                literal.append(self.delimiter)
+                continue
+            if named is None and match.group("invalid") is None:
+                # Unexpected pattern => let the parent class deal with it
+                self._compiled = None
+                return
+            chunks.append("".join(literal))
+            literal = []
+            message = "" if named else self._invalid_message(match)
+            slots.append((len(chunks), named, message))
+            chunks.append(match.group())  # kept by `safe_substitute` if missing
+        literal.append(text[end:])
+        chunks.append("".join(literal))
+        self._compiled = (text, chunks, slots)
+
+    def _invalid_message(self, match: Match[str]) -> str:
+        # Same message as ``string.Template`` (raised when the slot is rendered)
+        i = match.start("invalid")
+        lines = self.template[:i].splitlines(keepends=True)
+        if not lines:
+            return "Invalid placeholder in string: line 1, col 1"
+        colno = i - len("".join(lines[:-1]))
+        return f"Invalid placeholder in string: line {len(lines)}, col {colno}"
+
+    def _slots(self) -> Optional[Tuple[str, List[str], List[_Slot]]]:
+        if self._compiled is None or self._compiled[0] is not self.template:
+            self._compile()  # `template` was replaced
+        return self._compiled
+
+    def substitute(
+        self, mapping: Mapping[str, object] = _NO_MAPPING, /, **kws: object
+    ) -> str:
+        compiled = self._slots()
+        if compiled is None:
+            return super().substitute(mapping, **kws)
+
+        mapping = _merge_mappings(mapping, kws)
+        _, chunks, slots = compiled
+        parts = list(chunks)
+        for i, name, message in slots:
+            if name is None:
+                raise ValueError(message)
+            parts[i] = str(mapping[name])
+        return "".join(parts)
+
+    def safe_substitute(
+        self, mapping: Mapping[str, object] = _NO_MAPPING, /, **kws: object
+    ) -> str:
+        compiled = self._slots()
+        if compiled is None:
+            return super().safe_substitute(mapping, **kws)
+
+        mapping = _merge_mappings(mapping, kws)
+        _, chunks, slots = compiled
+        parts = list(chunks)
+        for i, name, _ in slots:
+            if name is not None:
+                try:
+                    parts[i] = str(mapping[name])
+                except KeyError:
+                    pass  # keep the placeholder
+        return "".join(parts)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.template!r})"
+
+
+def _merge_mappings(
+    mapping: Mapping[str, object], kws: Dict[str, object]
+) -> Mapping[str, object]:
+    if mapping is _NO_MAPPING:
+        return kws
+    if kws:
+        return ChainMap(kws, cast(Dict[str, object], mapping))
+    return mapping
+
+
+class TemplateCache:
+    """Process-wide registry for the templates obtained via :obj:`get_template`,
+    indexed by ``(relative_to, name)``.
+
+    The first time a template is requested from a given package, all the templates in
+    that package are loaded at once, so subsequent calls never touch
+    :mod:`importlib.resources` again.
+    Templates from PyScaffold itself are kept indefinitely, while the ones from other
+    packages (e.g. extensions) are evicted in a *least recently used* fashion when there
+    are more than ``maxsize`` of them (``None`` means no limit).
+
+    Please use the instance stored in :obj:`cache` instead of creating new objects.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize
+        self._builtin: Dict[_Key, string.Template] = {}
+        self._external: "OrderedDict[_Key, string.Template]" = OrderedDict()
+        self._preloaded: Set[str] = set()
+        self._lock = RLock()
+
+    def get(self, name: str, relative_to: str = __name__) -> string.Template:
+        """Retrieve the template from the cache, loading it if necessary.
+        See :obj:`get_template`.
+        """
+        key = (relative_to, name)
+        with self._lock:
+            if relative_to not in self._preloaded:
+                self.preload(relative_to)
+
+            template = self._builtin.get(key) or self._external.get(key)
+            if template is None:
+                template = self._store(key, _load_template(relative_to, name))
+            elif key in self._external:
+                self._external.move_to_end(key)
+
+            return template
+
+    def preload(self, relative_to: str = __name__):
+        """Load all the templates available in the given package/module.
+
+        For packages other than PyScaffold itself, at most ``maxsize`` templates are
+        loaded (so the preloaded templates do not evict each other).
+        """
+        with self._lock:
+            self._preloaded.add(relative_to)
+            try:
+                names = [
+                    file[: -len(TEMPLATE_SUFFIX)]
+                    for file in _list_resources(relative_to)
+                    if file.endswith(TEMPLATE_SUFFIX)
+                ]
+                if relative_to != __name__ and self.maxsize is not None:
+                    names = names[: self.maxsize]
+                for name in names:
+                    self._store((relative_to, name), _load_template(relative_to, name))
+            except (ImportError, OSError, TypeError, ValueError) as ex:
+                # Let `get` deal with errors for the individual templates...
+                logger.debug(
+                    f"Impossible to preload templates from {relative_to}: {ex}"
+                )
+
+    def invalidate(self, relative_to: Union[str, ModuleType, None] = None):
+        """Remove the templates from the cache, so they are loaded again next time
+        they are requested.
+
+        Args:
+            relative_to: package/module (or its name) whose templates should be removed.
+                By default all the templates are removed.
+        """
+        if isinstance(relative_to, ModuleType):
+            relative_to = relative_to.__name__
+
+        with self._lock:
+            if relative_to is None:
+                self._builtin.clear()
+                self._external.clear()
+                self._preloaded.clear()
+                return
+
+            self._preloaded.discard(relative_to)
+            for templates in (self._builtin, self._external):
+                for key in [k for k in templates if k[0] == relative_to]:
+                    del templates[key]
+
+    def _store(self, key: _Key, template: string.Template) -> string.Template:
+        if key[0] == __name__:
+            self._builtin[key] = template
+            return template
+
+        self._external[key] = template
+        self._external.move_to_end(key)
+        while self.maxsize is not None and len(self._external) > self.maxsize:
+            self._external.popitem(last=False)
+
+        return template
+
+
+cache = TemplateCache()
+"""Templates already loaded by :obj:`get_template`.
+Use ``cache.invalidate()`` to force the templates to be read again from the disk
+and ``cache.maxsize`` to limit the number of templates from other packages kept
+in memory.
+"""
+
+
 def get_template(
     name: str, relative_to: Union[str, ModuleType] = __name__
 ) -> string.Template:
@@ -113,15 +363,23 @@ def get_template(
 
     .. versionchanged :: 3.3
         New parameter **relative_to**.
+
+    .. versionchanged :: 4.7
+        Templates are cached (see :obj:`cache`), the same object is returned when the
+        same template is requested multiple times.
+        The returned objects are :obj:`CompiledTemplate` instances.
     """
-    file_name = f"{name}.template"
     if isinstance(relative_to, ModuleType):
         relative_to = relative_to.__name__
 
-    data = read_text(relative_to, file_name)
+    return cache.get(name, relative_to)
+
+
+def _load_template(relative_to: str, name: str) -> string.Template:
+    data = read_text(relative_to, f"{name}{TEMPLATE_SUFFIX}")
     # we assure that line endings are converted to '\n' for all OS
     content = data.replace(os.linesep, "\n")
-    return string.Template(content)
+    return CompiledTemplate(content)
 
 
 def setup_cfg(opts: ScaffoldOpts) -> str:
@@ -141,6 +399,8 @@ def setup_cfg(opts: ScaffoldOpts) -> str:
     desc = opts.get("description", "").splitlines() or [""]
     cfg_str = template.substitute({**opts, "description": desc[0]})
 
+    from configupdater import ConfigUpdater  # lazy: expensive to import
+
     updater = ConfigUpdater()
     updater.read_string(cfg_str)
 
@@ -159,10 +419,12 @@ def setup_cfg(opts: ScaffoldOpts) -> str:
     return str(updater)
 
 
-def add_pyscaffold(config: ConfigUpdater, opts: ScaffoldOpts) -> ConfigUpdater:
+def add_pyscaffold(config: "ConfigUpdater", opts: ScaffoldOpts) -> "ConfigUpdater":
     """Add PyScaffold section to a ``setup.cfg``-like file + PyScaffold's version +
     extensions and their associated options.
     """
+    from .. import __version__ as pyscaffold_version  # lazy: expensive to compute
+
     if "pyscaffold" not in config:
         config.add_section("pyscaffold")
 
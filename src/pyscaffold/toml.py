@@ -9,8 +9,6 @@ to swap implementations (e.g. replace `tomlkit`_ with `toml`_).
 
 from typing import Any, List, MutableMapping, NewType, Tuple, TypeVar, Union, cast
 
-import tomlkit
-
 TOMLMapping = NewType("TOMLMapping", MutableMapping)
 """Abstraction on the value returned by :obj:`loads`.
 
@@ -25,6 +23,8 @@ def loads(text: str) -> TOMLMapping:
     """Parse a string containing TOML into a dict-like object,
     preserving style somehow.
     """
+    import tomlkit  # lazy: expensive to import
+
     return TOMLMapping(cast(MutableMapping, tomlkit.loads(text)))
 
 
@@ -35,6 +35,8 @@ def dumps(obj: Union[TOMLMapping, dict]) -> str:
     """Serialize a dict-like object into a TOML str,
     If the object was generated via :obj:`loads`, then the style will be preserved.
     """
+    import tomlkit  # lazy: expensive to import
+
     return tomlkit.dumps(obj)  # type: ignore[arg-type]
     # TODO: Once tomlkit improves dumps' type hints, remove type ignore comment
 
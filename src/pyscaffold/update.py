@@ -5,14 +5,12 @@ Functionality to update one PyScaffold version to another
 from enum import Enum
 from functools import reduce, wraps
 from itertools import chain
+from pathlib import Path
 from types import SimpleNamespace as Object
 from typing import TYPE_CHECKING, Callable, Iterable, Tuple, cast
 
-from configupdater import ConfigUpdater
-from packaging.version import Version
-
-from . import __version__ as pyscaffold_version
 from . import dependencies as deps
+from . import file_system as fs
 from . import templates, toml
 from .info import (
     PYPROJECT_TOML,
@@ -26,6 +24,8 @@ from .structure import ScaffoldOpts, Structure
 
 if TYPE_CHECKING:  # pragma: no cover
     # ^  avoid circular dependencies in runtime
+    from configupdater import ConfigUpdater
+
     from .actions import Action, ActionParams
 
 
@@ -34,15 +34,27 @@ if TYPE_CHECKING:  # pragma: no cover
 
 
 def version_migration(struct: Structure, opts: ScaffoldOpts) -> "ActionParams":
-    """Update projects that were generated with old versions of PyScaffold"""
+    """Update projects that were generated with old versions of PyScaffold
+
+    .. versionchanged:: 4.7
+       ``setup.cfg`` is parsed only once and all the steps of the migration plan
+       change the same in-memory document, that is written back at the end (only if
+       something changed).
+       The paths of the files changed by the migration are listed in the
+       :obj:`MIGRATED_FILES` option.
+    """
     update = opts.get("update")
 
     if not update:
         return struct, opts
 
+    from packaging.version import Version  # lazy: expensive to import
+
+    from . import __version__ as pyscaffold_version  # lazy: expensive to compute
     from .actions import invoke  # delay import to avoid circular dependency error
 
-    curr_version = get_curr_version(opts["project_path"])
+    setupcfg = read_setupcfg(opts["project_path"])
+    curr_version = get_curr_version(opts["project_path"], setupcfg)
 
     # specify how to migrate from one version to another as ordered list
     v4_plan = [
@@ -64,37 +76,84 @@ def version_migration(struct: Structure, opts: ScaffoldOpts) -> "ActionParams":
 
     # replace the old version with the updated one
     opts["version"] = pyscaffold_version
-    return reduce(invoke, plan_actions, (struct, opts))
+
+    # All the steps share the same in-memory `setup.cfg`, written once at the end
+    original = str(setupcfg)
+    opts = {**opts, _SHARED_SETUPCFG: setupcfg}
+    struct, opts = reduce(invoke, plan_actions, (struct, opts))
+    setupcfg = opts.pop(_SHARED_SETUPCFG)
+    return struct, _save_setupcfg(setupcfg, original, opts, "version_migration")
+
+
+MIGRATED_FILES = "migrated_files"
+"""Key used in ``opts`` to list the files changed by :obj:`version_migration` (and the
+other migration actions in this module)
+"""
+
+_SHARED_SETUPCFG = "_setupcfg"
+"""Key used in ``opts`` by :obj:`version_migration` to share the parsed ``setup.cfg``
+between the steps of the migration plan
+"""
 
 
 def _change_setupcfg(
-    fn: Callable[[ConfigUpdater, ScaffoldOpts], Tuple[ConfigUpdater, ScaffoldOpts]]
+    fn: Callable[["ConfigUpdater", ScaffoldOpts], Tuple["ConfigUpdater", ScaffoldOpts]]
 ) -> Callable[[Structure, ScaffoldOpts], "ActionParams"]:
+    """Turn ``fn`` into an action that changes ``setup.cfg``.
+
+    When invoked by :obj:`version_migration`, the action changes the shared in-memory
+    ``setup.cfg``, otherwise the file is read and written back (if changed).
+    """
+
     @wraps(fn)
     def _wrapped(struct: Structure, opts: ScaffoldOpts) -> "ActionParams":
+        shared = opts.get(_SHARED_SETUPCFG)
+        if shared is not None:
+            setupcfg, opts = fn(shared, opts)
+            return struct, {**opts, _SHARED_SETUPCFG: setupcfg}
+
         setupcfg = read_setupcfg(opts["project_path"])
+        original = str(setupcfg)
         setupcfg, opts = fn(setupcfg, opts)
-        if not opts["pretend"]:
-            try:
-                setupcfg.update_file()
-            except Exception:  # pragma: no cover
-                msg = f"Problems with {fn.__name__}. `setup.cfg` content:\n\n"
-                logger.debug(msg + str(setupcfg) + "\n\n")
-                raise
-
-        logger.report("updated", opts["project_path"] / SETUP_CFG)
-        return struct, opts
+        return struct, _save_setupcfg(setupcfg, original, opts, fn.__name__)
 
     return _wrapped
 
 
+def _save_setupcfg(
+    setupcfg: "ConfigUpdater", original: str, opts: ScaffoldOpts, step: str
+) -> ScaffoldOpts:
+    if str(setupcfg) == original:
+        logger.report("unchanged", opts["project_path"] / SETUP_CFG)
+        return opts
+
+    if not opts["pretend"]:
+        try:
+            # Equivalent to ``setupcfg.update_file()``, but journaled and profiled
+            setupcfg.validate_format()
+            fs.write_file(opts["project_path"] / SETUP_CFG, str(setupcfg))
+        except Exception:  # pragma: no cover
+            msg = f"Problems with {step}. `setup.cfg` content:\n\n"
+            logger.debug(msg + str(setupcfg) + "\n\n")
+            raise
+
+    logger.report("updated", opts["project_path"] / SETUP_CFG)
+    return _migrated(opts, opts["project_path"] / SETUP_CFG)
+
+
+def _migrated(opts: ScaffoldOpts, path: Path) -> ScaffoldOpts:
+    return {**opts, MIGRATED_FILES: [*opts.get(MIGRATED_FILES, []), path]}
+
+
 @_change_setupcfg
-def add_entrypoints(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
+def add_entrypoints(setupcfg: "ConfigUpdater", opts: ScaffoldOpts):
     """Add [options.entry_points] to setup.cfg"""
     new_section_name = "options.entry_points"
     if new_section_name in setupcfg:
         return setupcfg, opts
 
+    from configupdater import ConfigUpdater  # lazy: expensive to import
+
     cfg = ConfigUpdater().read_string(templates.setup_cfg(opts))
     new_section = cfg[new_section_name].detach()
 
@@ -109,10 +168,12 @@ def add_entrypoints(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
 
 
 @_change_setupcfg
-def update_setup_cfg(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
+def update_setup_cfg(setupcfg: "ConfigUpdater", opts: ScaffoldOpts):
     """Update `pyscaffold` in setupcfg and ensure some values are there as expected"""
     if "options" not in setupcfg:
         template = templates.setup_cfg(opts)
+        from configupdater import ConfigUpdater  # lazy: expensive to import
+
         new_section = ConfigUpdater().read_string(template)["options"]
         setupcfg["metadata"].add_after.section(new_section.detach())
 
@@ -122,15 +183,15 @@ def update_setup_cfg(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
 
 
 @_change_setupcfg
-def add_dependencies(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
+def add_dependencies(setupcfg: "ConfigUpdater", opts: ScaffoldOpts):
     """Add dependencies"""
     # TODO: Revise the need for `deps.RUNTIME` once `python_requires = >= 3.8`
     options = setupcfg["options"]
     if "install_requires" in options:
         install_requires = options.get("install_requires", Object(value=""))
-        runtime_deps = deps.split(cast(str, install_requires.value))
-        runtime_deps = deps.add(deps.RUNTIME, runtime_deps)
-        options["install_requires"].set_values(runtime_deps)
+        runtime_deps = deps.RequirementSet(deps.RUNTIME)
+        runtime_deps.update(deps.split(cast(str, install_requires.value)))
+        options["install_requires"].set_values(runtime_deps.to_list())
     else:
         options.set("install_requires")
         options["install_requires"].set_values(deps.RUNTIME)
@@ -139,7 +200,7 @@ def add_dependencies(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
 
 
 @_change_setupcfg
-def replace_find_with_find_namespace(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
+def replace_find_with_find_namespace(setupcfg: "ConfigUpdater", opts: ScaffoldOpts):
     setupcfg["options"].set("packages", "find_namespace:")
     return setupcfg, opts
 
@@ -151,7 +212,7 @@ def replace_find_with_find_namespace(setupcfg: ConfigUpdater, opts: ScaffoldOpts
 
 
 @_change_setupcfg
-def handover_setup_requires(setupcfg: ConfigUpdater, opts: ScaffoldOpts):
+def handover_setup_requires(setupcfg: "ConfigUpdater", opts: ScaffoldOpts):
     """When paired with :obj:`update_pyproject_toml`, this will transfer ``setup.cfg ::
     options.setup_requires`` to ``pyproject.toml :: build-system.requires``
     """
@@ -179,12 +240,20 @@ def update_pyproject_toml(struct: Structure, opts: ScaffoldOpts) -> "ActionParam
         config = toml.loads(templates.pyproject_toml(opts))
 
     build = config["build-system"]
-    existing = deps.add(opts.get("build_deps", []), build.get("requires", []))
-    build["requires"] = deps.remove(deps.add(existing, deps.ISOLATED), ["pyscaffold"])
-    # ^  PyScaffold is no longer a build dependency
+    build_deps = deps.RequirementSet(opts.get("build_deps", []))
+    build_deps.update(str(r) for r in build.get("requires", []))
+    build_deps.update(deps.ISOLATED)
+    build_deps.discard("pyscaffold")  # PyScaffold is no longer a build dependency
+    build["requires"] = build_deps.to_list()
     toml.setdefault(build, "build-backend", "setuptools.build_meta")
     toml.setdefault(config, "tool.setuptools_scm.version_scheme", "no-guess-dev")
 
-    (opts["project_path"] / PYPROJECT_TOML).write_text(toml.dumps(config), "utf-8")
-    logger.report("updated", opts["project_path"] / PYPROJECT_TOML)
-    return struct, opts
+    path = opts["project_path"] / PYPROJECT_TOML
+    contents = toml.dumps(config)
+    if fs.is_unchanged(path, contents):
+        logger.report("unchanged", path)
+        return struct, opts
+
+    fs.write_file(path, contents)
+    logger.report("updated", path)
+    return struct, _migrated(opts, path)
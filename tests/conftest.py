@@ -216,6 +216,19 @@ def isolated_logger(request, logger, monkeypatch):
         # ^  Force the handler to not be re-used
 
 
+@pytest.fixture(autouse=True)
+def fresh_git_config():
+    """Isolate tests.
+    Avoid git settings memoized in one test to leak into others (e.g. when ``git`` is
+    mocked)
+    """
+    from pyscaffold import info
+
+    info.clear_git_config()
+    yield
+    info.clear_git_config()
+
+
 @pytest.fixture
 def tmpfolder(tmpdir):
     with tmpdir.as_cwd():
@@ -232,14 +245,21 @@ def git_mock(monkeypatch, logger):
         logger.report("run", cmd, context=os.getcwd())
 
         def _response():
-            yield "git@mock"
+            if "--list" in args:
+                yield "user.name\ngit@mock\0user.email\ngit@mock\0"
+            else:
+                yield "git@mock"
 
         return _response()
 
     def _is_git_repo(folder):
         return Path(folder, ".git").is_dir()
 
+    def _git_output(*args, **kwargs):
+        return "".join(_git(*args, **kwargs))
+
     monkeypatch.setattr("pyscaffold.shell.git", _git)
+    monkeypatch.setattr("pyscaffold.shell.git_output", _git_output)
     monkeypatch.setattr("pyscaffold.repo.is_git_repo", _is_git_repo)
 
     yield _git
@@ -247,10 +267,11 @@ def git_mock(monkeypatch, logger):
 
 @pytest.fixture
 def nogit_mock(monkeypatch):
-    def raise_error(*_):
+    def raise_error(*_, **__):
         raise command_exception("No git mock!")
 
     monkeypatch.setattr("pyscaffold.shell.git", raise_error)
+    monkeypatch.setattr("pyscaffold.shell.git_output", raise_error)
     yield
 
 
@@ -270,11 +291,12 @@ def nogit_cmd_mock(monkeypatch):
 
 @pytest.fixture
 def noconfgit_mock(monkeypatch):
-    def raise_error(*argv):
+    def raise_error(*argv, **_):
         if "config" in argv:
             raise command_exception("No git mock!")
 
     monkeypatch.setattr("pyscaffold.shell.git", raise_error)
+    monkeypatch.setattr("pyscaffold.shell.git_output", raise_error)
     yield
 
 
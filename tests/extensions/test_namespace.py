@@ -43,6 +43,8 @@ def test_add_namespace(isolated_logger, caplog):
     assert {"blue_yonder", "__init__.py"} == modules
     submodules = set(ns_pkg_struct["com"]["blue_yonder"].keys())
     assert "package" in submodules
+    # the original structure should not be changed
+    assert struct == {"src": {"package": {"file1": "Content"}}}
 
     # warnings should not be logged
     log = caplog.text
@@ -4,7 +4,7 @@ import sys
 from pathlib import Path
 from unittest.mock import Mock
 
-from pyscaffold import shell
+from pyscaffold import shell, structure
 from pyscaffold.api import create_project
 from pyscaffold.cli import run
 from pyscaffold.extensions import pre_commit
@@ -85,6 +85,25 @@ def test_add_instructions():
     assert note in new_text
 
 
+def test_add_files_lazy_readme():
+    # Given a README template that records when it is rendered,
+    calls = []
+
+    def readme(opts):
+        calls.append(opts)
+        return get_template("readme").safe_substitute(opts)
+
+    opts = {"title": "proj", "name": "proj", "description": "desc", "version": "99.9"}
+    # when the pre-commit files are added,
+    struct, _ = pre_commit.add_files({"README.rst": readme}, opts)
+    # then the README should not be rendered yet
+    assert not calls
+    # but only when the file is reified
+    text, _ = structure.reify_leaf(struct["README.rst"], opts)
+    assert pre_commit.README_NOTE.format(**opts) in text
+    assert len(calls) == 1
+
+
 # ---- Integration tests ----
 
 
@@ -1,19 +1,30 @@
+import os
+import pickle
 from os.path import getmtime
 from pathlib import Path
+from shutil import rmtree
 from tempfile import TemporaryDirectory
 from textwrap import dedent
+from unittest.mock import Mock
 
 import pytest
 
-from pyscaffold import cli, info, operations, structure, templates
+from pyscaffold import actions, cli, info, operations, shell, structure, templates
 from pyscaffold.actions import get_default_options
-from pyscaffold.api import NO_CONFIG, bootstrap_options, create_project
+from pyscaffold.api import (
+    NO_CONFIG,
+    bootstrap_options,
+    create_project,
+    create_projects,
+    update_projects,
+)
 from pyscaffold.exceptions import (
     DirectoryAlreadyExists,
     InvalidIdentifier,
     NoPyScaffoldProject,
 )
 from pyscaffold.extensions import Extension
+from pyscaffold.extensions.cirrus import Cirrus
 from pyscaffold.file_system import chdir
 
 
@@ -145,6 +156,20 @@ def test_create_project_when_updating(tmpfolder, git_mock):
     assert Path("my-project").exists()
 
 
+def test_create_project_when_updating_unchanged(tmpfolder, git_mock):
+    # Given a project was created,
+    create_project(project_path="proj")
+    files = [
+        f for f in Path("proj").glob("**/*") if f.is_file() and ".git" not in f.parts
+    ]
+    for file in files:
+        os.utime(file, (0, 0))
+    # When it is (force-)updated without changing any option,
+    create_project(project_path="proj", update=True, force=True)
+    # Then no file should be re-written
+    assert [f for f in files if f.stat().st_mtime != 0] == []
+
+
 def test_create_project_with_license(tmpfolder, git_mock):
     _, opts = get_default_options(
         {}, dict(project_path="my-project", license="BSD-3-Clause")
@@ -331,6 +356,139 @@ def test_create_project_with_default_config(tmpfolder, with_default_config):
     assert (project / ".cirrus.yml").exists()
 
 
+def test_create_projects(tmpfolder, git_mock):
+    # Given a list of projects, one of them already existing
+    tmpfolder.mkdir("proj1")
+    projects = [{"project_path": f"proj{i}"} for i in range(3)]
+    # when they are created in a batch with some shared options
+    results = list(create_projects(projects, description="shared description"))
+    # then each project produces its own result, in order
+    assert [r.position for r in results] == [0, 1, 2]
+    assert [r.opts for r in results] == projects
+    # the errors do not interrupt the other projects
+    assert isinstance(results[1].error, DirectoryAlreadyExists)
+    assert results[1].result is None
+    for i in (0, 2):
+        assert results[i].error is None
+        _, opts = results[i].result
+        assert opts["description"] == "shared description"
+        assert "shared description" in Path(f"proj{i}/setup.cfg").read_text()
+
+
+def test_create_projects_read_config_once(tmpfolder, git_mock, with_default_config):
+    # Given a default config file exists and contains stuff
+    _ = with_default_config
+    calls = []
+    orig_project = info.project
+
+    def _project(*args, **kwargs):
+        calls.append(args)
+        return orig_project(*args, **kwargs)
+
+    # when several projects are created in a batch
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(info, "project", _project)
+        projects = [
+            {"project_path": f"proj{i}", "name": f"project{i}"} for i in range(3)
+        ]
+        results = list(create_projects(projects))
+
+    # then the config file is read just once
+    assert len(calls) == 1
+    # but it is considered for all projects
+    for i, result in enumerate(results):
+        assert result.error is None
+        _, opts = result.result
+        assert opts["author"] == "John Doe"
+        assert sorted(e.name for e in opts["extensions"]) == ["cirrus", "namespace"]
+        namespace = Path(f"proj{i}/src/my_namespace/my_sub_namespace")
+        assert (namespace / f"project{i}").exists()
+        assert Path(f"proj{i}/.cirrus.yml").exists()
+
+
+def test_create_projects_with_workers(tmpfolder):
+    # Given a list of projects
+    projects = [{"project_path": f"proj{i}"} for i in range(3)]
+    # when they are created concurrently
+    results = list(create_projects(projects, workers=2))
+    # then all of them are generated
+    assert sorted(r.position for r in results) == [0, 1, 2]
+    assert all(r.error is None for r in results)
+    for i in range(3):
+        assert Path(f"proj{i}/setup.cfg").exists()
+        assert Path(f"proj{i}/.git").exists()
+
+
+def test_create_projects_with_workers_no_config(tmpfolder):
+    # Given NO_CONFIG is used, when projects are created concurrently
+    projects = [{"project_path": f"proj{i}"} for i in range(2)]
+    results = list(create_projects(projects, workers=2, config_files=NO_CONFIG))
+    # then the option can be sent to the workers
+    assert all(r.error is None for r in results)
+    assert all(Path(f"proj{i}/setup.cfg").exists() for i in range(2))
+    # and keeps its identity when pickled
+    assert pickle.loads(pickle.dumps(NO_CONFIG)) is NO_CONFIG
+
+
+def test_create_projects_reuse_pipelines(tmpfolder, git_mock, monkeypatch):
+    discover = Mock(wraps=actions.discover)
+    monkeypatch.setattr(actions, "discover", discover)
+    # Given the same extension objects are shared by some projects
+    shared = [Cirrus()]
+    projects = [
+        {"project_path": "proj0", "extensions": shared},
+        {"project_path": "proj1", "extensions": shared},
+        # but other projects use new objects for the same extensions
+        {"project_path": "proj2", "extensions": [Cirrus()]},
+    ]
+    results = list(create_projects(projects, config_files=NO_CONFIG))
+    assert all(r.error is None for r in results)
+    # then the pipeline is only re-used for the same objects
+    assert discover.call_count == 2
+
+
+def test_update_projects(tmpfolder):
+    # Given some existing projects,
+    for i in range(3):
+        create_project(project_path=f"proj{i}", config_files=NO_CONFIG)
+    # one of them with uncommitted changes
+    Path("proj1/README.rst").write_text("changed", encoding="utf-8")
+    # and one of them missing a file
+    with chdir("proj2"):
+        shell.git("rm", "-q", "tests/conftest.py")
+        shell.git("commit", "-qm", "Remove file")
+    # when they are updated in a batch,
+    paths = ["proj0", "proj1", "proj2", "missing"]
+    results = list(update_projects(paths, config_files=NO_CONFIG, force=False))
+    # then each project should have its own status
+    status = {str(r.path): r.status for r in results}
+    assert status == {
+        "proj0": "unchanged",
+        "proj1": "dirty",
+        "proj2": "updated",
+        "missing": "failed",
+    }
+    assert Path("proj2/tests/conftest.py").exists()
+    assert isinstance(results[-1].error, NoPyScaffoldProject)
+
+
+def test_update_projects_status_from_writes(tmpfolder):
+    # Given a project that is not a git repository,
+    create_project(project_path="proj", config_files=NO_CONFIG)
+    rmtree("proj/.git")
+    opts = dict(config_files=NO_CONFIG, force=True)
+    # when it is updated several times, nothing should be reported as updated
+    for _ in range(2):
+        assert [r.status for r in update_projects(["proj"], **opts)] == ["unchanged"]
+    # unless a migration changes one of its files
+    pyproject = Path("proj/pyproject.toml")
+    backend = 'build-backend = "setuptools.build_meta"\n'
+    pyproject.write_text(pyproject.read_text().replace(backend, ""))
+    assert [r.status for r in update_projects(["proj"], **opts)] == ["updated"]
+    assert backend in pyproject.read_text()
+    assert [r.status for r in update_projects(["proj"], **opts)] == ["unchanged"]
+
+
 @pytest.fixture
 def with_existing_proj_config(tmp_path):
     proj = tmp_path / "proj"
@@ -1,11 +1,15 @@
+import json
 import logging
 import os
+import re
+import subprocess
 import sys
+from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 
-from pyscaffold import cli
+from pyscaffold import api, cli
 from pyscaffold.exceptions import ErrorLoadingExtension
 from pyscaffold.file_system import localize_path as lp
 
@@ -24,6 +28,56 @@ def test_parse_args():
     assert opts["project_path"] == "my-project"
 
 
+@pytest.fixture
+def loaded_extensions(monkeypatch):
+    from pyscaffold import extensions
+
+    extensions.index_entry_points()  # ensure the index is cached
+    loaded = []
+    original = extensions.load_from_entry_point
+
+    def _load(entry_point):
+        loaded.append(entry_point.name)
+        return original(entry_point)
+
+    monkeypatch.setattr(extensions, "load_from_entry_point", _load)
+    return loaded
+
+
+def test_parse_args_lazy_extensions(loaded_extensions):
+    # When no extension flag is given, no extension should be loaded
+    opts = cli.parse_args(["my-project", "-v", "--force", "-nname"])
+    assert opts["name"] == "name"
+    assert loaded_extensions == []
+    # When an extension flag is given (even abbreviated), only that extension is loaded
+    opts = cli.parse_args(["my-project", "--namesp=my.ns", "--venv-install", "pkg"])
+    assert opts["namespace"] == "my.ns"
+    assert sorted(loaded_extensions) == ["namespace", "venv"]
+    assert sorted(e.name for e in opts["extensions"]) == ["namespace", "venv"]
+
+
+def test_parse_args_bundled_short_flags(loaded_extensions):
+    # When short flags are bundled, each one of them is considered
+    opts = cli.parse_args(["my-project", "-vfnNAME"])
+    assert opts["force"] and opts["name"] == "NAME"
+    assert loaded_extensions == []
+    # including the extension flags
+    opts = cli.parse_args(["-fi", "my-project"])
+    assert opts["force"]
+    assert "interactive" in loaded_extensions
+
+
+@pytest.mark.parametrize("args", [["-h"], ["proj", "--x-unknown-x"], ["-i", "proj"]])
+def test_parse_args_load_all_extensions(args, loaded_extensions):
+    # When help is requested, an unknown flag is given or an eager extension is used,
+    # all the extensions should be loaded
+    try:
+        cli.parse_args(args)
+    except SystemExit:
+        pass
+    assert {"namespace", "venv", "cirrus"} <= set(loaded_extensions)
+
+
 def test_parse_verbose_option():
     for quiet in ("--verbose", "-v"):
         args = ["my-project", quiet]
@@ -84,7 +138,7 @@ def test_verbose_main(tmpfolder, git_mock, caplog):
     assert find_report(caplog, "create", "setup.py")
     assert find_report(caplog, "create", lp("my_project/__init__.py"))
     assert find_report(caplog, "run", "git init")
-    assert find_report(caplog, "run", "git add")
+    assert find_report(caplog, "run", "git update-index")
 
 
 def test_pretend_main(tmpfolder, git_mock, caplog):
@@ -101,7 +155,7 @@ def test_pretend_main(tmpfolder, git_mock, caplog):
         assert find_report(caplog, "create", "setup.py")
         assert find_report(caplog, "create", lp("my_project/__init__.py"))
         assert find_report(caplog, "run", "git init")
-        assert find_report(caplog, "run", "git add")
+        assert find_report(caplog, "run", "git update-index")
 
 
 def test_main_when_updating(tmpfolder, capsys, git_mock):
@@ -130,6 +184,15 @@ def test_main_with_list_actions(tmpfolder, capsys, isolated_logger):
     assert not os.path.exists(args[0])
 
 
+def test_main_with_profile(tmpfolder, capsys, git_mock):
+    # When putup is called with --profile,
+    cli.main(["my-project", "--profile"])
+    # then a report with the actions should be printed
+    out, _ = capsys.readouterr()
+    assert re.search(r"^pyscaffold.structure:create_structure\s+\d", out, re.M)
+    assert re.search(r"^total\s+\d", out, re.M)
+
+
 def test_wrong_extension(monkeypatch, tmpfolder):
     # Given an entry point with some problems is registered in the pyscaffold.cli group
     # (e.g. failing implementation, wrong dependencies that cause the python file to
@@ -160,3 +223,103 @@ def test_get_log_level():
     # Make sure it also works with sys.argv
     sys.argv = ["putup", "--very-verbose"]
     assert cli.get_log_level() == logging.DEBUG
+
+
+HEAVY_MODULES = (
+    "configupdater",
+    "tomlkit",
+    "packaging",
+    "platformdirs",
+    "importlib.metadata",
+    "multiprocessing",
+    "concurrent.futures.process",
+)
+"""Expensive modules that should not be loaded just by importing ``pyscaffold.cli``
+(please consider lazy imports before removing items from this list).
+"""
+
+
+def _import(code: str, *flags: str) -> subprocess.CompletedProcess:
+    cmd = [sys.executable, *flags, "-c", code]
+    return subprocess.run(cmd, capture_output=True, text=True, check=True)
+
+
+def test_import_cli_is_lazy():
+    # When the CLI module is imported, expensive dependencies should not be loaded
+    modules = set(
+        _import("import sys, pyscaffold.cli; print(*sys.modules)").stdout.split()
+    )
+    assert "pyscaffold.cli" in modules
+    for heavy in HEAVY_MODULES:
+        assert heavy not in modules
+
+
+def test_default_options_version():
+    # When DEFAULT_OPTIONS is accessed, the version is there (computed lazily)
+    from pyscaffold import __version__
+
+    assert api.DEFAULT_OPTIONS["version"] == __version__
+    assert api.DEFAULT_OPTIONS is api.DEFAULT_OPTIONS
+
+
+def test_main_with_diff(tmpfolder, capsys, git_mock):
+    # When putup is called with --diff,
+    cli.main(["my-project", "--diff"])
+    # then an unified diff should be printed
+    out, _ = capsys.readouterr()
+    assert "+++ b/setup.py" in out
+    # but no project should be created
+    assert not os.path.exists("my-project")
+
+
+def test_main_with_json_logs(tmpfolder, caplog, git_mock):
+    # When putup is called with --log-format json,
+    cli.main(["my-project", "--log-format", "json", "-vv"])
+    # then each log record should be formatted as a JSON object
+    formatter = cli.logger.formatter
+    events = [json.loads(formatter.format(record)) for record in caplog.records]
+    invoked = [e["subject"] for e in events if e["activity"] == "invoke"]
+    assert "pyscaffold.structure:create_structure" in invoked
+    # including the duration of the actions
+    done = [e for e in events if e["activity"] == "done"]
+    assert len(done) == len(invoked)
+    assert all(e["duration"] >= 0 for e in done)
+
+
+def test_main_with_bulk_update(tmpfolder, capsys):
+    # Given some existing projects,
+    for name in ("proj0", "proj1"):
+        cli.main([name, "--no-config"])
+    capsys.readouterr()
+    # when they are updated via a glob pattern,
+    cli.main(["proj*", "--bulk-update", "--no-config"])
+    # then a summary should be printed
+    out, _ = capsys.readouterr()
+    assert re.search(r"unchanged\s+proj0", out)
+    assert re.search(r"unchanged\s+proj1", out)
+    assert "2 unchanged" in out
+    # (instead of the message for each individual project)
+    assert "done!" not in out
+
+    # When a file listing the projects is given and one of them fails,
+    Path("lists").mkdir()
+    content = "# comment\n../proj1\n\nmissing\n"
+    Path("lists/projects.txt").write_text(content, encoding="utf-8")
+    with pytest.raises(SystemExit):
+        cli.main(["lists/projects.txt", "--bulk-update", "--no-config"])
+    # then the paths should be relative to the file and the failure reported
+    out, _ = capsys.readouterr()
+    assert re.search(r"unchanged\s+proj1", out)
+    assert re.search(rf"failed\s+{re.escape(str(Path('lists/missing')))}", out)
+    assert "1 unchanged, 0 dirty, 1 failed" in out
+
+
+def test_workers_requires_bulk_update(capsys):
+    # When --workers is given without --bulk-update, an error should be raised
+    with pytest.raises(SystemExit):
+        cli.parse_args(["proj", "--workers", "2"])
+    _, err = capsys.readouterr()
+    assert "--workers: only allowed with --bulk-update" in err
+    # but it is fine together with --bulk-update
+    opts = cli.parse_args(["proj*", "--bulk-update", "--workers", "2"])
+    assert opts["workers"] == 2
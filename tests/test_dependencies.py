@@ -102,3 +102,45 @@ def test_add_commented():
         "gitdep @ git+https://repo.com/gitdep@main#egg=gitdep",
         "# comment-that>0==1<3; reminds.pep==508",
     ]
+
+
+def test_requirement_set():
+    reqs = deps.RequirementSet(["platformdirs>=1", "Setuptools_SCM>=5", "# mypkg~=2.0"])
+    assert len(reqs) == 3
+    # Names are normalised according to PEP 503
+    assert "setuptools-scm" in reqs
+    assert "setuptools.scm>=8" in reqs
+    assert reqs.get("SETUPTOOLS_SCM") == "Setuptools_SCM>=5"
+    assert 42 not in reqs
+
+    # Overriding keeps the original position
+    reqs.add("setuptools-scm>=8")
+    reqs.add("mypkg~=9.0")
+    assert reqs.to_list() == ["platformdirs>=1", "setuptools-scm>=8", "mypkg~=9.0"]
+
+    # Merging does not override
+    assert reqs.setdefault("platformdirs>=2") == "platformdirs>=1"
+    assert reqs.setdefault("packaging") == "packaging"
+    assert list(reqs)[-1] == "packaging"
+
+    reqs.discard("mypkg")
+    reqs.discard("not-there")
+    reqs.difference_update(["Packaging>20", "platformdirs"])
+    assert reqs == deps.RequirementSet(["setuptools_scm>=8"])
+    assert reqs != deps.RequirementSet(["setuptools_scm>=9"])
+    assert reqs != deps.RequirementSet(["# setuptools_scm>=8"])
+    assert reqs.to_list() == ["setuptools-scm>=8"]
+    assert repr(reqs) == "RequirementSet(['setuptools-scm>=8'])"
+
+
+def test_requirement_set_serialisation():
+    text = """
+    platformdirs>=1.4.4
+    packaging>20.0; python_version >= "3.8"
+    """
+    reqs = deps.RequirementSet.from_str(text)
+    assert reqs.to_list() == deps.split(text)
+    assert reqs.to_cfg() == (
+        '\n    platformdirs>=1.4.4\n    packaging>20.0; python_version >= "3.8"'
+    )
+    assert deps.RequirementSet.from_str(reqs.to_cfg()) == reqs
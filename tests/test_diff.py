@@ -0,0 +1,102 @@
+import json
+from pathlib import Path, PurePosixPath
+
+import pytest
+
+from pyscaffold import api, diff, info, operations
+from pyscaffold.exceptions import GitDirtyWorkspace
+from pyscaffold.file_system import SourceFile
+
+
+def test_compare(tmpfolder):
+    # Given a project in the disk
+    Path("proj/a").mkdir(parents=True)
+    Path("proj/a/same.txt").write_text("same\n", encoding="utf-8")
+    Path("proj/a/changed.txt").write_text("1\n2\n3\n", encoding="utf-8")
+    Path("proj/old.txt").write_text("old\n", encoding="utf-8")
+    Path("proj/keep.txt").write_text("mine\n", encoding="utf-8")
+    Path("logo.png").write_bytes(b"\x89PNG\x00")
+    # and a structure that differs from it,
+    struct = {
+        "a": {"same.txt": "same\n", "changed.txt": "1\n2\n4\n"},
+        "new.txt": "new\n",
+        "old.txt": (None, operations.remove),
+        "keep.txt": ("theirs\n", operations.no_overwrite()),
+        "logo.png": SourceFile("logo.png"),
+        "ignored.txt": None,
+    }
+    # when they are compared,
+    report = diff.compare(struct, {"project_path": Path("proj")})
+    # then each file should have the correct status,
+    status = {str(change.path): change.status for change in report}
+    assert status == {
+        "a/same.txt": "unchanged",
+        "a/changed.txt": "modified",
+        "new.txt": "added",
+        "old.txt": "removed",
+        "keep.txt": "skipped",
+        "logo.png": "added",
+    }
+    assert report.summary == {
+        "added": 2,
+        "modified": 1,
+        "removed": 1,
+        "unchanged": 1,
+        "skipped": 1,
+    }
+    # with sizes and hashes,
+    (changed,) = report.filter("modified")
+    assert changed.path == PurePosixPath("a/changed.txt")
+    assert changed.size == changed.old_size == 6
+    assert changed.digest != changed.old_digest
+    # and nothing should be written
+    assert not Path("proj/new.txt").exists()
+    assert Path("proj/old.txt").exists()
+
+    # The report can be formatted as an unified diff
+    unified = report.format("unified")
+    assert "--- a/a/changed.txt\n+++ b/a/changed.txt\n" in unified
+    assert "-3\n+4\n" in unified
+    assert "--- /dev/null\n+++ b/new.txt\n" in unified
+    assert "--- a/old.txt\n+++ /dev/null\n" in unified
+    assert "Binary files a/logo.png and b/logo.png differ" in unified
+    assert "same.txt" not in unified
+    assert "keep.txt" not in unified
+    # or as JSON
+    data = json.loads(report.format("json"))
+    assert data["summary"] == report.summary
+    assert data["changes"][0]["path"] == "a/same.txt"
+    with pytest.raises(ValueError):
+        report.format("xml")
+
+
+def test_create_project_with_diff(tmpfolder, git_mock):
+    # Given an existing project,
+    api.create_project(project_path="proj", config_files=api.NO_CONFIG)
+    Path("proj/setup.py").write_text("# changed\n", encoding="utf-8")
+    # when the diff is requested during an update,
+    struct, opts = api.create_project(
+        project_path="proj", update=True, diff="unified", config_files=api.NO_CONFIG
+    )
+    # then the changed files should be reported
+    report = opts["diff_report"]
+    assert [str(change.path) for change in report.filter("modified")] == ["setup.py"]
+    assert struct == {"setup.py": struct["setup.py"]}
+    # and nothing should be written
+    assert Path("proj/setup.py").read_text(encoding="utf-8") == "# changed\n"
+
+
+def test_diff_dirty_workspace(tmpfolder):
+    # Given an existing project with uncommitted changes,
+    api.create_project(project_path="proj", config_files=api.NO_CONFIG)
+    Path("proj/setup.py").write_text("# changed\n", encoding="utf-8")
+    assert not info.is_git_workspace_clean("proj")
+    # when only a diff is requested during the update,
+    _, opts = api.create_project(
+        project_path="proj", update=True, diff="json", config_files=api.NO_CONFIG
+    )
+    # then the dirty workspace should not be an obstacle (nothing is written)
+    assert opts["diff_report"].filter("modified")
+    # but it should still be checked for actual updates
+    with pytest.raises(GitDirtyWorkspace):
+        api.create_project(project_path="proj", update=True, config_files=api.NO_CONFIG)
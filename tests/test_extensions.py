@@ -1,5 +1,7 @@
 import argparse
+import json
 import sys
+from unittest.mock import Mock
 
 import pytest
 
@@ -101,3 +103,36 @@ def test_list_from_entry_points():
     name_list = [e.name for e in ext_list]
     assert len(ext_list) == orig_len - 1
     assert "cirrus" not in name_list
+
+
+def test_index_entry_points(fake_config_dir, monkeypatch):
+    # When the index is created
+    index = extensions.index_entry_points()
+    # Then it should contain the flags of the extensions
+    assert "--namespace" in index["namespace"]
+    assert {"--venv", "--venv-install"} <= set(index["venv"])
+    assert (fake_config_dir / extensions.INDEX_FILE).exists()
+
+    # When the index is requested again, extensions should not be loaded
+    load = Mock(side_effect=AssertionError)
+    monkeypatch.setattr(extensions, "load_from_entry_point", load)
+    assert extensions.index_entry_points() == index
+
+    # unless the installed entry points change
+    fake = EntryPoint("fake", "pyscaffoldext.fake:Fake", "pyscaffold.cli")
+    fake_ext = make_extension("Fake")
+    monkeypatch.setattr(extensions, "iterate_entry_points", lambda *_: [fake])
+    monkeypatch.setattr(extensions, "load_from_entry_point", lambda *_: fake_ext)
+    assert extensions.index_entry_points() == {"fake": ["--fake"]}
+
+
+@pytest.mark.parametrize("contents", ["[]", "{}", '{{"fingerprint": "{}"}}', "{{"])
+def test_index_entry_points_invalid(fake_config_dir, monkeypatch, contents):
+    # Given the index file is invalid or incomplete
+    index = extensions.index_entry_points()
+    file = fake_config_dir / extensions.INDEX_FILE
+    fingerprint = json.loads(file.read_text("utf-8"))["fingerprint"]
+    file.write_text(contents.format(fingerprint), "utf-8")
+    # then it is rebuilt
+    assert extensions.index_entry_points() == index
+    assert json.loads(file.read_text("utf-8"))["flags"] == index
@@ -1,9 +1,16 @@
+import io
 import logging
 import os
 import re
 import stat
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pathlib import Path
+
+import pytest
 
 from pyscaffold import file_system as fs
+from pyscaffold.shell import IS_WINDOWS
 
 from .helpers import temp_umask, uniqpath, uniqstr
 
@@ -63,6 +70,103 @@ def test_pretend_create_file(tmpfolder, caplog):
     assert re.search("create.+" + fname, logs)
 
 
+def test_create_file_streaming(tmpfolder):
+    # When the contents are given as chunks (text or binary),
+    chunks = (f"line {i}\n" for i in range(3))
+    file = fs.create_file("text.txt", chunks)
+    # then they should be written as if they were a single string
+    assert file.read_text(encoding="utf-8") == "line 0\nline 1\nline 2\n"
+    assert next(chunks, None) is None  # all consumed
+    fs.create_file("mixed.txt", iter([b"\x00\x01", "\u2764"]))
+    assert Path("mixed.txt").read_bytes() == b"\x00\x01" + "\u2764".encode("utf-8")
+    fs.create_file("bytes.bin", b"\xff" * 10)
+    assert Path("bytes.bin").read_bytes() == b"\xff" * 10
+
+    # When the contents are given as a file-like object,
+    data = os.urandom(fs.CHUNK_SIZE * 2 + 1)
+    fs.create_file("copy.bin", io.BytesIO(data))
+    # then it should be read in chunks
+    assert Path("copy.bin").read_bytes() == data
+    fs.create_file("copy.txt", io.StringIO("text\n"))
+    assert Path("copy.txt").read_text(encoding="utf-8") == "text\n"
+
+    # When pretending, the contents should not be consumed
+    chunks = iter(["a", "b"])
+    file = fs.create_file("pretend.txt", chunks, pretend=True)
+    assert not file.exists()
+    assert next(chunks) == "a"
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (b"bytes", True),
+        (iter(["a", b"b"]), True),
+        ((chunk for chunk in ["a"]), True),
+        (io.StringIO("text"), True),
+        (fs.SourceFile("source.bin"), True),
+        ("text", False),
+        (["a", "b"], False),
+        (("a", "b"), False),
+        ({"file": "a"}, False),
+        (None, False),
+        (42, False),
+    ],
+)
+def test_is_streamable(content, expected):
+    assert fs.is_streamable(content) is expected
+
+
+@pytest.mark.parametrize("content", [["a", "b"], ("a", "b"), {"file": "a"}, 42])
+def test_create_file_not_streamable(tmpfolder, content):
+    # When the contents are not streamable (e.g. chunks in a list),
+    # then an error should be raised, without creating the file
+    with pytest.raises(TypeError, match="Don't know how to write"):
+        fs.create_file("file.txt", content)
+    assert not Path("file.txt").exists()
+
+
+def test_create_file_from_source(tmpfolder, monkeypatch):
+    data = os.urandom(fs.CHUNK_SIZE * 2 + 1)
+    Path("source.bin").write_bytes(data)
+    # When the contents reference an existing file,
+    file = fs.create_file("copy.bin", fs.SourceFile("source.bin"))
+    # then its bytes should be copied
+    assert file.read_bytes() == data
+
+    # even when neither cloning nor in-kernel copy are available
+    monkeypatch.setattr(fs, "_clone", lambda *_: False)
+    monkeypatch.setattr(fs, "_copy_range", lambda *_: False)
+    file = fs.create_file("fallback.bin", fs.SourceFile(Path("source.bin")))
+    assert file.read_bytes() == data
+
+    # Package resources should also be supported
+    resource = fs.SourceFile.from_resource("pyscaffold.templates", "__init__.py")
+    file = fs.create_file("resource.py", resource)
+    assert (
+        file.read_bytes()
+        == Path(fs.__file__).parent.joinpath("templates", "__init__.py").read_bytes()
+    )
+
+    # When pretending, nothing should be copied
+    file = fs.create_file("pretend.bin", fs.SourceFile("source.bin"), pretend=True)
+    assert not file.exists()
+
+
+def test_is_unchanged(tmpfolder):
+    # When the file does not exist, it is considered changed
+    assert not fs.is_unchanged("a-file.txt", "content\n")
+    # When the file was created with the same content, it is not
+    fs.create_file("a-file.txt", "content\n")
+    assert fs.is_unchanged("a-file.txt", "content\n")
+    # When contents differ (with or without the same size), it is considered changed
+    assert not fs.is_unchanged("a-file.txt", "content")
+    assert not fs.is_unchanged("a-file.txt", "CONTENT\n")
+    # Directories are never unchanged files
+    fs.create_directory("a-dir")
+    assert not fs.is_unchanged("a-dir", "")
+
+
 def test_create_directory(tmpfolder):
     folder = fs.create_directory("a-dir")
     assert folder.is_dir()
@@ -237,3 +341,86 @@ def test_pretend_rm_rf(tmp_path, caplog):
     # But the operation should be logged
     logs = caplog.text
     assert re.search("remove.+" + dname, logs)
+
+
+def test_journal(tmpfolder):
+    Path("existing.txt").write_text("old", encoding="utf-8")
+    fs.chmod("existing.txt", 0o644)
+    # When an error happens while the journal is active,
+    with pytest.raises(KeyboardInterrupt):
+        with fs.journal():
+            fs.create_directory("a/b")
+            fs.create_file("a/b/new.txt", "new")
+            fs.create_file("existing.txt", "changed")
+            fs.chmod("existing.txt", 0o755)
+            assert Path("existing.txt").read_text(encoding="utf-8") == "changed"
+            raise KeyboardInterrupt
+    # then all the changes should be reverted
+    assert not Path("a").exists()
+    assert Path("existing.txt").read_text(encoding="utf-8") == "old"
+    if not IS_WINDOWS:
+        assert stat.S_IMODE(Path("existing.txt").stat().st_mode) == 0o644
+    # and no temporary files should be left behind
+    assert list(Path(".").glob(".*")) == []
+
+    # When no error happens, the changes should be kept
+    with fs.journal():
+        fs.create_file("existing.txt", "changed")
+    assert Path("existing.txt").read_text(encoding="utf-8") == "changed"
+    assert list(Path(".").glob(".*")) == []
+
+
+def test_journal_rm_rf(tmpfolder):
+    Path("dir/sub").mkdir(parents=True)
+    Path("dir/sub/file.txt").write_text("dir", encoding="utf-8")
+    Path("file.txt").write_text("file", encoding="utf-8")
+    # When files and directories are removed while the journal is active,
+    with pytest.raises(RuntimeError):
+        with fs.journal():
+            fs.rm_rf("dir")
+            fs.rm_rf("file.txt")
+            fs.create_file("file.txt", "replacement")
+            assert not Path("dir").exists()
+            raise RuntimeError
+    # then they should be restored on rollback
+    assert Path("dir/sub/file.txt").read_text(encoding="utf-8") == "dir"
+    assert Path("file.txt").read_text(encoding="utf-8") == "file"
+    assert list(Path(".").glob(".*")) == []
+
+    # When no error happens, they should be removed for good (including the backups)
+    with fs.journal():
+        fs.rm_rf("dir")
+        fs.rm_rf("file.txt")
+    assert not Path("dir").exists() and not Path("file.txt").exists()
+    assert list(Path(".").glob(".*")) == []
+
+
+def test_journal_context(tmpfolder):
+    # When a journal is active
+    with fs.journal() as journal:
+        # it should not leak to other threads,
+        with ThreadPoolExecutor(1) as executor:
+            assert executor.submit(fs._journal.get).result() is None
+            # unless the context is explicitly copied
+            task = executor.submit(copy_context().run, fs._journal.get)
+            assert task.result() is journal
+        # and nested calls should share it
+        with fs.journal() as nested:
+            assert nested is journal
+    assert fs._journal.get() is None
+
+
+def test_staging_dir(tmpfolder):
+    # When the context ends successfully, the directory should be moved into place
+    with fs.staging_dir("proj") as staging:
+        assert not Path("proj").exists()
+        fs.create_file(staging / "file.txt", "content")
+    assert Path("proj/file.txt").read_text(encoding="utf-8") == "content"
+
+    # Otherwise it should be removed
+    with pytest.raises(RuntimeError):
+        with fs.staging_dir("other") as staging:
+            fs.create_file(staging / "file.txt", "content")
+            raise RuntimeError
+    assert not Path("other").exists()
+    assert list(Path(".").glob(".*")) == []
@@ -49,6 +49,17 @@ def test_levenshtein():
     assert levenshtein(s2, s1) == 4
 
 
+def test_levenshtein_bound():
+    # Distances within the bound are exact
+    assert levenshtein("born", "burnt", bound=2) == 2
+    assert levenshtein("born", "burnt", bound=5) == 2
+    # Otherwise bound + 1 is returned
+    assert levenshtein("born", "burnt", bound=1) == 2
+    assert levenshtein("kitten", "sitting", bound=0) == 1
+    assert levenshtein("", "burnt", bound=3) == 4
+    assert levenshtein("abcdef", "uvwxyz", bound=2) == 3
+
+
 def test_dasherize():
     assert dasherize("hello_world") == "hello-world"
     assert dasherize("helloworld") == "helloworld"
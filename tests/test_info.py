@@ -7,7 +7,7 @@ from unittest.mock import MagicMock as Mock
 import pytest
 from configupdater import ConfigUpdater
 
-from pyscaffold import actions, cli, exceptions, info, repo, structure, templates
+from pyscaffold import actions, cli, exceptions, info, repo, shell, structure, templates
 
 
 def test_username_with_git(git_mock):
@@ -25,6 +25,7 @@ def test_username_with_no_git(nogit_mock):
 def test_username_error(git_mock, monkeypatch):
     fake_git = Mock(side_effect=exceptions.ShellCommandException)
     monkeypatch.setattr(info.shell, "git", fake_git)
+    monkeypatch.setattr(info.shell, "git_output", fake_git)
     # on windows getpass might fail
     monkeypatch.setattr(info.getpass, "getuser", Mock(side_effect=SystemError))
     with pytest.raises(exceptions.GitNotConfigured):
@@ -44,6 +45,7 @@ def test_email_with_nogit(nogit_mock):
 def test_email_error(git_mock, monkeypatch):
     fake_git = Mock(side_effect=exceptions.ShellCommandException)
     monkeypatch.setattr(info.shell, "git", fake_git)
+    monkeypatch.setattr(info.shell, "git_output", fake_git)
     # on windows getpass might fail
     monkeypatch.setattr(info.getpass, "getuser", Mock(side_effect=SystemError))
     with pytest.raises(exceptions.GitNotConfigured):
@@ -90,6 +92,52 @@ def test_check_git_installed_and_configured(git_mock):
     info.check_git()
 
 
+def test_git_config_single_call(tmpfolder, monkeypatch):
+    calls = []
+    original_git, original_output = info.shell.git, info.shell.git_output
+
+    def _git(*args, **kwargs):
+        calls.append(args)
+        return original_git(*args, **kwargs)
+
+    def _git_output(*args, **kwargs):
+        calls.append(args)
+        return original_output(*args, **kwargs)
+
+    monkeypatch.setattr(info.shell, "git", _git)
+    monkeypatch.setattr(info.shell, "git_output", _git_output)
+    monkeypatch.delenv("GIT_AUTHOR_NAME", raising=False)
+    monkeypatch.delenv("GIT_AUTHOR_EMAIL", raising=False)
+    # When all the git-related information is required,
+    info.check_git()
+    assert info.username() == "Jane Doe"
+    assert info.email() == "janedoe@email"
+    assert info.is_git_configured()
+    actions.get_default_options({}, {})
+    # Then git should be called only once
+    assert calls == [("config", "--list", "-z")]
+
+    # When the cache is invalidated
+    info.clear_git_config()
+    info.username()
+    # Then git is called again
+    assert len(calls) == 2
+    # Similarly, when the relevant environment changes, git is called again
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    info.username()
+    assert len(calls) == 3
+
+
+def test_git_config_special_values(tmpfolder):
+    # Given a git setting with newlines and other line separators
+    shell.git("init", "--quiet")
+    value = "first\nsecond\u2028third\x1cfourth"
+    shell.git("config", "--local", "pyscaffold.test", value)
+    # then the value is retrieved exactly as it is
+    info.clear_git_config()
+    assert info.git_config()["pyscaffold.test"] == value
+
+
 def test_project_without_args(tmpfolder):
     old_args = [
         "my_project",
@@ -164,7 +212,7 @@ def test_config_dir_error(monkeypatch):
 
     # If for some reason something goes wrong when trying to find the config dir
     user_config_dir_mock = Mock(side_effect=SystemError)
-    monkeypatch.setattr(info.platformdirs, "user_config_dir", user_config_dir_mock)
+    monkeypatch.setattr("platformdirs.user_config_dir", user_config_dir_mock)
     # And no default value is given
     # Then an error should be raised
     with pytest.raises(exceptions.ImpossibleToFindConfigDir):
@@ -209,6 +257,31 @@ def test_best_fit_license():
     assert info.best_fit_license("gpl2-later") == "GPL-2.0-or-later"
     # Default
     assert info.best_fit_license("") == "MIT"
+    # Aliases and trove classifiers
+    assert info.best_fit_license("GPL-2.0+") == "GPL-2.0-or-later"
+    assert info.best_fit_license("LGPLv3") == "LGPL-3.0-only"
+    classifier = "License :: OSI Approved :: GNU General Public License v3 (GPLv3)"
+    assert info.best_fit_license(classifier) == "GPL-3.0-only"
+    assert info.best_fit_license("License :: OSI Approved :: MIT License") == "MIT"
+    # SPDX expressions => first license
+    assert info.best_fit_license("MIT OR Apache-2.0") == "MIT"
+    assert info.best_fit_license("(Apache-2.0 AND MIT)") == "Apache-2.0"
+    expr = "GPL-2.0-or-later WITH Classpath-exception-2.0"
+    assert info.best_fit_license(expr) == "GPL-2.0-or-later"
+
+
+def test_license_index():
+    licenses = {"MIT": "license_mit", "Apache-2.0": "license_apache"}
+    index = info.LicenseIndex(licenses, {"ASL": "Apache-2.0"})
+    assert index.best_fit(None) == "MIT"
+    assert index.best_fit("asl") == "Apache-2.0"
+    assert index.best_fit("apache2") == "Apache-2.0"
+    # Fuzzy matches are remembered
+    assert index.best_fit("apachee") == "Apache-2.0"
+    assert index._fuzzy["apachee"] == "Apache-2.0"
+    index.MAX_MEMO = 2
+    assert index.best_fit("mitt") == "MIT"
+    assert index._fuzzy == {"mitt": "MIT"}
 
 
 def test_dirty_workspace(tmpfolder):
@@ -1,3 +1,5 @@
+import io
+import json
 import logging
 import re
 from os import getcwd
@@ -9,6 +11,7 @@ from pyscaffold.file_system import localize_path as lp
 from pyscaffold.log import (
     DEFAULT_LOGGER,
     ColoredReportFormatter,
+    JsonReportFormatter,
     ReportFormatter,
     ReportLogger,
     logger,
@@ -200,6 +203,28 @@ def test_copy(caplog):
     )
 
 
+def test_buffered(caplog):
+    # Given the logger level is set to INFO,
+    caplog.set_level(logging.INFO)
+    lg = logger.copy()  # Create a local copy to avoid shared state
+    # When the report method is called within a buffered context,
+    names = [uniqstr() for _ in range(3)]
+    with lg.buffered() as records:
+        for name in names:
+            lg.report("make", name)
+    # Then nothing should be logged,
+    assert not any(match_report(r, content=name) for r in caplog.records)
+    assert len(records) == 3
+    # until the records are replayed
+    lg.replay(reversed(records))
+    replayed = [getattr(r, "subject", None) for r in caplog.records]
+    assert [name for name in replayed if name in names] == names[::-1]
+    # And after the context, the logs should be emitted as usual
+    name = uniqstr()
+    lg.report("make", name)
+    assert any(match_report(r, activity="make", content=name) for r in caplog.records)
+
+
 def test_reconfigure(monkeypatch, caplog, uniq_raw_logger):
     # Given an environment that supports color, and a restrictive logger
     caplog.set_level(logging.NOTSET)
@@ -356,3 +381,43 @@ def test_colored_others_methods(caplog, uniq_raw_logger):
     # Then the message should be surrounded by ansi codes
     out = caplog.messages[-1]
     assert ansi_regex(name).search(out)
+
+
+def test_json_format():
+    formatter = JsonReportFormatter()
+    # When a report record is formatted,
+    out = formatter.format(make_record("copy", lp("a/file"), target=lp("../b")))
+    event = json.loads(out)
+    # then the paths should be kept as they are
+    assert event["activity"] == "copy"
+    assert event["subject"] == lp("a/file")
+    assert event["target"] == lp("../b")
+    assert event["context"] is None
+    assert isinstance(event["timestamp"], float)
+    # Other records should contain the message instead
+    record = logging.makeLogRecord({"msg": "hello %s", "args": ("world",)})
+    event = json.loads(formatter.format(record))
+    assert event["activity"] is None
+    assert event["message"] == "hello world"
+
+
+def test_reconfigure_json(uniq_raw_logger):
+    # Given a logger reconfigured to use JSON,
+    stream = io.StringIO()
+    uniq_logger = ReportLogger(uniq_raw_logger, handler=logging.StreamHandler(stream))
+    uniq_logger.reconfigure(log_level=logging.INFO, log_format="json")
+    # when activities are reported,
+    uniq_logger.report("create", abspath("file"), duration=0.5)
+    with uniq_logger.indent():
+        uniq_logger.report("run", "ls")
+    # then each one of them should produce a JSON line
+    first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert (first["activity"], first["subject"]) == ("create", abspath("file"))
+    assert (first["nesting"], first["duration"]) == (0, 0.5)
+    assert (second["activity"], second["nesting"]) == ("run", 1)
+    assert isinstance(uniq_logger.formatter, JsonReportFormatter)
+    # Text can be selected again
+    uniq_logger.reconfigure(log_format="text", use_colors=False)
+    assert type(uniq_logger.formatter) is ReportFormatter
+    with pytest.raises(ValueError):
+        uniq_logger.reconfigure(log_format="xml")
@@ -1,9 +1,11 @@
+import logging
 import os
 import stat
 from unittest.mock import Mock
 
 from pyscaffold.operations import (
     add_permissions,
+    check_precondition,
     create,
     no_overwrite,
     remove,
@@ -11,6 +13,7 @@ from pyscaffold.operations import (
 )
 
 from .helpers import temp_umask, uniqpath
+from .log_helpers import find_report
 
 
 def test_create(monkeypatch):
@@ -33,6 +36,23 @@ def test_create(monkeypatch):
     assert path not in created
 
 
+def test_create_skip_unchanged(tmpfolder, caplog):
+    caplog.set_level(logging.INFO)
+    path = uniqpath()
+    assert create(path, "contents", {"update": True}) == path
+    # When the file exists with the same contents during an update, skip
+    os.utime(path, (0, 0))
+    assert create(path, "contents", {"update": True, "force": True}) is None
+    assert path.stat().st_mtime == 0
+    assert find_report(caplog, "unchanged", path)
+    # unless explicitly asked not to do it
+    assert create(path, "contents", {"update": True, "skip_unchanged": False}) == path
+    assert path.stat().st_mtime != 0
+    # When the contents are different, the file should be written
+    assert create(path, "other", {"update": True}) == path
+    assert path.read_text() == "other"
+
+
 def test_remove(monkeypatch):
     removed = {}
 
@@ -103,6 +123,23 @@ def test_no_overwrite(monkeypatch):
             assert NO_OVERWRITE(path, "contents", opts) == path
 
 
+def test_check_precondition(tmpfolder):
+    existing, missing = uniqpath(), uniqpath()
+    existing.write_text("old", encoding="utf-8")
+    # File ops without preconditions should always run
+    assert check_precondition(create, existing, {"update": True})
+    # Preconditions should reflect when the file op would skip the file
+    assert not check_precondition(no_overwrite(), existing, {})
+    assert check_precondition(no_overwrite(), missing, {})
+    assert check_precondition(no_overwrite(), existing, {"force": True})
+    assert not check_precondition(skip_on_update(), missing, {"update": True})
+    assert check_precondition(skip_on_update(), missing, {})
+    # including the preconditions of nested file ops
+    file_op = skip_on_update(no_overwrite())
+    assert not check_precondition(file_op, existing, {})
+    assert check_precondition(file_op, missing, {})
+
+
 def test_add_permissions(tmpfolder):
     _ = tmpfolder  # Just used for chdir
 
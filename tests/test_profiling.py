@@ -0,0 +1,86 @@
+import json
+import pstats
+
+from pyscaffold import api, profiling, shell
+from pyscaffold.file_system import create_file
+
+
+def test_measure(tmpfolder):
+    with profiling.profile() as prof:
+        assert profiling.current() is prof
+        with profiling.measure("outer"):
+            create_file("file.txt", "content")
+            with profiling.measure("inner"):
+                shell.ShellCommand("python")("--version")
+                shell.ShellCommand("python")("--version", pretend=True)
+
+    assert profiling.current() is None
+    outer, inner = prof.records
+    assert (outer.action, outer.depth) == ("outer", 0)
+    assert (inner.action, inner.depth) == ("inner", 1)
+    # Events are attributed to the innermost action
+    assert (outer.files, outer.bytes, outer.subprocesses) == (1, 7, 0)
+    assert (inner.files, inner.bytes, inner.subprocesses) == (0, 0, 1)
+    assert outer.wall_time >= inner.wall_time > 0
+    total = prof.total
+    assert (total.files, total.bytes, total.subprocesses) == (1, 7, 1)
+    assert total.wall_time == outer.wall_time
+    lines = prof.format().splitlines()
+    assert lines[0].startswith("action")
+    assert lines[2].startswith("  inner")
+    assert lines[-1].startswith("total")
+
+
+def test_measure_without_profile(tmpfolder):
+    # When no profile is active, nothing should happen
+    with profiling.measure("action") as stats:
+        create_file("file.txt", "content")
+        profiling.record_subprocess()
+    assert stats is None
+
+
+def test_create_project_with_profile(tmpfolder, git_mock):
+    # When profiling is enabled
+    _, opts = api.create_project(project_path="proj", profile=True)
+    # then the report should be returned
+    report = opts["profile_report"]
+    actions = [stats.action for stats in report.records]
+    assert "pyscaffold.structure:create_structure" in actions
+    assert report.total.files > 0
+    assert report.to_dict()["total"]["files"] == report.total.files
+    # but it should not be there by default
+    _, opts = api.create_project(project_path="other", config_files=api.NO_CONFIG)
+    assert "profile_report" not in opts
+
+
+def test_create_project_with_profile_output(tmpfolder, git_mock):
+    # When the output file ends with .json, a Chrome trace should be saved
+    api.create_project(project_path="proj", profile_output="trace.json")
+    trace = json.loads(tmpfolder.join("trace.json").read())
+    names = [event["name"] for event in trace["traceEvents"]]
+    assert "pyscaffold.structure:create_structure" in names
+    # otherwise pstats data should be saved
+    api.create_project(project_path="other", profile_output="stats.prof")
+    stats = pstats.Stats(str(tmpfolder.join("stats.prof")))
+    assert stats.total_calls > 0
+
+
+def test_update_project_with_profile(tmpfolder, git_mock):
+    # Given an old project, with outdated setup.cfg and pyproject.toml
+    api.create_project(project_path="proj", config_files=api.NO_CONFIG)
+    pyproject = tmpfolder.join("proj", "pyproject.toml")
+    pyproject.write(
+        pyproject.read().replace('build-backend = "setuptools.build_meta"', "")
+    )
+    setupcfg = tmpfolder.join("proj", "setup.cfg")
+    old_requires = "[options]\nsetup_requires = pyscaffold>=3.2a0,<3.3a0"
+    setupcfg.write(setupcfg.read().replace("[options]", old_requires))
+    # When the project is updated with profiling enabled
+    _, opts = api.create_project(
+        project_path="proj", update=True, force=True, profile=True
+    )
+    # then the files written by the migrations should also be accounted for
+    stats = {s.action: s for s in opts["profile_report"].records}
+    migration = stats["pyscaffold.update:version_migration"]
+    assert migration.files == 1  # setup.cfg (saved once, after all the steps)
+    assert stats["pyscaffold.update:update_pyproject_toml"].files == 1
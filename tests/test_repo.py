@@ -1,4 +1,5 @@
 import os
+import re
 import subprocess
 import sys
 from pathlib import Path
@@ -24,6 +25,76 @@ def test_init_commit_repo(tmpfolder):
         assert Path(".git").exists()
 
 
+def _count_git_calls(monkeypatch):
+    calls = []
+    orig_git = shell.git
+
+    def _git(*args, **kwargs):
+        calls.append(args)
+        return orig_git(*args, **kwargs)
+
+    monkeypatch.setattr(shell, "git", _git)
+    return calls
+
+
+def _committed_files():
+    return sorted(shell.git("ls-tree", "-r", "--name-only", "HEAD"))
+
+
+@pytest.mark.parametrize("fast_import", (False, True))
+def test_init_commit_repo_number_of_commands(tmpfolder, monkeypatch, fast_import):
+    # Given a project with many files
+    struct = {
+        "dir1": {f"file{i}.txt": f"content {i}" for i in range(30)},
+        "dir2": {"nested": {"file.py": "print('Hello World!')"}},
+        "README.rst": "# Readme",
+    }
+    structure.create_structure(struct, {"project_path": "proj"})
+    Path("proj/dir2/nested/file.py").chmod(0o755)
+    # when the repository is initialised
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "John Doe")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "john.doe@example.com")
+    calls = _count_git_calls(monkeypatch)
+    repo.init_commit_repo("proj", struct, fast_import=fast_import)
+    # then the number of git commands does not depend on the number of files
+    assert len(calls) == 3
+    # and all the files are committed
+    with chdir("proj"):
+        expected = ["README.rst", "dir2/nested/file.py"]
+        expected += [f"dir1/file{i}.txt" for i in range(30)]
+        assert _committed_files() == sorted(expected)
+        assert list(shell.git("status", "--porcelain")) == []
+        assert next(shell.git("log", "--format=%s")) == "Initial commit"
+        if os.name == "posix":
+            tree = next(shell.git("ls-tree", "HEAD", "dir2/nested/file.py"))
+            assert tree.startswith("100755")
+
+
+def test_git_fast_import_special_paths(tmpfolder, monkeypatch):
+    # Given files with names that need quoting
+    names = ["with space.txt", '"quoted".txt', "back\\slash.txt", "ünïcödé.txt"]
+    if os.name == "posix":
+        names += ["new\nline.txt", "tab\tand\x01control.txt"]
+    struct = {"dir": {name: name for name in names}}
+    structure.create_structure(struct, {"project_path": "proj"})
+    # when they are committed via fast-import
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "John Doe")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "john.doe@example.com")
+    repo.init_commit_repo("proj", struct, fast_import=True)
+    # then all of them are committed with the right names
+    with chdir("proj"):
+        cmd = ["git", "ls-tree", "-r", "-z", "--name-only", "HEAD"]
+        output = subprocess.run(cmd, capture_output=True, check=True).stdout
+        committed = output.decode("utf-8").split("\0")
+        assert sorted(filter(None, committed)) == sorted(f"dir/{n}" for n in names)
+        assert list(shell.git("status", "--porcelain")) == []
+        # and the date has the right format
+        date = next(shell.git("log", "--format=%ai"))
+        assert re.match(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d [+-]\d{4}$", date)
+
+    assert re.match(r"\d+ [+-]\d{4}$", repo._raw_date())
+
+
 def test_pretend_init_commit_repo(tmpfolder):
     with tmpfolder.mkdir("my_porject").as_cwd():
         struct = {
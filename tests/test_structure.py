@@ -1,9 +1,14 @@
+import logging
 from os.path import isdir, isfile
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+from string import Template
 
 import pytest
 
 from pyscaffold import actions, api, cli, operations, structure
+from pyscaffold.file_system import SourceFile
+
+from .log_helpers import find_report
 
 NO_OVERWRITE = operations.no_overwrite()
 SKIP_ON_UPDATE = operations.skip_on_update()
@@ -38,6 +43,50 @@ def test_create_structure(tmpfolder):
     assert open("my_folder/empty_file").read() == ""
 
 
+def test_create_structure_concurrently(tmpfolder, caplog):
+    caplog.set_level(logging.INFO)
+    struct = {
+        "my_file": "Some content",
+        "my_folder": {
+            "my_dir_file": "Some other content",
+            "empty_file": "",
+            "file_not_created": None,
+            "nested": {
+                f"file{i}": lambda opts, i=i: f"{opts['x']}{i}" for i in range(20)
+            },
+        },
+        "empty_folder": {},
+    }
+    # When a structure is created sequentially
+    changed, _ = structure.create_structure(struct, {"project_path": "seq", "x": "x"})
+    expected_logs = [r.message.replace("seq", "PREFIX") for r in caplog.records]
+    caplog.clear()
+    # and concurrently,
+    opts = {"project_path": "conc", "x": "x", "io_workers": 4}
+    changed_concurrently, _ = structure.create_structure(struct, opts)
+    # Then the outcome should be the same
+    assert changed_concurrently == changed
+    assert changed["my_folder"]["nested"]["file13"] == "x13"
+    assert isdir("conc/empty_folder")
+    assert not isfile("conc/my_folder/file_not_created")
+    for i in range(20):
+        assert Path(f"conc/my_folder/nested/file{i}").read_text() == f"x{i}"
+    # including the order of the logs
+    logs = [r.message.replace("conc", "PREFIX") for r in caplog.records]
+    assert logs == expected_logs
+
+
+def test_create_structure_concurrently_with_error(tmpfolder, caplog):
+    caplog.set_level(logging.INFO)
+    struct = {"a": {"b": "0"}, "c": {"strange_thing": 1}}
+    # When one of the leaves fails during a concurrent creation
+    with pytest.raises(TypeError):
+        structure.create_structure(struct, {"io_workers": 2})
+    # Then the logs for the remaining files should still be emitted
+    assert isfile("a/b")
+    assert any("a/b" in r.message for r in caplog.records)
+
+
 def test_create_structure_with_wrong_type(tmpfolder):
     with pytest.raises(TypeError):
         struct = {"strange_thing": 1}
@@ -215,3 +264,234 @@ def test_reject_without_file():
     assert len(struct["a"]["b"]["c"]) == 1
     assert len(struct["a"]["b"]) == 1
     assert len(struct["a"]) == 1
+
+
+def test_structural_sharing():
+    # Given a defined struct,
+    struct = {"a": {"b": {"c": "0"}}, "d": {"e": "1"}}
+    original = {"a": {"b": {"c": "0"}}, "d": {"e": "1"}}
+    # when it is manipulated,
+    modified = structure.modify(struct, "a/b/c", lambda c, op: (c + "!", op))
+    ensured = structure.ensure(struct, "a/x")
+    rejected = structure.reject(struct, "a/b/c")
+    merged = structure.merge(struct, {"a": {"b": {"f": "2"}}})
+    # then the original struct should not change
+    assert struct == original
+    # and the directories outside of the changed path should be shared
+    for new in (modified, ensured, rejected, merged):
+        assert new is not struct
+        assert new["d"] is struct["d"]
+    assert ensured["a"]["b"] is struct["a"]["b"]
+    assert modified["a"]["b"]["c"][0] == "0!"
+    assert merged["a"]["b"] == {"c": "0", "f": "2"}
+    # but nothing should be copied when there is nothing to change
+    assert structure.reject(struct, "a/x/y") is struct
+
+
+def test_structural_sharing_in_place_changes():
+    # Given a structure derived from another one (and from a dict given to merge),
+    struct = {"a": {"b": {"c": "0"}}, "d": {"e": "1"}}
+    extra = {"f": {"g": "2"}}
+    merged = structure.merge(struct, extra)
+    # when the derived structure is changed in place (not supported since 4.7),
+    merged["d"]["e"] = "changed"
+    merged["f"]["g"] = "changed"
+    # then the shared nodes are also changed in the other structures
+    assert struct["d"]["e"] == "changed"
+    assert extra["f"]["g"] == "changed"
+    # but when the manipulation functions are used instead, nothing leaks
+    merged = structure.merge(merged, {"d": {"e": "1"}, "f": {"g": "3"}})
+    assert merged["d"]["e"] == "1" and merged["f"]["g"] == "3"
+    assert struct["d"]["e"] == extra["f"]["g"] == "changed"
+
+
+def test_transaction():
+    # Given a defined struct,
+    struct = {"a": {"b": {"c": "0"}}, "d": {"e": "1"}}
+    original = {"a": {"b": {"c": "0"}}, "d": {"e": "1"}}
+    # when several edits are performed in a transaction,
+    with structure.transaction(struct) as tx:
+        tx.ensure("a/b/x", "2")
+        tx.modify("a/b/c", lambda c, op: (c + "!", op))
+        tx.reject("a/b/x/y")  # no-op: "x" is a file
+        tx.merge({"a": {"b": {"y": "3"}}, "f": {"g": "4"}})
+        tx.reject("a/b/y")
+    # then all the edits should be applied in order
+    create = operations.create
+    assert tx.struct["a"]["b"] == {"c": ("0!", create), "x": ("2", create)}
+    assert tx.struct["f"] == {"g": "4"}
+    # each directory in the path of the changes should be copied only once
+    assert len(tx._copies) == 3  # root, "a" and "a/b"
+    # and the original struct should not change
+    assert struct == original
+    assert tx.struct["d"] is struct["d"]
+    # the result should be the same as chaining the module functions
+    chained = structure.ensure(struct, "a/b/x", "2")
+    chained = structure.modify(chained, "a/b/c", lambda c, op: (c + "!", op))
+    chained = structure.merge(chained, {"a": {"b": {"y": "3"}}, "f": {"g": "4"}})
+    chained = structure.reject(chained, "a/b/y")
+    assert chained == tx.struct
+
+
+def test_iter_leaves():
+    struct = {"a": {"b": {"c": "0"}, "d": None}, "e": ("1", NO_OVERWRITE)}
+    leaves = dict(structure.iter_leaves(struct))
+    assert leaves == {
+        PurePosixPath("a/b/c"): "0",
+        PurePosixPath("a/d"): None,
+        PurePosixPath("e"): ("1", NO_OVERWRITE),
+    }
+
+
+def test_structure_index():
+    # Given a defined struct is indexed,
+    struct = {"a": {"b": {"c": "0"}, "bb": "1"}, "ab": "2", "d": ("3", NO_OVERWRITE)}
+    index = structure.StructureIndex(struct)
+    # then files can be looked up and queried
+    assert len(index) == 4
+    assert index["a/b/c"] == "0"
+    assert Path("a", "b", "c") in index
+    assert "a/b" not in index  # only files are indexed
+    assert [str(p) for p, _ in index.under("a")] == ["a/b/c", "a/bb"]
+    assert [str(p) for p, _ in index.under("a/b")] == ["a/b/c"]
+    assert len(list(index.under(""))) == 4
+
+    def is_protected(_path, leaf):
+        return structure.resolve_leaf(leaf)[1] is NO_OVERWRITE
+
+    assert [str(p) for p, _ in index.filter(is_protected)] == ["d"]
+
+    # When it is edited
+    index.ensure("a/b/x/y", "4").modify("ab", lambda c, op: (c + "!", op))
+    index.reject("a/b")
+    index.merge({"a": {"bb": {"z": "5"}}, "d": None})
+    # then both the index and the nested structure should be updated
+    assert sorted(str(p) for p in index) == ["a/bb/z", "ab", "d"]
+    assert index.struct == {
+        "a": {"bb": {"z": "5"}},
+        "ab": ("2!", operations.create),
+        "d": ("3", NO_OVERWRITE),
+    }
+    assert dict(structure.iter_leaves(index.struct)) == dict(index)
+    assert [str(p) for p, _ in index.under("a")] == ["a/bb/z"]
+    # and the original struct should not change
+    assert struct["a"]["b"] == {"c": "0"}
+
+
+def test_lazy_content():
+    # Given a template wrapped in a lazy object,
+    template = Template("$name ${version}")
+    lazy = structure.LazyContent(template)
+    assert lazy.keys == ("name", "version")
+    # when it is reified several times,
+    opts = {"name": "proj", "version": "1", "other": 1}
+    assert structure.reify_content(lazy, opts) == "proj 1"
+    # then it should only be rendered again if relevant options change
+    assert lazy(opts) is lazy({**opts, "other": 2})
+    assert lazy({**opts, "version": "2"}) == "proj 2"
+
+    # Given a function wrapped in a lazy object
+    calls = []
+
+    def render(opts):
+        calls.append(opts)
+        return opts["name"]
+
+    lazy = structure.LazyContent(render)
+    # it should be called only once for the same option values
+    assert lazy(opts) == lazy(opts) == lazy({**opts}) == "proj"
+    assert len(calls) == 1
+    # and again when any value changes (even if the same dict is changed in place)
+    opts["name"] = "other"
+    assert lazy(opts) == "other"
+    assert len(calls) == 2
+    assert lazy({**opts, "other": 2}) == "other"
+    assert len(calls) == 3
+    # unless the relevant keys are given explicitly
+    lazy = structure.LazyContent(render, keys=["name"])
+    assert lazy(opts) == lazy({**opts, "other": 3}) == "other"
+    assert len(calls) == 4
+
+
+def test_create_structure_skip_without_rendering(tmpfolder, caplog):
+    caplog.set_level(logging.INFO)
+    # Given a file that already exists
+    tmpfolder.join("existing.txt").write("old")
+    rendered = []
+
+    def content(opts):
+        rendered.append(opts)
+        return "new"
+
+    struct = {
+        "existing.txt": (content, NO_OVERWRITE),
+        "skip.txt": (content, SKIP_ON_UPDATE),
+    }
+    # When the structure is created with file ops that would skip the files,
+    changed, _ = structure.create_structure(struct, {"update": True})
+    # then the contents should not be rendered,
+    assert not rendered
+    assert changed == {}
+    assert tmpfolder.join("existing.txt").read() == "old"
+    assert not tmpfolder.join("skip.txt").exists()
+    # but the files should still be reported as skipped
+    assert find_report(caplog, "skip", "existing.txt")
+    assert find_report(caplog, "skip", "skip.txt")
+
+
+def test_create_structure_streaming(tmpfolder):
+    # Given a structure with streamed contents,
+    def _lines(_opts):
+        return (f"{i}\n" for i in range(1000))
+
+    struct = {"a": {"lines.txt": _lines, "data.bin": b"\x00\xff"}}
+    # when it is created,
+    changed, _ = structure.create_structure(struct, {})
+    # then the files should be written
+    assert Path("a/lines.txt").read_text(encoding="utf-8").splitlines()[-1] == "999"
+    assert Path("a/data.bin").read_bytes() == b"\x00\xff"
+    assert set(changed["a"]) == {"lines.txt", "data.bin"}
+
+
+def test_create_structure_source_file(tmpfolder):
+    # Given a structure referencing a binary source file,
+    Path("logo.png").write_bytes(b"\x89PNG\r\n\x00")
+    struct = {"docs": {"_static": {"logo.png": SourceFile("logo.png")}}}
+    # when it is created,
+    changed, _ = structure.create_structure(struct, {})
+    # then the file should be copied
+    assert Path("docs/_static/logo.png").read_bytes() == b"\x89PNG\r\n\x00"
+    assert "logo.png" in changed["docs"]["_static"]
+
+
+def test_create_structure_atomic(tmpfolder, caplog):
+    caplog.set_level(logging.INFO)
+
+    def _fail(_opts):
+        raise RuntimeError("boom")
+
+    # When a new project fails to be created atomically,
+    struct = {"a": {"b.txt": "b"}, "c.txt": _fail}
+    opts = {"project_path": Path("proj"), "atomic": True}
+    with pytest.raises(RuntimeError):
+        structure.create_structure(struct, opts)
+    # then nothing should be left in the disk
+    assert not Path("proj").exists()
+    assert list(Path(".").glob(".*")) == []
+
+    # When it succeeds, the files should be in place
+    struct = {"a": {"b.txt": "b"}, "c.txt": "c"}
+    changed, _ = structure.create_structure(struct, opts)
+    assert Path("proj/a/b.txt").read_text(encoding="utf-8") == "b"
+    assert changed == struct
+    assert list(Path(".").glob(".*")) == []
+    # and the logs should not mention temporary paths
+    assert find_report(caplog, "create", Path("proj", "a", "b.txt"))
+
+    # When updating an existing project fails,
+    struct = {"a": {"b.txt": "new", "d.txt": "d"}, "c.txt": _fail}
+    with pytest.raises(RuntimeError):
+        structure.create_structure(struct, {**opts, "update": True})
+    # then the previous contents should be restored
+    assert Path("proj/a/b.txt").read_text(encoding="utf-8") == "b"
+    assert not Path("proj/a/d.txt").exists()
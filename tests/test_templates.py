@@ -1,6 +1,10 @@
+import logging
+import re
+import string
 import sys
 from configparser import ConfigParser
 from pathlib import Path
+from unittest.mock import Mock
 
 import pytest
 
@@ -55,6 +59,123 @@ def test_get_template_relative_to(tmp_python_path):
     assert content == "Bye bye World!"
 
 
+def test_get_template_cached(tmp_python_path):
+    # Given a template exists inside a package
+    pkg = tmp_python_path / "pkg4cache"
+    pkg.mkdir(parents=True, exist_ok=True)
+    (pkg / "__init__.py").touch(exist_ok=True)
+    (pkg / "ex1.template").write_text("${var1}")
+    (pkg / "ex2.template").write_text("${var2}")
+
+    # When the template is retrieved multiple times
+    tpl1 = templates.get_template("ex1", relative_to="pkg4cache")
+    # Then the same object is returned
+    assert templates.get_template("ex1", relative_to="pkg4cache") is tpl1
+    # and the other templates in the same package are loaded at once
+    (pkg / "ex2.template").unlink()
+    tpl2 = templates.get_template("ex2", relative_to="pkg4cache")
+    assert tpl2.template == "${var2}"
+
+    # When the file changes, the template is only read again after invalidation
+    (pkg / "ex1.template").write_text("${var1}!")
+    assert templates.get_template("ex1", relative_to="pkg4cache").template == "${var1}"
+    templates.cache.invalidate("pkg4cache")
+    assert templates.get_template("ex1", relative_to="pkg4cache").template == "${var1}!"
+    with pytest.raises(FileNotFoundError):
+        templates.get_template("ex2", relative_to="pkg4cache")
+
+
+def test_template_cache_maxsize(tmp_python_path, monkeypatch):
+    # Given a template cache with a maximum size
+    cache = templates.TemplateCache(maxsize=2)
+    monkeypatch.setattr(templates, "cache", cache)
+    # and a package with a few templates
+    pkg = tmp_python_path / "pkg4maxsize"
+    pkg.mkdir(parents=True, exist_ok=True)
+    (pkg / "__init__.py").touch(exist_ok=True)
+    for i in range(4):
+        (pkg / f"ex{i}.template").write_text(f"${{var{i}}}")
+
+    # When the templates are preloaded, the cache is not exceeded
+    cache.preload("pkg4maxsize")
+    assert len(cache._external) == 2
+    cache.invalidate("pkg4maxsize")
+
+    # When the templates are retrieved
+    tpl0 = templates.get_template("ex0", relative_to="pkg4maxsize")
+    tpl1 = templates.get_template("ex1", relative_to="pkg4maxsize")
+    templates.get_template("ex2", relative_to="pkg4maxsize")
+    # Then only the most recently used templates are kept for other packages
+    assert len(cache._external) == 2
+    assert templates.get_template("ex1", relative_to="pkg4maxsize") is tpl1
+    assert templates.get_template("ex0", relative_to="pkg4maxsize") is not tpl0
+    # while PyScaffold's own templates are not evicted
+    setup_py = templates.get_template("setup_py")
+    assert templates.get_template("setup_py") is setup_py
+    assert len(cache._builtin) > 2
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "$a and ${b}, $$a, $$$b",
+        "${a}${b}$a$b",
+        "$missing ${missing} $a",
+        "line\nwith $ invalid placeholder",
+        "${a",
+        "no placeholders",
+        "",
+    ],
+)
+def test_compiled_template(text):
+    compiled = templates.CompiledTemplate(text)
+    original = string.Template(text)
+    mapping = {"a": 1, "b": "B"}
+    # safe_substitute behaves the same as string.Template
+    for args, kwargs in [((mapping,), {}), ((), {"a": 2}), ((mapping,), {"b": 3})]:
+        expected = original.safe_substitute(*args, **kwargs)
+        assert compiled.safe_substitute(*args, **kwargs) == expected
+    # and so does substitute, including errors
+    try:
+        expected = original.substitute(mapping)
+    except (KeyError, ValueError) as ex:
+        with pytest.raises(type(ex), match=re.escape(str(ex))):
+            compiled.substitute(mapping)
+    else:
+        assert compiled.substitute(mapping) == expected
+
+
+def test_template_cache_preload_errors(caplog, monkeypatch):
+    cache = templates.TemplateCache()
+    # Expected errors are just logged (`get` deals with them)
+    with caplog.at_level(logging.DEBUG):
+        cache.preload("pkg4preload.does.not.exist")
+    assert "Impossible to preload templates" in caplog.text
+    assert not cache._external
+    # while unexpected errors are not hidden
+    monkeypatch.setattr(templates, "_list_resources", Mock(side_effect=AttributeError))
+    with pytest.raises(AttributeError):
+        cache.preload("pkg4preload")
+
+
+def test_compiled_template_changes():
+    compiled = templates.CompiledTemplate("$a")
+    assert isinstance(compiled, string.Template)
+    assert compiled.substitute(a=1) == "1"
+    # Replacing the text is still respected
+    compiled.template = "<${a}>"
+    assert compiled.substitute(a=1) == "<1>"
+
+    # Subclasses can customise the delimiter
+    class Percent(templates.CompiledTemplate):
+        delimiter = "%"
+
+    assert Percent("%a costs 5$ (%%)").substitute(a="it") == "it costs 5$ (%)"
+
+    # Templates obtained via get_template are compiled
+    assert isinstance(templates.get_template("setup_py"), templates.CompiledTemplate)
+
+
 def test_all_licenses():
     opts = {
         "email": "test@user",
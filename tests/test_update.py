@@ -12,7 +12,9 @@ import pytest
 from packaging.version import Version
 
 from pyscaffold import __path__ as pyscaffold_paths
-from pyscaffold import __version__, actions, info, update
+from pyscaffold import __version__, actions
+from pyscaffold import file_system as fs
+from pyscaffold import info, update
 from pyscaffold.file_system import chdir
 
 from .helpers import in_ci, path_as_uri, skip_on_conda_build
@@ -395,3 +397,66 @@ def test_replace_find_with_find_namespace(tmpfolder):
     assert "options.packages.find" in cfg
     assert cfg["options.packages.find"]["where"].value == "src"
     assert cfg["options.packages.find"]["exclude"].value.strip() == "tests"
+
+
+def test_version_migration_reads_and_writes_once(tmpfolder, monkeypatch):
+    # Given an existing setup.cfg that requires many migration steps,
+    config = """\
+    [metadata]
+    name = proj
+
+    [options]
+    setup_requires = pyscaffold
+
+    [options.entry_points]
+
+    [pyscaffold]
+    version = 3.2.2
+    """
+    existing_config = Path(tmpfolder, "setup.cfg")
+    existing_config.write_text(dedent(config))
+
+    reads, writes = [], []
+    read_setupcfg, write_file = info.read_setupcfg, fs.write_file
+
+    def _read(*args):
+        reads.append(args)
+        return read_setupcfg(*args)
+
+    def _write(path, *args):
+        if Path(path).name == "setup.cfg":
+            writes.append(path)
+        return write_file(path, *args)
+
+    monkeypatch.setattr(update, "read_setupcfg", _read)
+    monkeypatch.setattr(info, "read_setupcfg", _read)
+    monkeypatch.setattr(fs, "write_file", _write)
+    # when the project is migrated,
+    opts = {"project_path": Path(tmpfolder), "update": True}
+    _, opts = actions.get_default_options({}, opts)
+    _, opts = update.version_migration({}, opts)
+    # then setup.cfg should be read and written only once
+    assert len(reads) == 1
+    assert len(writes) == 1
+    cfg = info.read_setupcfg(existing_config)
+    assert cfg["pyscaffold"]["version"].value == __version__
+    assert cfg["options"]["packages"].value == "find_namespace:"
+    assert "setup_requires" not in cfg["options"]
+    # and the shared document should not leak into the options
+    assert "_setupcfg" not in opts
+
+    # When nothing changes, the file should not be written
+    _, opts = update.version_migration({}, opts)
+    assert len(writes) == 1
+
+
+def test_change_setupcfg_does_not_mutate_opts():
+    # Given an action that changes setup.cfg, invoked during a version migration,
+    shared, new = object(), object()  # stand-ins for ConfigUpdater documents
+    action = update._change_setupcfg(lambda _setupcfg, opts: (new, opts))
+    opts = {update._SHARED_SETUPCFG: shared}
+    # when it replaces the shared document,
+    _, new_opts = action({}, opts)
+    # then the new one should be returned, without changing the given options
+    assert new_opts[update._SHARED_SETUPCFG] is new
+    assert opts[update._SHARED_SETUPCFG] is shared